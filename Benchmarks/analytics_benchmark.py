@@ -0,0 +1,86 @@
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from Classes.DataGenerator import SIZES
+from Classes.DatabaseManager import DatabaseManager
+from Classes.FleetAnalytics import REPORTS, FleetAnalytics
+from menu_benchmark import database_for, peak_rss_mb
+
+
+def timed(fn, repeat: int):
+    """(best seconds of repeat runs, result of the last run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_database(db_path: Path, repeat: int):
+    """Time every report in SQL and in NumPy on one database and check that they agree."""
+    db = DatabaseManager(db_path)
+    # a cached SQL report would be timed as a dictionary lookup
+    db.disable_cache()
+    try:
+        analytics = FleetAnalytics(db)
+        load_seconds, _ = timed(analytics.load, repeat)
+        reports = {}
+        for name in REPORTS:
+            sql_seconds, sql_rows = timed(lambda: analytics.sql_report(name), repeat)
+            numpy_seconds, numpy_rows = timed(lambda: analytics.report(name), repeat)
+            reports[name] = {"rows": len(sql_rows), "sql_s": sql_seconds, "numpy_s": numpy_seconds,
+                             "match": numpy_rows == sql_rows}
+    finally:
+        db.close()
+    return {"load_s": load_seconds, "reports": reports, "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet reports in NumPy (FleetAnalytics) against the same reports in SQL.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"], help="database sizes (default: small)")
+    parser.add_argument("--db", type=Path, help="use this database instead of generated ones")
+    parser.add_argument("--seed", type=int, default=42, help="generator seed")
+    parser.add_argument("--cache-dir", type=Path, help="keep generated databases here between runs (default: temporary)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best counts (default: 3)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or Path(tmp)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        databases = {args.db.name: args.db} if args.db else {size: database_for(size, args.seed, cache_dir) for size in args.sizes}
+        for label, db_path in databases.items():
+            results[label] = run_database(db_path, args.repeat)
+
+    mismatches = 0
+    for label, result in results.items():
+        print(f"\n=== {label}: columns loaded in {result['load_s']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB ===")
+        print(f"{'report':<20} {'rows':>8} {'SQL s':>8} {'NumPy s':>8} {'speed-up':>9}  match")
+        sql_total = numpy_total = 0.0
+        for name, r in result["reports"].items():
+            sql_total += r["sql_s"]
+            numpy_total += r["numpy_s"]
+            mismatches += not r["match"]
+            speedup = r["sql_s"] / r["numpy_s"] if r["numpy_s"] else float("inf")
+            print(f"{name:<20} {r['rows']:>8,} {r['sql_s']:>8.3f} {r['numpy_s']:>8.3f} {speedup:>8.1f}x  {'yes' if r['match'] else 'NO'}")
+        print(f"{'all reports':<20} {'':>8} {sql_total:>8.3f} {numpy_total:>8.3f}  (+ {result['load_s']:.2f}s to load)")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if mismatches:
+        print(f"\n{mismatches} report(s) differ from their SQL version.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.AsyncDatabaseManager import AsyncDatabaseManager
+from Classes.AsyncFlightService import AsyncFlightService
+from Classes.DatabaseManager import DatabaseManager
+from Classes.FlightService import FlightService
+from profile_benchmark import build_database
+
+
+def add_crew_and_bookings(path: Path, pilots: int, bookings_per_flight: int, seed: int = 7):
+    """Add pilots, two crew per flight and a few bookings per flight to a benchmark database."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path, isolation_level=None)
+    flight_ids = [r[0] for r in conn.execute("SELECT flightID FROM Flight;")]
+    conn.execute("BEGIN;")
+    conn.executemany(
+        "INSERT INTO Pilot (pilotID, firstName, lastName, licenseNo, hireDate) VALUES (?, ?, ?, ?, '2015-01-01');",
+        ((i, f"First{i}", f"Last{i}", f"P-{i:05d}") for i in range(1, pilots + 1)),
+    )
+    crew = []
+    for flight_id in flight_ids:
+        captain, co_captain = rng.sample(range(1, pilots + 1), 2)
+        crew += [(captain, flight_id, "Captain"), (co_captain, flight_id, "Co-Captain")]
+    conn.executemany("INSERT INTO FlightCrew (pilotID, flightID, role) VALUES (?, ?, ?);", crew)
+    conn.executemany(
+        "INSERT INTO Booking (flightID, firstName, lastName, seatNo, status) VALUES (?, 'Pax', 'Benchmark', ?, ?);",
+        ((flight_id, f"{seat + 1}A", rng.choice(("Booked", "Checked-in", "Cancelled")))
+         for flight_id in flight_ids for seat in range(bookings_per_flight)),
+    )
+    conn.execute("COMMIT;")
+    conn.close()
+
+
+def make_requests(count: int, flights: int, pilots: int, seed: int = 11):
+    """A fixed mix of (operation, kwargs): criteria search, pilot schedule, booking summary."""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        kind = rng.choice(("search", "schedule", "summary"))
+        if kind == "search":
+            month, day = rng.randint(1, 12), rng.randint(1, 28)
+            requests.append(("search_flights", {"dep_date": f"2026-{month:02d}-{day:02d}"}))
+        elif kind == "schedule":
+            requests.append(("pilot_schedule", {"pilot_id": rng.randint(1, pilots)}))
+        else:
+            requests.append(("booking_summary", {"flight_no": f"BF{rng.randrange(flights)}"}))
+    return requests
+
+
+def run_sync(path, requests):
+    """Requests/s answered one after another by FlightService on one DatabaseManager."""
+    db = DatabaseManager(path)
+    service = FlightService(db)
+    start = time.perf_counter()
+    for op, kwargs in requests:
+        getattr(service, op)(**kwargs)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return len(requests) / elapsed
+
+
+async def run_async(path, requests, concurrency, readers):
+    """Requests/s with `concurrency` requests in flight, plus the worst event-loop stall seen meanwhile."""
+    async with AsyncDatabaseManager(path, readers=readers) as adb:
+        service = AsyncFlightService(adb)
+        limit = asyncio.Semaphore(concurrency)
+        worst_lag = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            # how late does a 1 ms sleep wake up? (a blocked loop shows up here)
+            nonlocal worst_lag
+            while not done.is_set():
+                before = time.perf_counter()
+                await asyncio.sleep(0.001)
+                worst_lag = max(worst_lag, time.perf_counter() - before - 0.001)
+
+        async def one(op, kwargs):
+            async with limit:
+                await getattr(service, op)(**kwargs)
+
+        tick = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*(one(op, kwargs) for op, kwargs in requests))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await tick
+    return len(requests) / elapsed, worst_lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent request throughput: AsyncFlightService vs the sync FlightService.")
+    parser.add_argument("--flights", type=int, default=50000, help="flights in the test database")
+    parser.add_argument("--pilots", type=int, default=500, help="pilots in the test database")
+    parser.add_argument("--requests", type=int, default=3000, help="requests per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="requests in flight (async runs)")
+    parser.add_argument("--readers", type=int, default=4, help="read connections/threads for the async runs")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "async.db"
+        build_database(path, args.flights)
+        add_crew_and_bookings(path, args.pilots, bookings_per_flight=3)
+        requests = make_requests(args.requests, args.flights, args.pilots)
+
+        results.append({"mode": "sync", "concurrency": 1, "requests_per_s": run_sync(path, requests), "max_loop_lag_ms": None})
+        for concurrency in args.concurrency:
+            rate, lag = asyncio.run(run_async(path, requests, concurrency, args.readers))
+            results.append({"mode": "async", "concurrency": concurrency, "requests_per_s": rate, "max_loop_lag_ms": lag * 1000})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<6} | {'in flight':>9} | {'requests/s':>10} | {'max loop lag':>12}")
+    print("-" * 47)
+    for r in results:
+        lag = f"{r['max_loop_lag_ms']:.1f} ms" if r["max_loop_lag_ms"] is not None else "blocked"
+        print(f"{r['mode']:<6} | {r['concurrency']:>9} | {r['requests_per_s']:>10,.0f} | {lag:>12}")
+
+
+if __name__ == "__main__":
+    main()
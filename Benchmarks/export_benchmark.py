@@ -0,0 +1,86 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from Classes.BulkExporter import EXPORTS, GZIP_LEVEL, BulkExporter
+from Classes.DataGenerator import SIZES
+from Classes.DatabaseManager import DatabaseManager, PROFILES
+from menu_benchmark import database_for, peak_rss_mb
+
+FORMATS = ["csv", "ndjson", "csv.gz", "ndjson.gz"]
+
+
+def run_export(db_path: Path, kind: str, fmt: str, out_dir: Path, batch_size: int, gzip_level: int, profile: str):
+    """One export in this process; returns its summary plus the peak RSS."""
+    db = DatabaseManager(db_path, profile=profile)
+    db.disable_cache()
+    try:
+        out = out_dir / f"{kind}.{fmt}"
+        result = BulkExporter(db, batch_size, gzip_level).export(kind, out)
+        out.unlink()
+    finally:
+        db.close()
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and memory of export_data.py per kind and file format.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"], help="database sizes (default: small)")
+    parser.add_argument("--db", type=Path, help="export this database instead of generated ones")
+    parser.add_argument("--seed", type=int, default=42, help="generator seed")
+    parser.add_argument("--cache-dir", type=Path, help="keep generated databases here between runs (default: temporary)")
+    parser.add_argument("--kinds", nargs="+", choices=list(EXPORTS), default=list(EXPORTS), help="exports (default: all)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS, help="file formats (default: all)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per fetch and write (default: 10000)")
+    parser.add_argument("--gzip-level", type=int, default=GZIP_LEVEL, help=f"gzip level (default: {GZIP_LEVEL})")
+    parser.add_argument("--profile", choices=list(PROFILES), default="read-only-reporting",
+                        help="connection profile (default: read-only-reporting; its mmap counts towards RSS)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--worker", nargs=3, metavar=("DB", "KIND", "FORMAT"), help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # child process: one export, so peak RSS belongs to that export only
+        db_path, kind, fmt = args.worker
+        print(json.dumps(run_export(Path(db_path), kind, fmt, args.out_dir, args.batch_size, args.gzip_level, args.profile)))
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or Path(tmp)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        databases = {args.db.name: args.db} if args.db else {size: database_for(size, args.seed, cache_dir) for size in args.sizes}
+        for label, db_path in databases.items():
+            results[label] = {}
+            for kind in args.kinds:
+                for fmt in args.formats:
+                    child = subprocess.run(
+                        [sys.executable, __file__, "--worker", str(db_path), kind, fmt, "--out-dir", tmp,
+                         "--batch-size", str(args.batch_size), "--gzip-level", str(args.gzip_level),
+                         "--profile", args.profile],
+                        check=True, capture_output=True, text=True,
+                    )
+                    results[label][f"{kind} {fmt}"] = json.loads(child.stdout)
+
+    for label, exports in results.items():
+        print(f"\n=== {label} ===")
+        print(f"{'export':<20} {'rows':>12} {'MB':>9} {'s':>8} {'rows/s':>11} {'MB/s':>7} {'RSS MB':>8}")
+        for name, r in exports.items():
+            print(f"{name:<20} {r['rows']:>12,} {r['bytes'] / 1e6:>9,.1f} {r['seconds']:>8.2f} "
+                  f"{r['rows_per_second']:>11,.0f} {r['mb_per_second']:>7.1f} {r['peak_rss_mb']:>8.0f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
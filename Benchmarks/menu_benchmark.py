@@ -0,0 +1,245 @@
+import argparse
+import json
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# make the Classes package and the query-plan list importable when run from this folder
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "Database creation"))
+from Classes.DataGenerator import DataGenerator, SIZES
+from Classes.DatabaseManager import DatabaseManager
+from Classes.FlightService import FlightService
+from check_query_plans import QUERIES
+
+DELAY_EXAMPLE = "example 3: delay flight"
+
+# the SQL query examples (examples 4 and 5 are the pilot-schedule and destination statements, timed as menu 5 and 6;
+# example 3 writes, so MenuWorkload times it on a real flight and rolls it back)
+EXAMPLES = [(name, sql, params) for name, sql, params, _ in QUERIES if name.startswith("example ") and name != DELAY_EXAMPLE]
+DELAY_SQL = next(sql for name, sql, _, _ in QUERIES if name == DELAY_EXAMPLE)
+
+# p95 may grow by this fraction over the baseline before it counts as a regression,
+# and by at least MIN_DELTA_MS (sub-millisecond operations are noisy)
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_MS = 0.5
+
+
+class RolledBack(Exception):
+    """Ends a timed write's transaction with a rollback, carrying the rows it changed."""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.rows = rows
+
+
+class MenuWorkload:
+    """The logic behind each menu option, with inputs drawn from the database instead of input()."""
+
+    def __init__(self, db, seed: int = 1):
+        self.db = db
+        self.service = FlightService(db)
+        self.rng = random.Random(seed)
+        self.flight_nos = [r[0] for r in db.query("SELECT flightNo FROM Flight ORDER BY flightID;")]
+        self.pilot_ids = [r[0] for r in db.query("SELECT pilotID FROM Pilot ORDER BY pilotID;")]
+        self.iatas = [r[0] for r in db.query("SELECT IATA FROM Destination WHERE isActive = 1 ORDER BY destinationID;")]
+        self.destination_ids = [r[0] for r in db.query("SELECT destinationID FROM Destination ORDER BY destinationID;")]
+        self.days = [r[0] for r in db.query("SELECT DISTINCT substr(departure, 1, 10) FROM Flight ORDER BY 1;")]
+        self.added = 0
+
+    def operations(self):
+        """(name, callable returning the number of rows it produced)."""
+        return [
+            ("1 add flight", self.add_flight),
+            ("2 search: destination", lambda: self.search(dest_iata=self.pick_iata())),
+            ("2 search: destination + date", lambda: self.search(dest_iata=self.pick_iata(), dep_date=self.rng.choice(self.days))),
+            ("2 search: status + date range", lambda: self.search(status="Delayed", date_from=self.days[0], date_to=self.rng.choice(self.days))),
+            ("2 search: time window", lambda: self.search(time_from="08:00", time_to="09:00")),
+            ("2 search: no filters", lambda: self.search()),
+            ("3 update flight", self.update_flight),
+            ("4 assign pilot", self.assign_pilot),
+            ("5 pilot schedule", lambda: sum(1 for _ in self.service.iter_pilot_schedule(self.rng.choice(self.pilot_ids)))),
+            ("6 destinations: active", lambda: sum(1 for _ in self.service.iter_destinations(active_only=True))),
+            ("6 destinations: all", lambda: sum(1 for _ in self.service.iter_destinations(active_only=False))),
+            ("6 update destination", self.update_destination),
+            ("7 booking summary", lambda: len(self.service.booking_summary(self.rng.choice(self.flight_nos))["by_status"])),
+            (DELAY_EXAMPLE, self.delay_flight),
+        ]
+
+    def pick_iata(self):
+        # hubs come first, so this favours busy airports like real lookups do
+        return self.iatas[min(int(self.rng.expovariate(0.2)), len(self.iatas) - 1)]
+
+    def search(self, **criteria):
+        return sum(1 for _ in self.service.iter_flights(**criteria))
+
+    def add_flight(self):
+        self.added += 1
+        origin, destination = self.rng.sample(self.iatas, 2)
+        self.service.add_flight(f"ZZ{self.added}", origin, destination, "2030-01-01 08:00", "2030-01-01 10:00")
+        return 1
+
+    def update_flight(self):
+        updated = self.service.update_flight(self.rng.choice(self.flight_nos), status=self.rng.choice(("Scheduled", "Delayed")))
+        return 1 if updated else 0
+
+    def assign_pilot(self):
+        pilot_id, flight_no = self.rng.choice(self.pilot_ids), self.rng.choice(self.flight_nos)
+        try:
+            self.service.assign_pilot(pilot_id, flight_no, "Captain", replace=True)
+        except ValueError:
+            # already on this flight
+            return 0
+        return sum(1 for _ in self.service.iter_pilot_schedule(pilot_id))
+
+    def delay_flight(self):
+        # rolled back, so the flight is not pushed another two hours each run
+        try:
+            with self.db.transaction():
+                updated = self.db.execute(DELAY_SQL, (self.rng.choice(self.flight_nos),)).rowcount
+                raise RolledBack(updated)
+        except RolledBack as done:
+            return done.rows
+
+    def update_destination(self):
+        row = self.service.get_destination(self.rng.choice(self.destination_ids))
+        self.service.set_destination_active(row["destinationID"], row["isActive"])
+        return 1
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def time_operation(fn, iterations: int, max_seconds: float, warmup: int):
+    """Run fn until iterations or max_seconds (at least 5 runs); return latency and throughput stats."""
+    for _ in range(warmup):
+        fn()
+    latencies, rows = [], 0
+    deadline = time.perf_counter() + max_seconds
+    while len(latencies) < iterations and (len(latencies) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        rows += fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "runs": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rows_per_s": rows / total if total else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_size(db_path: Path, iterations: int, max_seconds: float, warmup: int):
+    """Time every menu operation and example query on one database; returns {name: stats}."""
+    results = {}
+    db = DatabaseManager(db_path)
+    try:
+        workload = MenuWorkload(db)
+        for name, fn in workload.operations():
+            results[name] = time_operation(fn, iterations, max_seconds, warmup)
+        for name, sql, params in EXAMPLES:
+            results[name] = time_operation(lambda: sum(1 for _ in db.iter_query(sql, params)), iterations, max_seconds, warmup)
+    finally:
+        db.close()
+    return results
+
+
+def database_for(size: str, seed: int, cache_dir: Path):
+    """Path of the generated database for a preset size, built on first use."""
+    path = cache_dir / f"bench-{size}-seed{seed}.db"
+    if not path.exists():
+        print(f"Generating the {size} database (once per cache directory)...", file=sys.stderr)
+        DataGenerator(seed=seed).build(path, **SIZES[size])
+    return path
+
+
+def compare(results, baseline, tolerance, min_delta_ms=MIN_DELTA_MS):
+    """Return one line per operation whose p95 got slower than the baseline allows."""
+    regressions = []
+    for size, operations in results.items():
+        for name, stats in operations.items():
+            before = baseline.get(size, {}).get(name)
+            if (before and stats["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+                    and stats["p95_ms"] - before["p95_ms"] > min_delta_ms):
+                regressions.append(f"{size} / {name}: p95 {before['p95_ms']:.3f} ms -> {stats['p95_ms']:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the menu operations and SQL examples on generated databases.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"], help="database sizes (default: small)")
+    parser.add_argument("--seed", type=int, default=42, help="generator seed")
+    parser.add_argument("--cache-dir", type=Path, help="keep generated databases here between runs (default: temporary)")
+    parser.add_argument("--iterations", type=int, default=200, help="runs per operation (default: 200)")
+    parser.add_argument("--max-seconds", type=float, default=3.0, help="time budget per operation (default: 3)")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed runs per operation (default: 3)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--save-baseline", type=Path, help="store the results as the baseline")
+    parser.add_argument("--baseline", type=Path, help="compare with this baseline and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p95 slow-down (default: 0.25)")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # child process: one database, so peak RSS belongs to that size only
+        print(json.dumps(run_size(args.worker, args.iterations, args.max_seconds, args.warmup)))
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or Path(tmp)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for size in args.sizes:
+            # the operations write, so every run works on a fresh copy
+            work_copy = Path(tmp) / f"work-{size}.db"
+            shutil.copyfile(database_for(size, args.seed, cache_dir), work_copy)
+            child = subprocess.run(
+                [sys.executable, __file__, "--worker", str(work_copy), "--iterations", str(args.iterations),
+                 "--max-seconds", str(args.max_seconds), "--warmup", str(args.warmup)],
+                check=True, capture_output=True, text=True,
+            )
+            results[size] = json.loads(child.stdout)
+            work_copy.unlink()
+
+    for size, operations in results.items():
+        print(f"\n=== {size}: {SIZES[size]['flights']:,} flights ===")
+        print(f"{'operation':<42} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'rows/s':>11} | {'RSS MB':>6}")
+        print("-" * 98)
+        for name, s in operations.items():
+            print(f"{name:<42} | {s['p50_ms']:>8.3f} | {s['p95_ms']:>8.3f} | {s['p99_ms']:>8.3f} | "
+                  f"{s['rows_per_s']:>11,.0f} | {s['peak_rss_mb']:>6.0f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        for line in regressions:
+            print(f"  {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.ConnectionPool import PooledDatabaseManager
+from profile_benchmark import build_database
+
+# a read that spends its time inside SQLite (which releases the GIL), not in Python
+READ_SQL = """
+    SELECT COUNT(*) AS flights, MIN(arrival) AS first_arrival
+    FROM Flight
+    WHERE departure >= ? AND departure < ?;
+"""
+
+
+def run_threads(pool, threads: int, seconds: float):
+    """Queries/s completed by the given number of threads sharing the pool."""
+    counts = [0] * threads
+    stop = time.perf_counter() + seconds
+
+    def worker(slot):
+        rng = random.Random(slot)
+        while time.perf_counter() < stop:
+            month = rng.randint(1, 12)
+            pool.query(READ_SQL, (f"2026-{month:02d}-01", f"2026-{month:02d}-15"))
+            counts[slot] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(counts) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read throughput of PooledDatabaseManager by thread count.")
+    parser.add_argument("--flights", type=int, default=200000, help="flights in the test database")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to test")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pool.db"
+        build_database(path, args.flights)
+        for threads in args.threads:
+            pool = PooledDatabaseManager(path, readers=threads)
+            try:
+                results.append({"threads": threads, "queries_per_s": run_threads(pool, threads, args.seconds)})
+            finally:
+                pool.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    base = results[0]["queries_per_s"]
+    print(f"{'threads':>7} | {'queries/s':>10} | {'speed-up':>8}")
+    print("-" * 32)
+    for r in results:
+        print(f"{r['threads']:>7} | {r['queries_per_s']:>10,.0f} | {r['queries_per_s'] / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import csv
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.DatabaseManager import DatabaseManager, PROFILES
+from Classes.SchemaMigrations import SchemaMigrations
+
+ROOT = Path(__file__).parent.parent
+SCHEMA_FILE = ROOT / "Database creation" / "create_db.sql"
+IATA_FILE = ROOT / "Data" / "iataCodes.csv"
+
+# what the database used before profiles existed: rollback journal, full fsync, default cache
+BASELINE = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def build_database(path: Path, flights: int, seed: int = 42):
+    """Create the schema with every airport from iataCodes.csv and some random flights."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(SCHEMA_FILE.read_text(encoding="utf-8"))
+    SchemaMigrations.apply(conn)
+    with open(IATA_FILE, newline="", encoding="utf-8") as f:
+        airports = [(r["IATA"], r["Airport"], r["Country"], r["City"]) for r in csv.DictReader(f)]
+    conn.execute("BEGIN;")
+    conn.executemany("INSERT INTO Destination (IATA, airportName, country, city) VALUES (?, ?, ?, ?);", airports)
+    conn.executemany("INSERT INTO Flight (flightNo, originID, destinationID, departure, arrival) VALUES (?, ?, ?, ?, ?);",
+                     flight_rows(flights, len(airports), random.Random(seed), prefix="BF"))
+    conn.execute("COMMIT;")
+    conn.close()
+    return len(airports)
+
+
+def flight_rows(count: int, airports: int, rng: random.Random, prefix: str):
+    """Yield random flight tuples (flightNo, originID, destinationID, departure, arrival)."""
+    for i in range(count):
+        origin, dest = rng.sample(range(1, airports + 1), 2)
+        month, day, hour = rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 20)
+        yield (f"{prefix}{i}", origin, dest,
+               f"2026-{month:02d}-{day:02d} {hour:02d}:00",
+               f"2026-{month:02d}-{day:02d} {hour + 3:02d}:00")
+
+
+def open_connection(path: Path, pragmas):
+    """Open a connection with the given PRAGMAs, like DatabaseManager does."""
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    DatabaseManager.apply_pragmas(conn, pragmas)
+    return conn
+
+
+def bench_bulk_insert(conn, airports, rows):
+    """Rows/s for one executemany of new flights in a single transaction."""
+    data = list(flight_rows(rows, airports, random.Random(1), prefix="BI"))
+    start = time.perf_counter()
+    conn.execute("BEGIN;")
+    conn.executemany("INSERT INTO Flight (flightNo, originID, destinationID, departure, arrival) VALUES (?, ?, ?, ?, ?);", data)
+    conn.execute("COMMIT;")
+    return rows / (time.perf_counter() - start)
+
+
+def bench_small_commits(conn, commits):
+    """Commits/s for single-row updates that each commit on their own (the menu's write pattern)."""
+    start = time.perf_counter()
+    for i in range(commits):
+        conn.execute("UPDATE Flight SET aircraft = ? WHERE flightID = ?;", (f"A{i % 400}", i + 1))
+    return commits / (time.perf_counter() - start)
+
+
+def read_once(conn, rng):
+    """One "flights on a given day" criteria query."""
+    day = date(2026, rng.randint(1, 12), rng.randint(1, 28))
+    return conn.execute(
+        "SELECT flightNo, departure FROM Flight WHERE departure >= ? AND departure < ?;",
+        (day.isoformat(), (day + timedelta(days=1)).isoformat()),
+    ).fetchall()
+
+
+def bench_reads(conn, seconds):
+    """Criteria queries/s on an idle database."""
+    rng = random.Random(2)
+    done, end = 0, time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        read_once(conn, rng)
+        done += 1
+    return done / seconds
+
+
+def bench_reads_during_writes(path, pragmas, seconds):
+    """Criteria queries/s from one connection while another one keeps committing."""
+    reader = open_connection(path, pragmas)
+    writer = open_connection(path, {k: v for k, v in pragmas.items() if k != "query_only"})
+    stop = threading.Event()
+
+    def write_loop():
+        i = 0
+        while not stop.is_set():
+            try:
+                writer.execute("UPDATE Flight SET aircraft = ? WHERE flightID = ?;", (f"W{i % 400}", i % 1000 + 1))
+            except sqlite3.OperationalError:
+                pass  # busy: the reader holds the lock (rollback-journal mode)
+            i += 1
+
+    thread = threading.Thread(target=write_loop)
+    thread.start()
+    try:
+        rng = random.Random(3)
+        done, end = 0, time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            try:
+                read_once(reader, rng)
+                done += 1
+            except sqlite3.OperationalError:
+                pass  # "database is locked" counts as a failed read
+    finally:
+        stop.set()
+        thread.join()
+        reader.close()
+        writer.close()
+    return done / seconds
+
+
+def run_profile(name, pragmas, args, workdir: Path):
+    """Build a fresh database and run every measurement for one profile."""
+    path = workdir / f"{name}.db"
+    airports = build_database(path, args.flights)
+    writable = pragmas.get("query_only") != "ON"
+
+    conn = open_connection(path, {k: v for k, v in pragmas.items() if k != "query_only"})
+    result = {
+        "profile": name,
+        "bulk_insert_rows_per_s": bench_bulk_insert(conn, airports, args.insert_rows) if writable else None,
+        "small_commits_per_s": bench_small_commits(conn, args.commits) if writable else None,
+    }
+    conn.close()
+
+    conn = open_connection(path, pragmas)
+    result["reads_per_s"] = bench_reads(conn, args.seconds)
+    conn.close()
+    result["reads_during_writes_per_s"] = bench_reads_during_writes(path, pragmas, args.seconds)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the effect of each DatabaseManager connection profile.")
+    parser.add_argument("--flights", type=int, default=50000, help="flights in each test database")
+    parser.add_argument("--insert-rows", type=int, default=50000, help="rows for the bulk insert test")
+    parser.add_argument("--commits", type=int, default=500, help="single-row commits for the commit test")
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each read test")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    profiles = {"baseline (no profile)": BASELINE, **PROFILES}
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [run_profile(name, pragmas, args, Path(tmp)) for name, pragmas in profiles.items()]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    fmt = lambda v: f"{v:,.0f}" if v is not None else "n/a"
+    print(f"{'profile':<24} | {'bulk rows/s':>12} | {'commits/s':>10} | {'reads/s':>9} | {'reads/s while writing':>21}")
+    print("-" * 89)
+    for r in results:
+        print(f"{r['profile']:<24} | {fmt(r['bulk_insert_rows_per_s']):>12} | {fmt(r['small_commits_per_s']):>10} | "
+              f"{fmt(r['reads_per_s']):>9} | {fmt(r['reads_during_writes_per_s']):>21}")
+
+
+if __name__ == "__main__":
+    main()
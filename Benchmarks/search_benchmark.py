@@ -0,0 +1,104 @@
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from Classes.AirportSearch import AirportSearch
+from Classes.DataGenerator import COUNTRIES, IATA_CSV
+from menu_benchmark import percentile
+
+SYLLABLES = ("ka", "ro", "mi", "san", "ter", "bel", "do", "vik", "ham", "lin", "or", "sta", "pe", "nu", "gar",
+             "ville", "burg", "to", "ra", "zen", "mar", "port", "li", "an", "sol", "fa", "ber", "gen", "ko", "la")
+NAME_PATTERNS = ("{city} International Airport", "{city} Airport", "{city} {person} Airport", "{city} Regional Airport")
+PEOPLE = ("Kennedy", "Schiphol", "Heathrow", "Gandhi", "Ataturk", "Marconi", "Pearson", "Suvarnabhumi", "Chopin", "Galilei")
+
+
+def make_airports(count: int, seed: int):
+    """The real airports, then made-up ones with pronounceable city names, up to count."""
+    rng = random.Random(seed)
+    with open(IATA_CSV, newline="", encoding="utf-8") as f:
+        airports = [(r["IATA"], r["Airport"], r["City"], r["Country"]) for r in csv.DictReader(f)][:count]
+    used = {a[0] for a in airports}
+    while len(airports) < count:
+        code = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.choice((3, 4, 4))))
+        if code in used:
+            continue
+        used.add(code)
+        city = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        name = rng.choice(NAME_PATTERNS).format(city=city, person=rng.choice(PEOPLE))
+        airports.append((code, name, city, rng.choice(COUNTRIES)))
+    return airports
+
+
+def typo(word: str, rng):
+    """word with one letter dropped, doubled or swapped with its neighbour."""
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(("drop", "double", "swap"))
+    if kind == "drop":
+        return word[:i] + word[i + 1:]
+    if kind == "double":
+        return word[:i] + word[i] + word[i:]
+    return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+
+
+def make_queries(airports, count: int, seed: int):
+    """{kind: [query, ...]} drawn from the airports, so every query has an answer."""
+    rng = random.Random(seed)
+    sample = [rng.choice(airports) for _ in range(count)]
+    return {
+        "IATA code": [a[0] for a in sample],
+        "city prefix (4 letters)": [a[2][:4] for a in sample],
+        "city + country": [f"{a[2]} {a[3].split()[0]}" for a in sample],
+        "one typo in the city": [typo(a[2], rng) if len(a[2]) > 4 else a[2] for a in sample],
+        "single letter": [rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in sample],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the airport search (prefix and typo-tolerant) on a large airport list.")
+    parser.add_argument("--airports", type=int, default=60000, help="airports in the index (default: 60000)")
+    parser.add_argument("--queries", type=int, default=2000, help="queries per kind (default: 2000)")
+    parser.add_argument("--k", type=int, default=10, help="results per query (default: 10)")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    airports = make_airports(args.airports, args.seed)
+    start = time.perf_counter()
+    index = AirportSearch(airports)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = {"airports": len(index), "build_ms": build_ms, "queries": {}}
+    for kind, queries in make_queries(airports, args.queries, args.seed).items():
+        latencies, found = [], 0
+        for query in queries:
+            start = time.perf_counter()
+            hits = index.search(query, args.k)
+            latencies.append(time.perf_counter() - start)
+            found += bool(hits)
+        latencies.sort()
+        results["queries"][kind] = {
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "answered": found / len(queries),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['airports']:,} airports, index built in {build_ms:.0f} ms, top {args.k}\n")
+    print(f"{'query':<26} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | {'answered':>8}")
+    print("-" * 68)
+    for kind, r in results["queries"].items():
+        print(f"{kind:<26} | {r['p50_ms']:>7.3f} | {r['p95_ms']:>7.3f} | {r['p99_ms']:>7.3f} | {r['answered']:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import chain, islice, product
+from pathlib import Path
+from string import ascii_uppercase
+
+# make the Classes package importable when run from this folder
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from Classes.FlightManagement import DB_PATH, IATA_CSV
+from Classes.IATAValidator import IATAValidator
+from menu_benchmark import DEFAULT_TOLERANCE, compare, percentile
+
+# process start-up varies by a few ms from run to run, so smaller p95 changes are not regressions
+MIN_DELTA_MS = 10.0
+
+# child programs, timed from process start to exit; {db} and {csv} are filled in
+MENU_START = (
+    "from Classes.FlightManagement import FlightManagementApp\n"
+    "app = FlightManagementApp({db!r}, {csv!r})\n"
+)
+FIRST_LOOKUP = MENU_START + (
+    "app.iata_validator.is_valid('LHR')\n"
+    "import json; print(json.dumps(app.iata_validator.load_stats))\n"
+)
+
+
+def write_airports(path: Path, count: int):
+    """A reference CSV with `count` made-up airports (3-letter codes, then 4-letter ones)."""
+    codes = chain(product(ascii_uppercase, repeat=3), product(ascii_uppercase, repeat=4))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["IATA", "Airport", "City", "Country"])
+        for i, letters in enumerate(islice(codes, count)):
+            code = "".join(letters)
+            writer.writerow([code, f"{code} International Airport", f"City {i}", f"Country {i % 200}"])
+
+
+def time_child(code: str, runs: int, before=None, load_stats=False):
+    """Run a Python program `runs` times in fresh processes; wall-clock latency stats (plus the IATA load it printed)."""
+    latencies, output = [], ""
+    for _ in range(runs):
+        if before:
+            before()
+        start = time.perf_counter()
+        child = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+        latencies.append(time.perf_counter() - start)
+        output = child.stdout
+    latencies.sort()
+    stats = {
+        "runs": runs,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+    if load_stats:
+        stats["iata_load"] = json.loads(output)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process start-up time of the menu and cli.py, with and without the IATA cache.")
+    parser.add_argument("--airports", type=int, default=60000,
+                        help="airports in a generated reference CSV (default: 60000; 0 uses Data/iataCodes.csv)")
+    parser.add_argument("--runs", type=int, default=20, help="process starts per scenario (default: 20)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--save-baseline", type=Path, help="store the results as the baseline")
+    parser.add_argument("--baseline", type=Path, help="compare with this baseline and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p95 slow-down (default: 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "startup.db"
+        shutil.copyfile(DB_PATH, db)
+        csv_path = IATA_CSV
+        if args.airports:
+            csv_path = Path(tmp) / "airports.csv"
+            write_airports(csv_path, args.airports)
+        cache = IATAValidator(csv_path).cache_path
+        menu = MENU_START.format(db=str(db), csv=str(csv_path))
+        lookup = FIRST_LOOKUP.format(db=str(db), csv=str(csv_path))
+
+        def drop_cache():
+            cache.unlink(missing_ok=True)
+
+        def touch_csv():
+            os.utime(csv_path)
+
+        try:
+            scenarios = {
+                "python interpreter only": time_child("pass", args.runs),
+                "menu start (no airport lookup)": time_child(menu, args.runs),
+                "menu start + first IATA check, no cache": time_child(lookup, args.runs, before=drop_cache, load_stats=True),
+                "menu start + first IATA check, cached": time_child(lookup, args.runs, load_stats=True),
+                "menu start + first IATA check, CSV touched": time_child(lookup, args.runs, before=touch_csv, load_stats=True),
+                "cli.py flights show": time_child(
+                    f"import sys; from cli import main; sys.exit(main(['--db', {str(db)!r}, 'flights', 'show', 'EY101']))",
+                    args.runs),
+            }
+
+        finally:
+            drop_cache()
+
+    results = {"startup": scenarios}
+    print(f"Reference CSV: {args.airports or 'Data/iataCodes.csv'} airports, {args.runs} runs per scenario\n")
+    print(f"{'scenario':<44} | {'p50 ms':>8} | {'p95 ms':>8} | {'IATA load':>16}")
+    print("-" * 86)
+    for name, s in scenarios.items():
+        load = f"{s['iata_load']['ms']:.1f} ms ({s['iata_load']['source']})" if "iata_load" in s else ""
+        print(f"{name:<44} | {s['p50_ms']:>8.1f} | {s['p95_ms']:>8.1f} | {load:>16}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance, MIN_DELTA_MS)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        for line in regressions:
+            print(f"  {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
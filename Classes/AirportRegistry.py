@@ -0,0 +1,112 @@
+import threading
+from Classes.AirportSearch import AirportSearch
+
+
+class AirportRegistry:
+    """
+    The Destination table in memory, by IATA code and by destinationID, read with
+    one query on first use. It is dropped (and read again on the next lookup) when
+    a destination is written through FlightService or a transaction rolls back.
+    With an IATAValidator it also tells apart codes that are not real airports
+    from real airports that are missing in Destination.
+    """
+
+    def __init__(self, db, validator=None):
+        self.db = db
+        self.validator = validator
+        self._lock = threading.Lock()
+        self._by_iata = None
+        self._by_id = None
+        self._search = None
+        # number of times the table was read (a measure of invalidations)
+        self.loads = 0
+        db.on_rollback(self.invalidate)
+
+    def _tables(self):
+        by_iata, by_id = self._by_iata, self._by_id
+        if by_iata is None:
+            with self._lock:
+                if self._by_iata is None:
+                    rows = [dict(row) for row in self.db.query_named("destinations_all")]
+                    self._by_id = {row["destinationID"]: row for row in rows}
+                    self._by_iata = {row["IATA"].upper(): row for row in rows}
+                    self.loads += 1
+                by_iata, by_id = self._by_iata, self._by_id
+        return by_iata, by_id
+
+    def invalidate(self):
+        """Forget the table; the next lookup reads it again."""
+        with self._lock:
+            self._by_iata = self._by_id = self._search = None
+
+    # ---------- lookups (no database access once loaded) ----------
+
+    def search(self, query: str, k: int = 10):
+        """Destinations matching a free-text query (see AirportSearch), with destinationID and isActive."""
+        by_iata, _ = self._tables()
+        index = self._search
+        if index is None:
+            index = AirportSearch.from_rows(by_iata.values())
+            with self._lock:
+                if self._by_iata is by_iata:
+                    self._search = index
+        results = index.search(query, k)
+        for r in results:
+            row = by_iata[r["IATA"].upper()]
+            r["destinationID"], r["isActive"] = row["destinationID"], row["isActive"]
+        return results
+
+    def by_iata(self, iata: str):
+        """The Destination row (as a dict) of an IATA code, or None."""
+        return self._tables()[0].get((iata or "").strip().upper())
+
+    def by_id(self, dest_id):
+        """The Destination row (as a dict) with this destinationID, or None."""
+        return self._tables()[1].get(dest_id)
+
+    def destination_id(self, iata: str, active_only: bool = False):
+        """destinationID of an IATA code, or None if it is not in Destination (or inactive, with active_only)."""
+        row = self.by_iata(iata)
+        if row is None or (active_only and not row["isActive"]):
+            return None
+        return row["destinationID"]
+
+    def problem(self, iata: str, active_only: bool = False):
+        """Why an IATA code cannot be used as a destination, or None if it can."""
+        iata = (iata or "").strip().upper()
+        if not iata:
+            return "IATA code cannot be empty."
+        row = self.by_iata(iata)
+        if row is None:
+            if self.validator is not None and not self.validator.is_valid(iata):
+                return f"'{iata}' is not a valid IATA code."
+            return f"Airport '{iata}' is not in the Destination table."
+        if active_only and not row["isActive"]:
+            return f"Airport '{iata}' is inactive."
+        return None
+
+    def prompt_iata(self, prompt_msg: str, active_only: bool = False) -> str:
+        """
+        Prompt until the user enters an IATA code that is in Destination (and active,
+        with active_only). Anything else is searched for ("amst", "heathrow"), and
+        the user can pick one of the numbered matches.
+        """
+        suggestions = []
+        while True:
+            answer = input(prompt_msg).strip()
+            if answer.isdigit() and 1 <= int(answer) <= len(suggestions):
+                answer = suggestions[int(answer) - 1]
+            iata = answer.upper()
+            problem = self.problem(iata, active_only)
+            if problem is None:
+                return iata
+
+            matches = [m for m in self.search(answer, 5) if m["isActive"] or not active_only] if answer else []
+            suggestions = [m["IATA"] for m in matches]
+            if not matches:
+                print(f"{problem} Please try again.\n")
+                continue
+            print(f"{problem} Did you mean:")
+            for n, m in enumerate(matches, 1):
+                print(f"  {n}) {m['IATA']}  {m['airport']} ({m['city']}, {m['country']})")
+            print("Enter a number, or another code or name.\n")
@@ -0,0 +1,213 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import accumulate, islice
+
+# how much a match in each field counts
+FIELD_WEIGHTS = {"IATA": 4.0, "city": 3.0, "airport": 3.0, "country": 1.0}
+
+# words in nearly every airport name: not indexed, so they neither match nor slow down a search
+STOP_WORDS = frozenset(("airport", "international", "intl", "regional", "aeropuerto", "aeroport", "aeroporto", "de", "of", "the"))
+
+# most airports scored for one search (per result asked for): caps the work for one-letter queries
+CANDIDATES_PER_RESULT = 10
+
+# typo candidates are words whose first FUZZY_KEY letters are within one edit of the query's
+# (4 for 4-letter query words, else 5)
+FUZZY_KEY = 5
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str):
+    """Lower-case ASCII words of a text: "Zürich-Kloten" -> ["zurich", "kloten"]."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return _WORD.findall(text.lower())
+
+
+def one_edit_keys(prefix: str):
+    """prefix and every string made by deleting one of its letters."""
+    return {prefix, *(prefix[:i] + prefix[i + 1:] for i in range(len(prefix)))}
+
+
+def near_prefixes(term: str, words, max_distance: int):
+    """
+    The words (sorted) that have a prefix within max_distance edits of term: {word: distance}.
+    Walks the words like a trie: rows[d] is the edit-distance row of term against the
+    first d letters of the current word, shared with the next word as far as their
+    letters agree, and every word under a prefix that cannot match is skipped.
+    """
+    found = {}
+    n = len(term)
+    rows = [list(range(n + 1))]
+    best = [n]                       # best[d]: smallest distance of term to a prefix up to length d
+    previous = ""
+    i = 0
+    while i < len(words):
+        word = words[i]
+        common = 0
+        limit = min(len(previous), len(word), len(rows) - 1)
+        while common < limit and previous[common] == word[common]:
+            common += 1
+        del rows[common + 1:]
+        del best[common + 1:]
+        previous = word
+
+        next_i = i + 1
+        for depth in range(common, len(word)):
+            above, letter = rows[-1], word[depth]
+            row = [above[0] + 1]
+            for j in range(1, n + 1):
+                row.append(min(row[j - 1] + 1, above[j] + 1, above[j - 1] + (term[j - 1] != letter)))
+            rows.append(row)
+            best.append(min(best[-1], row[-1]))
+            if min(row) >= min(best[-1], max_distance + 1):
+                # nothing under this prefix can get closer: all of it matches, or none of it
+                next_i = bisect_left(words, word[:depth + 1] + "\uffff", i)
+                if best[-1] <= max_distance:
+                    found.update(dict.fromkeys(words[i:next_i], best[-1]))
+                break
+        else:
+            if best[-1] <= max_distance:
+                found[word] = best[-1]
+        i = next_i
+    return found
+
+
+def max_typos(term: str) -> int:
+    """Edit distance allowed for a search word: none for short words, 1 up to 5 letters, else 2."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+class AirportSearch:
+    """
+    Finds airports by IATA code, airport name, city or country: "Amst", "heathrow",
+    "new york". Every word of the query must match a word of the airport, as the
+    whole word, its beginning or, when no indexed word starts with it, within a
+    small edit distance ("Amsterdm"). Prefixes are a bisect into the sorted word
+    list. Typos are found through the one-edit variants of the first letters of
+    every word (built on the first typo search), and checked with a bounded edit
+    distance, so a typo in the first letters counts as one of the allowed edits.
+    """
+
+    def __init__(self, airports):
+        """airports: iterable of (IATA, airport name, city, country)."""
+        self.airports = []
+        self._tokens = []        # per airport: ((word, field weight), ...)
+        postings = {}            # word -> [airport index, ...]
+        for iata, name, city, country in airports:
+            index = len(self.airports)
+            self.airports.append((iata, name, city, country))
+            tokens = {}
+            for field, text in (("IATA", iata), ("airport", name), ("city", city), ("country", country)):
+                for word in normalize(text):
+                    if field == "airport" and word in STOP_WORDS:
+                        continue
+                    tokens[word] = max(tokens.get(word, 0.0), FIELD_WEIGHTS[field])
+            self._tokens.append(tuple(tokens.items()))
+            for word in tokens:
+                postings.setdefault(word, []).append(index)
+        self._postings = postings
+        self._words = sorted(postings)
+        # _ends[i]: postings of words[:i + 1], so the airports under a prefix are counted in O(1)
+        self._ends = list(accumulate(len(postings[w]) for w in self._words))
+        self._fuzzy_index = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Index Destination rows (dicts or sqlite3.Row)."""
+        return cls((r["IATA"], r["airportName"], r["city"], r["country"]) for r in rows)
+
+    def __len__(self):
+        return len(self.airports)
+
+    # ---------- search ----------
+
+    def search(self, query: str, k: int = 10):
+        """The k best matches, best first: dicts with IATA, airport, city, country and score."""
+        terms = normalize(query)
+        if not terms or k <= 0:
+            return []
+
+        # what each query word can match: a range of the sorted words (prefix) or a set of near words
+        matches = []
+        for term in terms:
+            lo = bisect_left(self._words, term)
+            hi = bisect_left(self._words, term + "\uffff", lo)
+            fuzzy = {}
+            if lo == hi:
+                fuzzy = self._near_words(term, max_typos(term)) if max_typos(term) else {}
+                if not fuzzy:
+                    return []
+            matches.append((term, lo, hi, fuzzy))
+
+        # candidates come from the query word that matches the fewest airports
+        def airports_matched(match):
+            _, lo, hi, fuzzy = match
+            if fuzzy:
+                return sum(len(self._postings[w]) for w in fuzzy)
+            return self._ends[hi - 1] - (self._ends[lo - 1] if lo else 0)
+
+        term, lo, hi, fuzzy = min(matches, key=airports_matched)
+        limit = CANDIDATES_PER_RESULT * k
+        candidates = {}
+        # every word has at least one airport, so no more than `limit` words are needed
+        for word in (sorted(fuzzy, key=fuzzy.get) if fuzzy else self._words[lo:min(hi, lo + limit)]):
+            candidates.update(dict.fromkeys(islice(self._postings[word], limit - len(candidates))))
+            if len(candidates) >= limit:
+                break
+
+        scored = []
+        for index in candidates:
+            score = self._score(index, matches)
+            if score:
+                scored.append((-score, len(self.airports[index][1]), self.airports[index][0], index))
+        scored.sort()
+        return [
+            {"IATA": iata, "airport": name, "city": city, "country": country, "score": -neg_score}
+            for neg_score, _, _, index in scored[:k]
+            for iata, name, city, country in (self.airports[index],)
+        ]
+
+    def _score(self, index, matches):
+        """Sum over the query words of the best match quality x field weight; 0 if a word does not match."""
+        total = 0.0
+        tokens = self._tokens[index]
+        for term, _, _, fuzzy in matches:
+            best = 0.0
+            for word, weight in tokens:
+                if word == term:
+                    quality = 3.0
+                elif fuzzy:
+                    distance = fuzzy.get(word)
+                    quality = 1.0 / (1 + distance) if distance is not None else 0.0
+                elif word.startswith(term):
+                    quality = 2.0
+                else:
+                    continue
+                best = max(best, quality * weight)
+            if not best:
+                return 0.0
+            total += best
+        return total
+
+    def _near_words(self, term, max_distance):
+        """Indexed words with a prefix within max_distance edits of term: {word: distance}."""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = self._build_fuzzy_index()
+        length = min(len(term), FUZZY_KEY)
+        candidates = set()
+        for key in one_edit_keys(term[:length]):
+            candidates.update(self._fuzzy_index[length].get(key, ()))
+        return near_prefixes(term, [self._words[i] for i in sorted(candidates)], max_distance)
+
+    def _build_fuzzy_index(self):
+        """{key length: {one-edit variant of a word's first letters: [word number, ...]}}."""
+        index = {4: {}, FUZZY_KEY: {}}
+        for i, word in enumerate(self._words):
+            for length, keys in index.items():
+                for key in one_edit_keys(word[:length]):
+                    keys.setdefault(key, []).append(i)
+        return index
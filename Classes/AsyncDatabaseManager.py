@@ -0,0 +1,138 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from Classes.ConnectionPool import PooledDatabaseManager
+from Classes.DatabaseManager import DB_PATH
+
+
+# set while the current task is inside transaction(): its statements skip the write lock
+# and run on the writer thread, so they see the transaction's own changes
+_in_transaction = contextvars.ContextVar("in_transaction", default=False)
+
+
+class AsyncDatabaseManager:
+    """
+    asyncio front-end to PooledDatabaseManager: every call runs on a bounded
+    thread pool, so the event loop never blocks on SQLite. Reads go to
+    `readers` threads (one per pooled read connection), all writes to a
+    single writer thread.
+    """
+
+    def __init__(self, db_path=DB_PATH, readers: int = 4, profile=None):
+        self.db = PooledDatabaseManager(db_path, readers=readers, profile=profile)
+        self._read_executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ---------- running blocking calls ----------
+
+    async def run_read(self, fn, *args, **kwargs):
+        """Run a blocking read-only function on the read threads (the writer thread inside a transaction)."""
+        executor = self._write_executor if _in_transaction.get() else self._read_executor
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    async def run_write(self, fn, *args, **kwargs):
+        """Run a blocking function that writes on the writer thread, one task at a time."""
+        call = functools.partial(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        if _in_transaction.get():
+            return await loop.run_in_executor(self._write_executor, call)
+        async with self._write_lock:
+            return await loop.run_in_executor(self._write_executor, call)
+
+    # ---------- DatabaseManager interface ----------
+
+    async def query(self, sql, params=()):
+        """Execute a SELECT and return all results."""
+        return await self.run_read(self.db.query, sql, params)
+
+    async def execute(self, sql, params=()):
+        """Run INSERT, UPDATE, or DELETE statements."""
+        return await self.run_write(self.db.execute, sql, params)
+
+    async def query_named(self, name, params=()):
+        """Async DatabaseManager.query_named()."""
+        return await self.run_read(self.db.query_named, name, params)
+
+    async def execute_named(self, name, params=()):
+        """Async DatabaseManager.execute_named()."""
+        return await self.run_write(self.db.execute_named, name, params)
+
+    async def bulk_insert(self, table, columns, rows, on_conflict=None):
+        """Async DatabaseManager.bulk_insert()."""
+        return await self.run_write(self.db.bulk_insert, table, columns, rows, on_conflict)
+
+    @asynccontextmanager
+    async def transaction(self, mode="DEFERRED"):
+        """
+        Async DatabaseManager.transaction():
+
+            async with adb.transaction("IMMEDIATE"):
+                await adb.execute(...)
+                rows = await adb.query(...)   # sees the changes above
+
+        Other tasks' writes wait until the block ends; nested blocks are savepoints.
+        """
+        if _in_transaction.get():
+            async with self._enter_transaction(mode):
+                yield self
+            return
+        async with self._write_lock:
+            token = _in_transaction.set(True)
+            try:
+                async with self._enter_transaction(mode):
+                    yield self
+            finally:
+                _in_transaction.reset(token)
+
+    @asynccontextmanager
+    async def _enter_transaction(self, mode):
+        """Enter/exit the pool's (thread-bound) transaction() on the writer thread."""
+        loop = asyncio.get_running_loop()
+        tx = self.db.transaction(mode)
+        await loop.run_in_executor(self._write_executor, tx.__enter__)
+        try:
+            yield
+        except BaseException as e:
+            await loop.run_in_executor(self._write_executor, tx.__exit__, type(e), e, e.__traceback__)
+            raise
+        else:
+            await loop.run_in_executor(self._write_executor, tx.__exit__, None, None, None)
+
+    async def iter_query(self, sql, params=(), batch_size: int = 500):
+        """
+        Yield the rows of a SELECT one by one, fetching batch_size at a time on a
+        worker thread. If you stop early, close it with contextlib.aclosing()
+        to hand the read connection back straight away.
+        """
+        if _in_transaction.get():
+            cur = await self.run_read(self.db.conn.execute, sql, params)
+            while rows := await self.run_read(cur.fetchmany, batch_size):
+                for row in rows:
+                    yield row
+            return
+
+        reader = self.db.reader()
+        conn = await self.run_read(reader.__enter__)
+        try:
+            cur = await self.run_read(conn.execute, sql, params)
+            while rows := await self.run_read(cur.fetchmany, batch_size):
+                for row in rows:
+                    yield row
+        finally:
+            await self.run_read(reader.__exit__, None, None, None)
+
+    async def close(self):
+        """Wait for running calls, then close every connection."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._read_executor.shutdown)
+        await loop.run_in_executor(None, self._write_executor.shutdown)
+        self.db.close()
@@ -0,0 +1,42 @@
+from Classes.FlightService import FlightService
+
+
+class AsyncFlightService:
+    """Awaitable versions of the core FlightService operations, run through an AsyncDatabaseManager."""
+
+    def __init__(self, adb):
+        self.adb = adb
+        # the sync service runs on the worker threads against the thread-safe pool
+        self.service = FlightService(adb.db)
+
+    async def add_flight(self, flight_no, origin_iata, dest_iata, departure, arrival, status="Scheduled", aircraft=None):
+        """Validate and insert a flight; returns the new flightID (ValueError on bad input)."""
+        return await self.adb.run_write(
+            self.service.add_flight, flight_no, origin_iata, dest_iata, departure, arrival, status, aircraft
+        )
+
+    async def search_flights(self, **criteria):
+        """Flights matching the criteria (see FlightService.build_search_sql)."""
+        return await self.adb.run_read(self.service.search_flights, **criteria)
+
+    async def iter_flights(self, batch_size: int = 500, **criteria):
+        """Like search_flights(), but yields rows as they are fetched."""
+        sql, params = FlightService.build_search_sql(**criteria)
+        async for row in self.adb.iter_query(sql, params, batch_size=batch_size):
+            yield row
+
+    async def update_flight(self, flight_no, departure=None, arrival=None, status=None, aircraft=None):
+        """Change the given fields of a flight; returns the updated row."""
+        return await self.adb.run_write(self.service.update_flight, flight_no, departure, arrival, status, aircraft)
+
+    async def assign_pilot(self, pilot_id, flight_no, role="Captain", replace=False, allow_overlap=False):
+        """Put a pilot on a flight (see FlightService.assign_pilot)."""
+        return await self.adb.run_write(self.service.assign_pilot, pilot_id, flight_no, role, replace, allow_overlap)
+
+    async def pilot_schedule(self, pilot_id):
+        """A pilot's assigned flights, ordered by departure."""
+        return await self.adb.run_read(self.service.pilot_schedule, pilot_id)
+
+    async def booking_summary(self, flight_no):
+        """{"flight": row, "total": int, "by_status": rows} for a flight number."""
+        return await self.adb.run_read(self.service.booking_summary, flight_no)
@@ -0,0 +1,165 @@
+import csv
+import gzip
+import os
+import time
+from itertools import islice
+from pathlib import Path
+from Classes.FlightService import FlightService
+
+
+# gzip level of .gz exports: on the bookings CSV, level 1 compresses about 105 MB/s
+# against 38 MB/s for zlib's default 6, for a file about 25% larger
+GZIP_LEVEL = 1
+
+# per kind: the columns (named as BulkImporter reads them back), the tables, and the
+# change timestamp the incremental mode (since=...) filters on
+EXPORTS = {
+    "flights": (
+        ("f.flightID", "f.flightNo", "o.IATA AS origin", "d.IATA AS destination", "f.departure", "f.arrival",
+         "f.status", "f.aircraft", "f.lastUpdate"),
+        "Flight f",
+        "f.lastUpdate",
+    ),
+    "crew": (
+        ("fc.flightCrewID", "f.flightNo", "fc.pilotID", "fc.role", "fc.assignedAt"),
+        "FlightCrew fc JOIN Flight f ON fc.flightID = f.flightID",
+        "fc.assignedAt",
+    ),
+    "bookings": (
+        ("b.bookingID", "f.flightNo", "b.firstName", "b.lastName", "b.email", "b.seatNo", "b.status", "b.lastUpdate"),
+        "Booking b JOIN Flight f ON b.flightID = f.flightID",
+        "b.lastUpdate",
+    ),
+}
+
+
+class BulkExporter:
+    """
+    Streams flights, crew or bookings to CSV or NDJSON files (optionally .gz), batch_size
+    rows at a time, so memory stays flat however many rows there are. Rows can be
+    filtered like the criteria search (FlightService.search_conditions) and limited to
+    those changed since a timestamp.
+    """
+
+    def __init__(self, db, batch_size: int = 10000, gzip_level: int = GZIP_LEVEL):
+        self.db = db
+        self.batch_size = batch_size
+        self.gzip_level = gzip_level
+
+    @staticmethod
+    def columns(kind):
+        """The column names of an export, in file order."""
+        return [expr.split(" AS ")[-1].split(".")[-1] for expr in EXPORTS[kind][0]]
+
+    @staticmethod
+    def build_export_sql(kind, since=None, as_json=False, **criteria):
+        """
+        Return (sql, params) for an export; criteria as for FlightService.build_search_sql().
+        Rows come in table order (no sort: the first row is written without waiting for the
+        last). as_json selects each row as one JSON object built by SQLite, which is far
+        cheaper than making a Python value per column and encoding them again.
+        """
+        if kind not in EXPORTS:
+            raise ValueError(f"Unknown export '{kind}'. Use one of: {', '.join(EXPORTS)}.")
+        columns, tables, changed = EXPORTS[kind]
+        conditions, params = FlightService.search_conditions(**criteria)
+        if not conditions:
+            # nothing to find through the flights: read the exported table first, in rowid
+            # order (or by its change timestamp with since), and look each flight up
+            tables = tables.replace(" JOIN ", " CROSS JOIN ", 1)
+        # the airports are only joined when they are exported or filtered on
+        if kind == "flights" or "origin_iata" in params:
+            tables += " JOIN Destination o ON f.originID = o.destinationID"
+        if kind == "flights" or "dest_iata" in params:
+            tables += " JOIN Destination d ON f.destinationID = d.destinationID"
+        if since:
+            conditions.append(f"AND {changed} >= :since")
+            params["since"] = since
+        if as_json:
+            pairs = ", ".join(f"'{name}', {expr.split(' AS ')[0]}"
+                              for name, expr in zip(BulkExporter.columns(kind), columns))
+            select = f"json_object({pairs}) AS record"
+        else:
+            select = ", ".join(columns)
+        sql = f"SELECT {select}\nFROM {tables}\nWHERE 1=1\n" + "\n".join(conditions)
+        return sql + ";", params
+
+    def export(self, kind, path: Path, since=None, **criteria):
+        """
+        Write the rows of an export to path (.csv, .ndjson or .jsonl, optionally .gz).
+        The file appears complete or not at all. Returns a summary with "next_since":
+        the newest change timestamp when the export ran, to pass as since next time
+        (rows changed in that same second are exported again; import them by ID).
+        """
+        path = Path(path)
+        write, as_json = self._writer(path)
+        sql, params = self.build_export_sql(kind, since, as_json, **criteria)
+        changed = EXPORTS[kind][2]
+        column, table = changed.split(".")[1], EXPORTS[kind][1].split()[0]
+
+        start = time.perf_counter()
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            # one read transaction: the rows and next_since come from the same snapshot
+            with self.db.transaction():
+                next_since = self.db.query(f"SELECT MAX({column}) AS latest FROM {table};")[0]["latest"]
+                rows = self.db.iter_query(sql, params, self.batch_size)
+                count = write(tmp, self.columns(kind), rows, self.batch_size)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        elapsed = time.perf_counter() - start
+        size = path.stat().st_size
+        return {
+            "file": str(path),
+            "kind": kind,
+            "rows": count,
+            "bytes": size,
+            "seconds": elapsed,
+            "rows_per_second": count / elapsed if elapsed else 0.0,
+            "mb_per_second": size / 1e6 / elapsed if elapsed else 0.0,
+            "next_since": next_since if next_since is not None else since,
+        }
+
+    # ---------- writing ----------
+
+    def _writer(self, path: Path):
+        """(function that writes rows to a file of this type, whether it takes JSON rows); checked before any query runs."""
+        suffixes = [s.lower() for s in path.suffixes]
+        compressed = bool(suffixes) and suffixes[-1] == ".gz"
+        kind = suffixes[-2] if compressed and len(suffixes) > 1 else (suffixes[-1] if suffixes else "")
+        if kind == ".csv":
+            write = self._write_csv
+        elif kind in (".ndjson", ".jsonl"):
+            write = self._write_ndjson
+        else:
+            raise ValueError(f"Unsupported file type '{path.name}'. Use .csv, .ndjson or .jsonl (optionally .gz).")
+
+        def write_file(tmp, columns, rows, batch_size):
+            if compressed:
+                f = gzip.open(tmp, "wt", encoding="utf-8", newline="", compresslevel=self.gzip_level)
+            else:
+                f = open(tmp, "w", encoding="utf-8", newline="")
+            with f:
+                return write(f, columns, rows, batch_size)
+        return write_file, write == self._write_ndjson
+
+    @staticmethod
+    def _write_csv(f, columns, rows, batch_size):
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        count = 0
+        while batch := list(islice(rows, batch_size)):
+            writer.writerows(batch)
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _write_ndjson(f, columns, rows, batch_size):
+        # rows are single JSON objects (build_export_sql(as_json=True))
+        count = 0
+        while batch := list(islice(rows, batch_size)):
+            f.write("\n".join(row[0] for row in batch) + "\n")
+            count += len(batch)
+        return count
@@ -0,0 +1,260 @@
+import csv
+import gzip
+import json
+import re
+import sqlite3
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from Classes.Utils import Utils
+
+
+# format accepted for departure/arrival (same as the CLI prompts)
+DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$")
+
+FLIGHT_STATUSES = {"Scheduled", "Delayed", "Cancelled"}
+BOOKING_STATUSES = {"Booked", "Checked-in", "Cancelled"}
+
+
+class BulkImporter:
+    """Streams flights/bookings from CSV or NDJSON files into the database in chunked transactions."""
+
+    def __init__(self, db, batch_size: int = 10000):
+        self.db = db
+        self.batch_size = batch_size
+        # IATA -> destinationID, filled once per batch for the codes not seen yet
+        self._airport_ids = {}
+
+    # ---------- reading ----------
+
+    @staticmethod
+    def read_records(path: Path):
+        """Yield (line_no, dict) from a .csv or .ndjson/.jsonl file (optionally .gz)."""
+        path = Path(path)
+        suffixes = [s.lower() for s in path.suffixes]
+        opener = gzip.open if suffixes and suffixes[-1] == ".gz" else open
+        kind = suffixes[-2] if opener is gzip.open and len(suffixes) > 1 else (suffixes[-1] if suffixes else "")
+
+        with opener(path, "rt", newline="", encoding="utf-8") as f:
+            if kind == ".csv":
+                # line 1 is the header
+                for line_no, row in enumerate(csv.DictReader(f), start=2):
+                    yield line_no, row
+            elif kind in (".ndjson", ".jsonl"):
+                for line_no, line in enumerate(f, start=1):
+                    if line.strip():
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError as e:
+                            yield line_no, {"_error": f"invalid JSON: {e.msg}"}
+                            continue
+                        # null, [1, 2], "x", ... are valid JSON but not a row
+                        yield line_no, record if isinstance(record, dict) else {"_error": "expected a JSON object"}
+            else:
+                raise ValueError(f"Unsupported file type '{path.name}'. Use .csv, .ndjson or .jsonl (optionally .gz).")
+
+    def _batches(self, path: Path):
+        """Split the records of a file into lists of batch_size."""
+        records = self.read_records(path)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    # ---------- lookups (one query per batch) ----------
+
+    def _resolve_airports(self, codes):
+        """Make sure every IATA code in codes is in the airport-id cache."""
+        missing = [c for c in set(codes) if c and c not in self._airport_ids]
+        if missing:
+            # one JSON array parameter, however large the batch (no SQLite variable limit)
+            for r in self.db.query_named("import_airport_ids", (json.dumps(missing),)):
+                self._airport_ids[r["IATA"]] = r["destinationID"]
+
+    def _existing_flight_ids(self, flight_nos):
+        """Return {flightNo: flightID} for the given (normalized) flight numbers, matched in any case."""
+        flight_nos = list(set(f for f in flight_nos if f))
+        if not flight_nos:
+            return {}
+        rows = self.db.query_named("import_flight_ids", (json.dumps(flight_nos),))
+        return {Utils.normalize_flight_no(r["flightNo"]): r["flightID"] for r in rows}
+
+    # ---------- validation ----------
+
+    @staticmethod
+    def _valid_datetime(value) -> bool:
+        """Check YYYY-MM-DD HH:MM and that it is a real date/time."""
+        if not value or not DATETIME_RE.match(value):
+            return False
+        try:
+            datetime.fromisoformat(value)
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _field(record, name):
+        """Return a trimmed string field, or None if missing/blank."""
+        value = record.get(name)
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    def _validate_flights(self, batch, seen_flight_nos):
+        """Split a batch into insertable value tuples and rejects (line_no, reason, record)."""
+        prepared, rejects = [], []
+        field = self._field
+
+        # read every field once, then resolve airports and existing flights with one query each
+        rows = []
+        for line_no, rec in batch:
+            if "_error" in rec:
+                rejects.append((line_no, rec["_error"], rec)); continue
+            rows.append((
+                line_no, rec,
+                Utils.normalize_flight_no(field(rec, "flightNo") or ""),
+                (field(rec, "origin") or "").upper(),
+                (field(rec, "destination") or "").upper(),
+                field(rec, "departure"),
+                field(rec, "arrival"),
+                (field(rec, "status") or "Scheduled").capitalize(),
+                field(rec, "aircraft"),
+            ))
+        self._resolve_airports([r[3] for r in rows] + [r[4] for r in rows])
+        existing = self._existing_flight_ids(r[2] for r in rows)
+        airport_ids = self._airport_ids
+
+        for line_no, rec, flight_no, origin, dest, departure, arrival, status, aircraft in rows:
+            if not flight_no:
+                reason = "missing flightNo"
+            elif flight_no in existing or flight_no in seen_flight_nos:
+                reason = f"flight '{flight_no}' already exists"
+            elif origin not in airport_ids:
+                reason = f"unknown origin '{origin}'"
+            elif dest not in airport_ids:
+                reason = f"unknown destination '{dest}'"
+            elif origin == dest:
+                reason = "origin and destination are the same"
+            elif not self._valid_datetime(departure) or not self._valid_datetime(arrival):
+                reason = "departure/arrival must be YYYY-MM-DD HH:MM"
+            elif arrival <= departure:
+                reason = "arrival must be after departure"
+            elif status not in FLIGHT_STATUSES:
+                reason = f"invalid status '{status}'"
+            else:
+                reason = None
+
+            if reason:
+                rejects.append((line_no, reason, rec)); continue
+            seen_flight_nos.add(flight_no)
+            prepared.append((line_no, rec, (
+                flight_no, airport_ids[origin], airport_ids[dest], departure, arrival, status, aircraft,
+            )))
+        return prepared, rejects
+
+    def _validate_bookings(self, batch):
+        """Split a batch into insertable value tuples and rejects (line_no, reason, record)."""
+        prepared, rejects = [], []
+        field = self._field
+
+        # read every field once, then resolve flight numbers with one query
+        rows = []
+        for line_no, rec in batch:
+            if "_error" in rec:
+                rejects.append((line_no, rec["_error"], rec)); continue
+            seat_no = field(rec, "seatNo")
+            rows.append((
+                line_no, rec,
+                Utils.normalize_flight_no(field(rec, "flightNo") or ""),
+                field(rec, "firstName"),
+                field(rec, "lastName"),
+                field(rec, "email"),
+                seat_no.upper() if seat_no else None,
+                field(rec, "status") or "Booked",
+            ))
+        flight_ids = self._existing_flight_ids(r[2] for r in rows)
+        seats = set()
+
+        for line_no, rec, flight_no, first_name, last_name, email, seat_no, status in rows:
+            flight_id = flight_ids.get(flight_no)
+            if flight_id is None:
+                reason = f"unknown flight '{flight_no}'"
+            elif not first_name or not last_name:
+                reason = "missing firstName/lastName"
+            elif status not in BOOKING_STATUSES:
+                reason = f"invalid status '{status}'"
+            elif seat_no and (flight_id, seat_no) in seats:
+                reason = f"seat {seat_no} booked twice in this batch"
+            else:
+                reason = None
+
+            if reason:
+                rejects.append((line_no, reason, rec)); continue
+            if seat_no:
+                seats.add((flight_id, seat_no))
+            prepared.append((line_no, rec, (flight_id, first_name, last_name, email, seat_no, status)))
+        return prepared, rejects
+
+    # ---------- writing ----------
+
+    def _insert_batch(self, table, columns, prepared, rejects):
+        """Insert a validated batch in one transaction; on a constraint error, retry row by row to find the culprits."""
+        with self.db.transaction("IMMEDIATE"):
+            try:
+                return self.db.bulk_insert(table, columns, [values for _, _, values in prepared])
+            except sqlite3.IntegrityError:
+                pass
+            # the batch savepoint was rolled back; isolate the rows the database refuses
+            inserted = 0
+            for line_no, rec, values in prepared:
+                try:
+                    inserted += self.db.bulk_insert(table, columns, [values])
+                except sqlite3.IntegrityError as e:
+                    rejects.append((line_no, str(e), rec))
+            return inserted
+
+    def _run(self, path, validate, table, columns):
+        """Shared batch loop; returns a summary dict including the rejected rows."""
+        start = time.perf_counter()
+        inserted, rejected = 0, []
+        for batch in self._batches(path):
+            prepared, rejects = validate(batch)
+            if prepared:
+                inserted += self._insert_batch(table, columns, prepared, rejects)
+            rejected.extend(rejects)
+        elapsed = time.perf_counter() - start
+        return {
+            "file": str(path),
+            "inserted": inserted,
+            "rejected": rejected,
+            "seconds": elapsed,
+            # write throughput: rejected rows are not written, so they do not count
+            "rows_per_second": inserted / elapsed if elapsed else 0.0,
+        }
+
+    def import_flights(self, path: Path):
+        """Import flights (flightNo, origin, destination, departure, arrival, status, aircraft)."""
+        seen = set()
+        return self._run(
+            path, lambda batch: self._validate_flights(batch, seen), "Flight",
+            ("flightNo", "originID", "destinationID", "departure", "arrival", "status", "aircraft"),
+        )
+
+    def import_bookings(self, path: Path):
+        """Import bookings (flightNo, firstName, lastName, email, seatNo, status)."""
+        return self._run(
+            path, self._validate_bookings, "Booking",
+            ("flightID", "firstName", "lastName", "email", "seatNo", "status"),
+        )
+
+    @staticmethod
+    def write_rejects(rejected, path: Path):
+        """Write rejected rows (file, line, reason, record) to a CSV report, the record as JSON."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["file", "line", "reason", "record"])
+            for file_name, line_no, reason, rec in rejected:
+                writer.writerow([file_name, line_no, reason, json.dumps(rec, ensure_ascii=False)])
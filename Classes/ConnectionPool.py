@@ -0,0 +1,185 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from Classes.DatabaseManager import DatabaseManager, DB_PATH, FETCH_BATCH_SIZE, PROFILES
+from Classes.QueryCache import AD_HOC
+from Classes.QueryTracer import QueryTracer
+from Classes.Statements import STATEMENT_CACHE_SIZE, STATEMENTS
+
+
+# a reader idle for longer than this is probed with SELECT 1 before it is handed out
+HEALTH_CHECK_AFTER = 30.0
+
+
+class PooledDatabaseManager(DatabaseManager):
+    """
+    DatabaseManager that can be shared by worker threads: one read-write
+    connection (writes are serialized by a lock) plus a pool of read-only
+    connections that serve query() in parallel (needs WAL, which every
+    profile turns on).
+    """
+
+    def __init__(self, db_path=DB_PATH, readers: int = 4, profile=None, checkout_timeout: float = 30.0):
+        if str(db_path) == ":memory:":
+            raise ValueError("A pool needs a database file; each :memory: connection is a separate database.")
+        # the inherited self.conn is the single writer
+        super().__init__(db_path, profile=profile, check_same_thread=False)
+        self.db_path = Path(db_path)
+        self.checkout_timeout = checkout_timeout
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._closed = False
+
+        # readers get the same PRAGMAs (journal_mode is per file and already set) and refuse writes
+        self._reader_pragmas = {k: v for k, v in PROFILES[self.profile].items() if k != "journal_mode"}
+        self._reader_pragmas["query_only"] = "ON"
+        self._readers = queue.LifoQueue()
+        for _ in range(readers):
+            self._readers.put(self._open_reader())
+
+    # ---------- read side ----------
+
+    def _open_reader(self):
+        """Open one read-only connection; returns [connection, last_used, tracer attached]."""
+        uri = self.db_path.resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        DatabaseManager.apply_pragmas(conn, self._reader_pragmas)
+        return [conn, time.monotonic(), None]
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        """Probe a connection with a trivial query."""
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @contextmanager
+    def reader(self):
+        """
+        Check out a read-only connection for the calling thread:
+
+            with pool.reader() as conn:
+                conn.execute(...)
+
+        Inside a transaction() the thread gets the writer instead, so it reads its own changes.
+        """
+        if getattr(self._local, "tx_depth", 0):
+            yield self.conn
+            return
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot use a closed pool.")
+
+        try:
+            entry = self._readers.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No reader connection free after {self.checkout_timeout}s.") from None
+        if time.monotonic() - entry[1] > HEALTH_CHECK_AFTER and not self._is_healthy(entry[0]):
+            entry[0].close()
+            entry = self._open_reader()
+        if entry[2] is not self.tracer:
+            # tracing was switched on or off since this reader was last used
+            QueryTracer.detach(entry[0])
+            if self.tracer is not None:
+                self.tracer.attach(entry[0])
+            entry[2] = self.tracer
+
+        try:
+            yield entry[0]
+        except sqlite3.Error:
+            # a broken connection is replaced instead of going back to the pool
+            if not self._is_healthy(entry[0]):
+                entry[0].close()
+                entry = self._open_reader()
+            raise
+        finally:
+            entry[1] = time.monotonic()
+            if self._closed:
+                entry[0].close()
+            else:
+                self._readers.put(entry)
+
+    def query(self, sql, params=()):
+        """
+        Execute SELECT queries on a pooled read-only connection and return all results.
+        """
+        return self._cached(AD_HOC, sql, params, lambda: self._read(self._fetch, sql, params))
+
+    def iter_query(self, sql, params=(), batch_size=FETCH_BATCH_SIZE):
+        """
+        Like query(), but yields rows batch_size at a time. The read connection stays
+        checked out until the iterator is exhausted or closed.
+        """
+        if self._caches(AD_HOC):
+            yield from self.query(sql, params)
+            return
+        with self.reader() as conn:
+            for rows in self._batches(conn, sql, params, batch_size):
+                yield from rows
+        self._wrote(sql, params)
+
+    def query_named(self, name, params=()):
+        """Run a named SELECT on a pooled read-only connection (a cache hit checks none out)."""
+        return self._cached(name, STATEMENTS[name], params, lambda: self._read(self._run_named, name, params))
+
+    def iter_named(self, name, params=(), batch_size=FETCH_BATCH_SIZE):
+        """Stream a named SELECT; the read connection stays checked out until the iterator ends."""
+        if self._caches(name):
+            yield from self.query_named(name, params)
+            return
+        with self.reader() as conn:
+            yield from self._iter_named(conn, name, params, batch_size)
+
+    def _read(self, run, *args):
+        with self.reader() as conn:
+            return run(conn, *args)
+
+    def _analyze(self, sql, params):
+        # the authorizer is set on the writer, which no other thread may use meanwhile
+        with self._write_lock:
+            return super()._analyze(sql, params)
+
+    # ---------- write side (one thread at a time) ----------
+
+    def execute(self, sql, params=()):
+        """
+        Run INSERT, UPDATE, or DELETE statements on the writer connection.
+        """
+        with self._write_lock:
+            return super().execute(sql, params)
+
+    def execute_named(self, name, params=()):
+        """Run a named INSERT/UPDATE/DELETE on the writer connection."""
+        with self._write_lock:
+            return super().execute_named(name, params)
+
+    @contextmanager
+    def transaction(self, mode="DEFERRED"):
+        """
+        Same as DatabaseManager.transaction(), but holds the write lock for the whole
+        block, so other threads' writes wait and this thread's queries use the writer.
+        """
+        with self._write_lock:
+            self._local.tx_depth = getattr(self._local, "tx_depth", 0) + 1
+            try:
+                with super().transaction(mode):
+                    yield self
+            finally:
+                self._local.tx_depth -= 1
+
+    def close(self):
+        """Close the writer and every idle reader (readers in use close when returned)."""
+        self._closed = True
+        with self._write_lock:
+            super().close()
+        while True:
+            try:
+                self._readers.get_nowait()[0].close()
+            except queue.Empty:
+                break
@@ -0,0 +1,217 @@
+import heapq
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from Classes.DatabaseManager import FETCH_BATCH_SIZE
+
+# minutes a pilot needs between arriving and the next departure
+MIN_TURNAROUND_MINUTES = 60
+
+# pilots whose flights are kept in memory between assignments (least recently used are dropped)
+MAX_CACHED_PILOTS = 1024
+
+
+def to_minutes(timestamp: str) -> int:
+    """Minutes since 0001-01-01 of a stored "YYYY-MM-DD HH:MM", so intervals compare as integers."""
+    t = datetime.fromisoformat(timestamp)
+    return t.toordinal() * 1440 + t.hour * 60 + t.minute
+
+
+def shifted(timestamp: str, minutes: int) -> str:
+    """A stored "YYYY-MM-DD HH:MM" moved by minutes, in the same form."""
+    return (datetime.fromisoformat(timestamp) + timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M")
+
+
+class PilotIntervals:
+    """
+    One pilot's flights as intervals sorted by departure. An overlap query is a
+    bisect for the flights departing before the new one ends, then a walk back
+    that stops once a departure is earlier than the longest flight could reach.
+    """
+
+    __slots__ = ("starts", "flights", "longest")
+
+    def __init__(self, rows=()):
+        self.starts = []
+        self.flights = []        # (start, end, flightID, flightNo, departure, arrival), by start
+        self.longest = 0
+        for row in rows:
+            self.add(row["flightID"], row["flightNo"], row["departure"], row["arrival"])
+
+    def __len__(self):
+        return len(self.flights)
+
+    def add(self, flight_id, flight_no, departure, arrival):
+        start, end = to_minutes(departure), to_minutes(arrival)
+        item = (start, end, flight_id, flight_no, departure, arrival)
+        i = bisect_left(self.flights, item)
+        self.starts.insert(i, start)
+        self.flights.insert(i, item)
+        self.longest = max(self.longest, end - start)
+
+    def remove(self, flight_id):
+        for i, item in enumerate(self.flights):
+            if item[2] == flight_id:
+                del self.starts[i], self.flights[i]
+                return
+
+    def overlapping(self, departure, arrival, buffer_minutes):
+        """The flights that leave less than buffer_minutes before departure or after arrival, by departure."""
+        start, end = to_minutes(departure), to_minutes(arrival)
+        found = []
+        i = bisect_left(self.starts, end + buffer_minutes) - 1
+        earliest = start - buffer_minutes - self.longest
+        while i >= 0 and self.starts[i] > earliest:
+            if self.flights[i][1] + buffer_minutes > start:
+                found.append(self.flights[i])
+            i -= 1
+        found.reverse()
+        return found
+
+
+class CrewRoster:
+    """
+    Finds pilots booked on flights that overlap, or that leave them less than
+    buffer_minutes to turn around. Each pilot's non-cancelled flights are read
+    with one query into a PilotIntervals on first use and kept, updated by the
+    assignments made through FlightService and dropped when one of the pilot's
+    flights is rescheduled or a transaction rolls back.
+    """
+
+    def __init__(self, db, buffer_minutes: int = MIN_TURNAROUND_MINUTES):
+        if buffer_minutes < 0:
+            raise ValueError("The turnaround buffer cannot be negative.")
+        self.db = db
+        self.buffer_minutes = buffer_minutes
+        self._lock = threading.Lock()
+        self._pilots = OrderedDict()
+        # number of pilots read from the database (a measure of cache misses)
+        self.loads = 0
+        db.on_rollback(self.invalidate)
+
+    def intervals(self, pilot_id) -> PilotIntervals:
+        """The pilot's flights, read on first use."""
+        with self._lock:
+            pilot = self._pilots.get(pilot_id)
+            if pilot is not None:
+                self._pilots.move_to_end(pilot_id)
+                return pilot
+        pilot = PilotIntervals(self.db.iter_named("crew_intervals", (pilot_id,)))
+        with self._lock:
+            self._pilots[pilot_id] = pilot
+            self.loads += 1
+            while len(self._pilots) > MAX_CACHED_PILOTS:
+                self._pilots.popitem(last=False)
+        return pilot
+
+    def invalidate(self, pilot_ids=None):
+        """Forget the given pilots (all of them by default); they are read again on the next check."""
+        with self._lock:
+            if pilot_ids is None:
+                self._pilots.clear()
+            for pilot_id in pilot_ids or ():
+                self._pilots.pop(pilot_id, None)
+
+    def conflicts(self, pilot_id, flight):
+        """The pilot's flights too close to `flight` (a row with flightID, departure, arrival and status)."""
+        if flight["status"] == "Cancelled":
+            return []
+        return [
+            item for item in self.intervals(pilot_id).overlapping(flight["departure"], flight["arrival"], self.buffer_minutes)
+            if item[2] != flight["flightID"]
+        ]
+
+    def assigned(self, pilot_id, flight):
+        """Record that the pilot now flies `flight`."""
+        with self._lock:
+            pilot = self._pilots.get(pilot_id)
+            if pilot is not None and flight["status"] != "Cancelled":
+                pilot.add(flight["flightID"], flight["flightNo"], flight["departure"], flight["arrival"])
+
+    def unassigned(self, pilot_id, flight_id):
+        """Record that the pilot no longer flies the flight."""
+        with self._lock:
+            pilot = self._pilots.get(pilot_id)
+            if pilot is not None:
+                pilot.remove(flight_id)
+
+    # ---------- delays ----------
+
+    def propagate(self, flights, minutes):
+        """
+        What delaying flights (rows with flightID, flightNo, departure, arrival) by
+        minutes does to the rotations: a pilot's next flight is pushed back when it
+        would leave less than the buffer after the delayed one (by what the buffer
+        needs, never more than the delay that reached it), and so on along every
+        crew's rotation, flights taken in departure order. Returns (plan, pilotIDs):
+        one dict per flight that moves, by departure, and the pilots flying them.
+        Nothing is written; each step is one indexed query for a pilot's next flight,
+        so the cost follows the flights that move, not the size of the roster.
+        """
+        moves = {}          # flightID -> [minutes, start, end, flightNo, departure, arrival, causedBy, pilotID]
+        for row in flights:
+            moves[row["flightID"]] = [minutes, to_minutes(row["departure"]), to_minutes(row["arrival"]),
+                                      row["flightNo"], row["departure"], row["arrival"], None, None]
+        pending = [(move[1], flight_id) for flight_id, move in moves.items()]
+        heapq.heapify(pending)
+        pilots = set()
+        while pending:
+            start, flight_id = heapq.heappop(pending)
+            delay, _, end, flight_no, departure = moves[flight_id][:5]
+            for crew in self.db.query_named("crew_of_flight", (flight_id,)):
+                pilot_id = crew["pilotID"]
+                pilots.add(pilot_id)
+                following = self.db.query_named("crew_next_flight", (pilot_id, departure, flight_id))
+                if not following:
+                    continue
+                nxt = following[0]
+                next_start = to_minutes(nxt["departure"])
+                push = min(delay, end + delay + self.buffer_minutes - next_start)
+                move = moves.get(nxt["flightID"])
+                if push <= 0 or (move is not None and move[0] >= push):
+                    continue
+                if move is None:
+                    moves[nxt["flightID"]] = [push, next_start, to_minutes(nxt["arrival"]), nxt["flightNo"],
+                                              nxt["departure"], nxt["arrival"], flight_no, pilot_id]
+                else:
+                    move[0], move[6], move[7] = push, flight_no, pilot_id
+                # again if already done: its own followers need the larger delay
+                heapq.heappush(pending, (next_start, nxt["flightID"]))
+
+        plan = [
+            {
+                "flightID": flight_id, "flightNo": flight_no, "departure": departure, "arrival": arrival,
+                "newDeparture": shifted(departure, delay), "newArrival": shifted(arrival, delay),
+                "delayMinutes": delay, "causedBy": caused_by, "pilotID": pilot_id,
+            }
+            for flight_id, (delay, _, _, flight_no, departure, arrival, caused_by, pilot_id)
+            in sorted(moves.items(), key=lambda item: (item[1][1], item[0]))
+        ]
+        return plan, pilots
+
+    # ---------- whole roster ----------
+
+    def audit(self, buffer_minutes=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        Every pair of flights of one pilot that overlap or leave less than the buffer
+        between them, in one pass over the roster sorted by pilot and departure:
+        the flights still "open" (not yet buffer_minutes past arrival) are kept in a
+        heap by end, and each new departure conflicts with all of them.
+        """
+        buffer_minutes = self.buffer_minutes if buffer_minutes is None else buffer_minutes
+        pilot, open_flights = None, []
+        for row in self.db.iter_named("crew_roster", (), batch_size):
+            if row["pilotID"] != pilot:
+                pilot, open_flights = row["pilotID"], []
+            start, end = to_minutes(row["departure"]), to_minutes(row["arrival"])
+            while open_flights and open_flights[0][0] <= start:
+                heapq.heappop(open_flights)
+            for _, _, earlier in sorted(open_flights, key=lambda item: item[2]["departure"]):
+                yield {
+                    "pilotID": pilot,
+                    "flightNo": earlier["flightNo"], "departure": earlier["departure"], "arrival": earlier["arrival"],
+                    "nextFlightNo": row["flightNo"], "nextDeparture": row["departure"], "nextArrival": row["arrival"],
+                    "gapMinutes": start - to_minutes(earlier["arrival"]),
+                }
+            heapq.heappush(open_flights, (end + buffer_minutes, row["flightID"], row))
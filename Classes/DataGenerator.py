@@ -0,0 +1,323 @@
+import csv
+import heapq
+import math
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from itertools import product
+from pathlib import Path
+from Classes.CrewRoster import MIN_TURNAROUND_MINUTES
+from Classes.DatabaseManager import DatabaseManager, PROFILES
+from Classes.SchemaMigrations import SchemaMigrations
+
+
+SCHEMA_FILE = Path(__file__).parent.parent / "Database creation" / "create_db.sql"
+IATA_CSV = Path(__file__).parent.parent / "Data" / "iataCodes.csv"
+
+FIRST_NAMES = (
+    "Anna", "Mark", "Luc", "Emily", "Jasper", "Sara", "Paul", "Chloe", "David", "Iris", "Omar", "Nina",
+    "Liam", "Eva", "Noah", "Mila", "Arthur", "Sofia", "Ben", "Aya", "Leo", "Ivy", "Marta", "Yara",
+    "Owen", "Timo", "Lucas", "Emma", "Mateo", "Olivia", "Hugo", "Zoe", "Ravi", "Mei", "Kofi", "Lena",
+)
+LAST_NAMES = (
+    "Visser", "Smit", "Dubois", "Clark", "De Jong", "Rossi", "Müller", "Martin", "Brown", "van Dijk",
+    "Hassan", "Kaya", "de Boer", "Khan", "Smith", "Verde", "Nguyen", "Lewis", "Tanaka", "Costa",
+    "Hsu", "Ruiz", "Haddad", "Kim", "Bauer", "Koenig", "Garcia", "Silva", "Patel", "Chen", "Novak", "Okafor",
+)
+COUNTRIES = (
+    "United States", "China", "United Kingdom", "Germany", "France", "Spain", "Italy", "Japan", "India",
+    "Brazil", "Canada", "Australia", "Mexico", "Turkey", "Netherlands", "Indonesia", "Nigeria", "Norway",
+)
+
+# (type, seats): narrow-bodies fly short routes, wide-bodies long ones
+SHORT_HAUL = (("A320", 180), ("A321", 220), ("B737", 189), ("E190", 100), ("A319", 144))
+LONG_HAUL = (("B787", 250), ("A350", 300), ("B777", 350), ("A330", 280))
+
+# relative number of departures per hour of the day: morning and evening banks, quiet nights
+HOUR_WEIGHTS = (1, 1, 1, 1, 2, 5, 9, 10, 9, 7, 6, 6, 6, 6, 6, 7, 8, 9, 9, 7, 5, 4, 3, 2)
+
+FLIGHT_STATUS_WEIGHTS = (("Scheduled", 85), ("Delayed", 10), ("Cancelled", 5))
+BOOKING_STATUS_WEIGHTS = (("Booked", 60), ("Checked-in", 30), ("Cancelled", 10))
+
+# preset database sizes: rows per table and days of departures
+SIZES = {
+    "small":  {"airports": 50,    "pilots": 300,   "flights": 10000,   "bookings": 100000,   "days": 30},
+    "medium": {"airports": 2000,  "pilots": 3000,  "flights": 500000,  "bookings": 5000000,  "days": 180},
+    "large":  {"airports": 50000, "pilots": 10000, "flights": 5000000, "bookings": 50000000, "days": 365},
+}
+
+# minutes a pilot needs between arriving and the next departure (what CrewRoster enforces)
+TURNAROUND_MINUTES = MIN_TURNAROUND_MINUTES
+
+
+class DataGenerator:
+    """
+    Builds a database of any size from a seed. The same seed and sizes always
+    give the same rows. Airports start with the real ones from Data/iataCodes.csv;
+    traffic concentrates on a few hub airports and follows morning/evening
+    departure banks; every CHECK/UNIQUE constraint of create_db.sql holds.
+    """
+
+    def __init__(self, seed: int = 42, batch_size: int = 50000):
+        self.seed = seed
+        self.batch_size = batch_size
+
+    def build(self, db_path, airports=50, pilots=12, flights=1000, bookings=10000,
+              start="2025-10-01", days=30):
+        """
+        Create a new database file with the given number of rows per table and return
+        {"table": rows, ..., "seconds": s}. bookings is a target: each flight gets a
+        number proportional to its aircraft size, capped at its seat count.
+        """
+        db_path = Path(db_path)
+        if db_path.exists():
+            raise FileExistsError(f"{db_path} already exists; the generator only builds new databases.")
+        if airports < 2 or pilots < 2 or days < 1:
+            raise ValueError("Need at least 2 airports, 2 pilots and 1 day.")
+
+        rng = random.Random(self.seed)
+        started = time.perf_counter()
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            conn.executescript(SCHEMA_FILE.read_text(encoding="utf-8"))
+            DatabaseManager.apply_pragmas(conn, PROFILES["bulk-load"])
+            conn.execute("PRAGMA foreign_keys = ON;")
+
+            airport_rows = self._airports(rng, airports)
+            self._insert(conn, "Destination", ("destinationID", "IATA", "airportName", "country", "city", "isActive"), airport_rows)
+            self._insert(conn, "Pilot", ("pilotID", "firstName", "lastName", "licenseNo", "dateOfBirth", "email", "hireDate"),
+                         self._pilots(rng, pilots))
+
+            routes = self._routes(rng, airport_rows, flights)
+            counts = {"Destination": airports, "Pilot": pilots, "Flight": 0, "FlightCrew": 0, "Booking": 0}
+            per_flight = bookings / flights if flights else 0
+            # seats of the average flight (routes are drawn by weight)
+            mean_seats = sum(r[4] * r[6] for r in routes) / sum(r[6] for r in routes) if routes else 1
+            flight_rows, crew_rows, booking_rows = [], [], []
+            for flight, crew, booked in self._traffic(rng, routes, pilots, flights, per_flight / mean_seats, start, days):
+                flight_rows.append(flight)
+                crew_rows.extend(crew)
+                booking_rows.extend(booked)
+                if len(booking_rows) >= self.batch_size or len(flight_rows) >= self.batch_size:
+                    self._flush(conn, counts, flight_rows, crew_rows, booking_rows)
+            self._flush(conn, counts, flight_rows, crew_rows, booking_rows)
+
+            # indexes are cheaper to build once over the loaded tables than to maintain row by row
+            SchemaMigrations.apply(conn)
+            conn.execute("PRAGMA analysis_limit = 1000;")
+            conn.execute("ANALYZE;")
+        except BaseException:
+            conn.close()
+            db_path.unlink(missing_ok=True)
+            raise
+        conn.close()
+        counts["seconds"] = time.perf_counter() - started
+        return counts
+
+    # ---------- writing ----------
+
+    def _insert(self, conn, table, columns, rows):
+        """Insert rows batch_size at a time, one transaction per batch."""
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)});"
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._write(conn, sql, batch)
+                batch.clear()
+        if batch:
+            self._write(conn, sql, batch)
+
+    @staticmethod
+    def _write(conn, sql, rows):
+        conn.execute("BEGIN;")
+        try:
+            conn.executemany(sql, rows)
+        except BaseException:
+            conn.execute("ROLLBACK;")
+            raise
+        conn.execute("COMMIT;")
+
+    def _flush(self, conn, counts, flight_rows, crew_rows, booking_rows):
+        """Write the pending flights with their crew and bookings in one transaction."""
+        if not flight_rows:
+            return
+        conn.execute("BEGIN;")
+        try:
+            conn.executemany(
+                "INSERT INTO Flight (flightID, flightNo, originID, destinationID, departure, arrival, status, aircraft, lastUpdate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);", flight_rows)
+            conn.executemany(
+                "INSERT INTO FlightCrew (pilotID, flightID, role, assignedAt) VALUES (?, ?, ?, ?);", crew_rows)
+            conn.executemany(
+                "INSERT INTO Booking (flightID, firstName, lastName, email, seatNo, status, lastUpdate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?);", booking_rows)
+        except BaseException:
+            conn.execute("ROLLBACK;")
+            raise
+        conn.execute("COMMIT;")
+        counts["Flight"] += len(flight_rows)
+        counts["FlightCrew"] += len(crew_rows)
+        counts["Booking"] += len(booking_rows)
+        flight_rows.clear()
+        crew_rows.clear()
+        booking_rows.clear()
+
+    # ---------- reference data ----------
+
+    @staticmethod
+    def _airports(rng, count):
+        """The real airports first, then made-up ones; codes are 3 letters while they last, then 4."""
+        rows = []
+        with open(IATA_CSV, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if len(rows) == count:
+                    return rows
+                rows.append((len(rows) + 1, row["IATA"].strip().upper(), row["Airport"], row["Country"], row["City"], 1))
+
+        used = {row[1] for row in rows}
+        codes = ("".join(letters) for length in (3, 4) for letters in product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=length))
+        for code in codes:
+            if len(rows) == count:
+                break
+            if code in used:
+                continue
+            airport_id = len(rows) + 1
+            city = f"City {airport_id}"
+            # a few small airports are closed
+            rows.append((airport_id, code, f"{city} Airport", rng.choice(COUNTRIES), city, int(rng.random() > 0.03)))
+        if len(rows) < count:
+            raise ValueError(f"Cannot make {count} unique airport codes.")
+        return rows
+
+    @staticmethod
+    def _pilots(rng, count):
+        for pilot_id in range(1, count + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            born = date(1960, 1, 1) + timedelta(days=rng.randrange(38 * 365))
+            hired = born + timedelta(days=rng.randrange(21 * 365, 40 * 365))
+            hired = min(hired, date(2025, 1, 1))
+            email = f"{first}.{last}.{pilot_id}@air.example".lower().replace(" ", "")
+            yield (pilot_id, first, last, f"P-{pilot_id:06d}", born.isoformat(), email, hired.isoformat())
+
+    @staticmethod
+    def _routes(rng, airport_rows, flights):
+        """
+        A route network: (originID, destinationID, airline, minutes, seats, aircraft, weight).
+        Airport traffic follows a Zipf curve (first airports are the hubs), a route's
+        traffic is the product of its ends, and its duration follows the distance
+        between made-up coordinates. Airports sit in a few regional clusters and
+        long routes are rarer, so most flights are short-haul.
+        """
+        active = [row[0] for row in airport_rows if row[5]]
+        if len(active) < 2:
+            raise ValueError("Need at least 2 active airports.")
+        hub_weight = {airport_id: 1 / rank ** 1.1 for rank, airport_id in enumerate(active, start=1)}
+        cum_weights = list(accumulate_weights(hub_weight.values()))
+        regions = [(rng.uniform(-40, 60), rng.uniform(-150, 150)) for _ in range(8)]
+        coords = {}
+        for airport_id in active:
+            lat, lon = rng.choice(regions)
+            coords[airport_id] = (max(-80.0, min(80.0, rng.gauss(lat, 6))), rng.gauss(lon, 8))
+        airlines = ["".join(pair) for pair in product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=2)]
+        airlines = rng.sample(airlines, 60)
+
+        # about 20 flights per route over the period, at most 200k routes
+        count = max(1, min(flights // 20, 200000)) if flights else 0
+        routes = {}
+        tries = 0
+        while len(routes) < count and tries < count * 50:
+            tries += 1
+            origin, destination = rng.choices(active, cum_weights=cum_weights, k=2)
+            if origin == destination or (origin, destination) in routes:
+                continue
+            if rng.random() > math.exp(-distance_km(coords[origin], coords[destination]) / 2500):
+                continue
+            routes[(origin, destination)] = DataGenerator._route(rng, origin, destination, coords, hub_weight, airlines)
+        if count and not routes:
+            # a few airports far apart can reject every draw: fly between the two hubs
+            origin, destination = active[0], active[1]
+            routes[(origin, destination)] = DataGenerator._route(rng, origin, destination, coords, hub_weight, airlines)
+        return list(routes.values())
+
+    @staticmethod
+    def _route(rng, origin, destination, coords, hub_weight, airlines):
+        """One route row for _routes(); its duration and weight follow the distance."""
+        km = distance_km(coords[origin], coords[destination])
+        nearness = math.exp(-km / 2500)
+        minutes = 30 + int(km / 800 * 60) // 5 * 5
+        aircraft, seats = rng.choice(LONG_HAUL if minutes > 6 * 60 else SHORT_HAUL)
+        weight = hub_weight[origin] * hub_weight[destination] * nearness
+        return origin, destination, rng.choice(airlines), minutes, seats, aircraft, weight
+
+    # ---------- traffic ----------
+
+    def _traffic(self, rng, routes, pilots, flights, bookings_per_seat, start, days):
+        """Yield (flight_row, crew_rows, booking_rows) day by day, in departure order."""
+        if not flights:
+            return
+        first_day = date.fromisoformat(start)
+        day_names = [(first_day + timedelta(days=d)).isoformat() for d in range(days + 2)]
+        # crews are assigned a week ahead, so the first week's assignments predate the period
+        assigned_days = [(first_day + timedelta(days=d - 7)).isoformat() for d in range(days)]
+        route_weights = list(accumulate_weights(route[6] for route in routes))
+        hour_weights = list(accumulate_weights(HOUR_WEIGHTS))
+        statuses, status_weights = zip(*FLIGHT_STATUS_WEIGHTS)
+        booking_statuses, booking_weights = zip(*BOOKING_STATUS_WEIGHTS)
+        next_number = {}
+        # pilots by the minute they are free again (minutes since the first day)
+        free_at = [(0, pilot_id) for pilot_id in range(1, pilots + 1)]
+        rng.shuffle(free_at)
+        heapq.heapify(free_at)
+
+        flight_id = 0
+        for day in range(days):
+            todays = flights * (day + 1) // days - flights * day // days
+            departures = sorted(
+                (rng.choices(range(24), cum_weights=hour_weights)[0] * 60 + rng.randrange(0, 60, 5), route)
+                for route in rng.choices(routes, cum_weights=route_weights, k=todays)
+            )
+            for minute, (origin, destination, airline, minutes, seats, aircraft, _) in departures:
+                flight_id += 1
+                number = next_number.get(airline, 100)
+                next_number[airline] = number + 1
+                departs = day * 1440 + minute
+                arrives = departs + minutes
+                departure = f"{day_names[day]} {minute // 60:02d}:{minute % 60:02d}"
+                arrival = f"{day_names[arrives // 1440]} {arrives % 1440 // 60:02d}:{arrives % 60:02d}"
+                assigned = f"{assigned_days[day]} 09:00"
+                status = rng.choices(statuses, weights=status_weights)[0]
+                flight = (flight_id, f"{airline}{number}", origin, destination, departure, arrival, status, aircraft, assigned)
+
+                # the two pilots free the longest (overlaps only when the roster is too small)
+                captain, co_captain = heapq.heappop(free_at)[1], heapq.heappop(free_at)[1]
+                for pilot_id in (captain, co_captain):
+                    heapq.heappush(free_at, (arrives + TURNAROUND_MINUTES, pilot_id))
+                crew = ((captain, flight_id, "Captain", assigned), (co_captain, flight_id, "Co-Captain", assigned))
+
+                booked = []
+                wanted = min(seats, int(seats * bookings_per_seat * rng.uniform(0.6, 1.4) + rng.random()))
+                if wanted:
+                    for seat in rng.sample(range(seats), wanted):
+                        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                        # six seats a row; a few passengers have no seat yet (UNIQUE allows many NULLs)
+                        seat_no = f"{seat // 6 + 1}{'ABCDEF'[seat % 6]}" if rng.random() > 0.02 else None
+                        booked.append((flight_id, first, last, f"{first}.{last}@example.com".lower().replace(" ", ""),
+                                       seat_no, rng.choices(booking_statuses, weights=booking_weights)[0], assigned))
+                yield flight, crew, booked
+
+
+def accumulate_weights(weights):
+    """Running totals, for random.choices(cum_weights=...)."""
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
+
+
+def distance_km(a, b):
+    """Great-circle distance between two (lat, lon) points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
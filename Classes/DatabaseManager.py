@@ -1,34 +1,370 @@
+import os
+import re
 import sqlite3
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from Classes.QueryCache import AD_HOC, QueryCache, tables_of
+from Classes.QueryTracer import QueryTracer
+from Classes.SchemaMigrations import SchemaMigrations
+from Classes.Statements import STATEMENT_CACHE_SIZE, STATEMENTS, StatementStats
 
 
 # path to the database
 DB_PATH = Path(__file__).parent.parent / "flight_management.db"
 
+# BEGIN modes accepted by transaction()
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+# connection profiles: PRAGMAs applied (in this order) when a connection is opened.
+# cache_size < 0 is in KiB, mmap_size in bytes, busy_timeout in ms.
+PROFILES = {
+    # menu CLI: readers never block on commits (WAL), durable at checkpoint (NORMAL)
+    "interactive": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16 * 1024,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # imports: no fsync at all, big cache; a power loss can lose the last commits
+    # (but not corrupt the WAL database), so only use it for re-runnable loads
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256 * 1024,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # reports: large cache/mmap for scans, and the connection refuses writes
+    "read-only-reporting": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64 * 1024,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+        "query_only": "ON",
+    },
+}
+
+# profile used when none is passed to DatabaseManager
+DEFAULT_PROFILE = os.environ.get("FLIGHT_DB_PROFILE", "interactive")
+
+# set FLIGHT_DB_SLOW_MS to trace every statement and log those slower than this many ms
+SLOW_MS = os.environ.get("FLIGHT_DB_SLOW_MS")
+
+# set FLIGHT_DB_CACHE to cache read results: "all", or named statements separated by commas
+# ("destinations_all,pilot_schedule"; "ad-hoc" for db.query())
+CACHE_STATEMENTS = os.environ.get("FLIGHT_DB_CACHE")
+
+# rows fetched per round trip by iter_query()
+FETCH_BATCH_SIZE = 500
+
+# table/column names are interpolated into bulk_insert's SQL, so only plain identifiers are allowed
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class DatabaseManager:
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, profile=None, check_same_thread=True):
         """
-        Initialize a database connection and enable foreign key support.
+        Initialize a database connection, enable foreign key support,
+        bring the schema (indexes, ...) up to the latest migration and
+        apply a connection profile (see PROFILES; default from the
+        FLIGHT_DB_PROFILE environment variable, else "interactive").
         """
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row  
+        self.profile = profile or DEFAULT_PROFILE
+        if self.profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{self.profile}'. Use one of: {', '.join(PROFILES)}.")
+
+        # autocommit mode: transactions are only opened explicitly by transaction()
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=check_same_thread,
+                                    cached_statements=STATEMENT_CACHE_SIZE)
+        self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON;")
+        self._savepoint_depth = 0
+        self._rollback_listeners = []
+        self.stats = StatementStats()
+        self.tracer = None
+        # the tracer started for FLIGHT_DB_SLOW_MS, which this manager logs and closes
+        self._owned_tracer = None
+        self.cache = None
+        self._tx_written = set()
+        SchemaMigrations.apply(self.conn)
+        DatabaseManager.apply_pragmas(self.conn, PROFILES[self.profile])
+        if SLOW_MS:
+            self._owned_tracer = self.enable_tracing(QueryTracer(slow_ms=float(SLOW_MS)))
+        if CACHE_STATEMENTS:
+            names = None if CACHE_STATEMENTS.strip() == "all" else {n.strip() for n in CACHE_STATEMENTS.split(",")}
+            self.enable_cache(QueryCache(statements=names))
+
+    @staticmethod
+    def apply_pragmas(conn, pragmas):
+        """Run the PRAGMAs of a connection profile (values come from PROFILES, not user input)."""
+        for name, value in pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value};")
+
+    def pragmas(self):
+        """Return the current value of every PRAGMA a profile can set."""
+        names = {name for settings in PROFILES.values() for name in settings}
+        return {name: self.conn.execute(f"PRAGMA {name};").fetchone()[0] for name in sorted(names)}
 
     def execute(self, sql, params=()):
         """
-        Run INSERT, UPDATE, or DELETE statements and commit changes.
+        Run INSERT, UPDATE, or DELETE statements.
+        Outside transaction() each statement commits on its own;
+        inside it, changes are committed when the outermost block ends.
         """
-        cur = self.conn.execute(sql, params)
-        self.conn.commit()
-        return cur
+        return self._execute(self.conn, sql, params)
 
     def query(self, sql, params=()):
         """
-        Execute SELECT queries and return all results.
+        Execute SELECT queries and return all results
+        (from the result cache, if it is on for AD_HOC queries).
+        """
+        return self._cached(AD_HOC, sql, params, lambda: self._fetch(self.conn, sql, params))
+
+    def iter_query(self, sql, params=(), batch_size=FETCH_BATCH_SIZE):
+        """
+        Execute a SELECT and yield its rows, fetching batch_size at a time,
+        so memory stays flat however large the result is.
+        """
+        if self._caches(AD_HOC):
+            yield from self.query(sql, params)
+            return
+        for rows in self._batches(self.conn, sql, params, batch_size):
+            yield from rows
+        self._wrote(sql, params)
+
+    # ---------- tracing (see Classes/QueryTracer.py) ----------
+
+    def enable_tracing(self, tracer=None):
+        """Time every statement from now on with a QueryTracer (default settings if none given); returns it."""
+        self.disable_tracing()
+        self.tracer = tracer or QueryTracer()
+        self.tracer.attach(self.conn)
+        return self.tracer
+
+    def disable_tracing(self):
+        """Stop tracing; statements run without any timing again."""
+        if self.tracer is not None:
+            QueryTracer.detach(self.conn)
+            if self.tracer is self._owned_tracer:
+                # nobody else holds the FLIGHT_DB_SLOW_MS tracer: finish it now
+                self._owned_tracer = None
+                self.tracer.log_summary()
+                self.tracer.close()
+            self.tracer = None
+
+    # ---------- result cache (see Classes/QueryCache.py) ----------
+
+    def enable_cache(self, cache=None):
+        """Serve reads from a QueryCache from now on (every statement cached if none given); returns it."""
+        self.cache = cache or QueryCache()
+        return self.cache
+
+    def disable_cache(self):
+        """Stop caching; every read goes to the database again."""
+        self.cache = None
+
+    def _caches(self, name) -> bool:
+        return self.cache is not None and self.cache.wants(name)
+
+    def _cached(self, name, sql, params, load):
+        """The rows of a SELECT from the cache if it is on for this statement, else load()."""
+        if not self._caches(name):
+            rows = load()
+            if name == AD_HOC:
+                # ad-hoc SQL can write too (UPDATE ... RETURNING)
+                self._wrote(sql, params)
+            return rows
+        return self.cache.fetch(name, sql, params, load, self._analyze)
+
+    def _analyze(self, sql, params):
+        """(tables read, tables written) by a statement, see tables_of()."""
+        return tables_of(self.conn, sql, params)
+
+    def _wrote(self, sql, params):
+        """Mark the tables a write touched as changed, now and again when its transaction ends."""
+        if self.cache is None:
+            return
+        tables = self.cache.written_tables(sql, params, self._analyze)
+        if tables is not None and not tables:
+            return
+        self.cache.bump(tables)
+        if self.conn.in_transaction:
+            self._tx_written.add(tables)
+
+    def _bump_tx_written(self):
+        """
+        Mark the tables written in the open transaction as changed again: when it
+        ends, other connections only now see (or never see) those writes, and after
+        a rollback the entries read inside it hold undone changes.
         """
-        cur = self.conn.execute(sql, params)
-        return cur.fetchall()
+        if self.cache is not None:
+            for tables in self._tx_written:
+                self.cache.bump(tables)
+
+    def _execute(self, conn, sql, params):
+        if self.tracer is None:
+            cur = conn.execute(sql, params)
+        else:
+            cur = self.tracer.execute(conn, sql, params)
+        self._wrote(sql, params)
+        return cur
+
+    def _fetch(self, conn, sql, params):
+        if self.tracer is None:
+            return conn.execute(sql, params).fetchall()
+        return self.tracer.fetchall(conn, sql, params)
+
+    def _batches(self, conn, sql, params, batch_size):
+        """Yield the rows of a SELECT as lists of up to batch_size rows."""
+        if self.tracer is not None:
+            yield from self.tracer.batches(conn, sql, params, batch_size)
+            return
+        cur = conn.execute(sql, params)
+        try:
+            while rows := cur.fetchmany(batch_size):
+                yield rows
+        finally:
+            cur.close()
+
+    # ---------- named statements (see Classes/Statements.py) ----------
+
+    def query_named(self, name, params=()):
+        """Run a SELECT from STATEMENTS by name and return all results (or the cached ones)."""
+        return self._cached(name, STATEMENTS[name], params, lambda: self._run_named(self.conn, name, params))
+
+    def iter_named(self, name, params=(), batch_size=FETCH_BATCH_SIZE):
+        """
+        Like iter_query() for a named SELECT; timed until the last row is fetched.
+        A statement that is cached is read whole, then yielded.
+        """
+        if self._caches(name):
+            yield from self.query_named(name, params)
+            return
+        yield from self._iter_named(self.conn, name, params, batch_size)
+
+    def execute_named(self, name, params=()):
+        """Run an INSERT/UPDATE/DELETE from STATEMENTS by name; returns the cursor."""
+        return self._run_named(self.conn, name, params, fetch=False)
+
+    def statement_stats(self):
+        """Calls (first per connection and repeated), rows and latency of every named statement used so far."""
+        return self.stats.summary()
+
+    def _run_named(self, conn, name, params, fetch=True):
+        """Execute a named statement on conn and record it in self.stats."""
+        start = time.perf_counter()
+        if fetch:
+            result = self._fetch(conn, STATEMENTS[name], params)
+            rows = len(result)
+        else:
+            result = self._execute(conn, STATEMENTS[name], params)
+            rows = result.rowcount
+        self.stats.record(name, conn, time.perf_counter() - start, rows)
+        return result
+
+    def _iter_named(self, conn, name, params, batch_size):
+        """Stream a named SELECT from conn; only time spent inside SQLite is recorded."""
+        seconds, count = 0.0, 0
+        start = time.perf_counter()
+        for rows in self._batches(conn, STATEMENTS[name], params, batch_size):
+            seconds += time.perf_counter() - start
+            count += len(rows)
+            yield from rows
+            start = time.perf_counter()
+        seconds += time.perf_counter() - start
+        self.stats.record(name, conn, seconds, count)
+
+    def bulk_insert(self, table, columns, rows, on_conflict=None):
+        """
+        Insert many rows with one prepared statement (executemany) in one transaction
+        (a savepoint if a transaction is already open). on_conflict can be "IGNORE" or
+        "REPLACE" for INSERT OR ...; returns the number of rows written.
+        """
+        for name in (table, *columns):
+            if not IDENTIFIER.match(name):
+                raise ValueError(f"Invalid identifier: {name!r}")
+        if on_conflict not in (None, "IGNORE", "REPLACE"):
+            raise ValueError(f"Invalid conflict clause: {on_conflict!r}")
+
+        verb = f"INSERT OR {on_conflict}" if on_conflict else "INSERT"
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders});"
+        with self.transaction("IMMEDIATE"):
+            if self.tracer is None:
+                cur = self.conn.executemany(sql, rows)
+            else:
+                cur = self.tracer.executemany(self.conn, sql, rows)
+            self._wrote(sql, (None,) * len(columns))
+        return cur.rowcount
+
+    @contextmanager
+    def transaction(self, mode="DEFERRED"):
+        """
+        Group statements into one atomic commit:
+
+            with db.transaction("IMMEDIATE"):
+                db.execute(...)
+                db.execute(...)
+
+        Commits when the block ends, rolls back if it raises. A nested
+        transaction() becomes a SAVEPOINT, so only the inner block is
+        undone when it raises (mode only applies to the outermost block).
+        """
+        mode = mode.upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f"Unknown transaction mode '{mode}'. Use one of: {', '.join(TRANSACTION_MODES)}.")
+
+        if self.conn.in_transaction:
+            self._savepoint_depth += 1
+            name = f"sp_{self._savepoint_depth}"
+            self.conn.execute(f"SAVEPOINT {name};")
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute(f"ROLLBACK TO {name};")
+                self.conn.execute(f"RELEASE {name};")
+                self._rolled_back()
+                self._bump_tx_written()
+                raise
+            else:
+                self.conn.execute(f"RELEASE {name};")
+            finally:
+                self._savepoint_depth -= 1
+            return
+
+        self.conn.execute(f"BEGIN {mode};")
+        try:
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            self._bump_tx_written()
+            self._rolled_back()
+            raise
+        else:
+            self.conn.commit()
+            self._bump_tx_written()
+        finally:
+            self._tx_written.clear()
+
+    def on_rollback(self, callback):
+        """
+        Call callback() after any transaction() block (or nested block) is rolled
+        back, so in-memory copies of data written inside it can be dropped.
+        """
+        self._rollback_listeners.append(callback)
+
+    def _rolled_back(self):
+        for callback in self._rollback_listeners:
+            callback()
 
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
\ No newline at end of file
+        """Close the database connection (a tracer started by FLIGHT_DB_SLOW_MS logs its summary first)."""
+        if self._owned_tracer is not None and self.tracer is not None:
+            self.disable_tracing()
+        self.conn.close()
@@ -0,0 +1,181 @@
+import json
+from Classes.DataGenerator import LONG_HAUL, SHORT_HAUL
+from Classes.DatabaseManager import FETCH_BATCH_SIZE
+
+# NumPy is optional: only the analytics need it (pip install numpy)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# seats per aircraft type, for load factors; flights of another (or no) type are left out
+AIRCRAFT_SEATS = dict(SHORT_HAUL + LONG_HAUL)
+
+# status codes of the loaded flights (analytics_flights)
+SCHEDULED, DELAYED, CANCELLED = 0, 1, 2
+
+# report name -> named SQL statement computing the same rows
+REPORTS = {
+    "block_hours": "analytics_block_hours",
+    "route_frequencies": "analytics_route_frequencies",
+    "origin_reliability": "analytics_origin_reliability",
+    "load_factors": "analytics_load_factors",
+}
+
+
+class FleetAnalytics:
+    """
+    Fleet reports over the whole schedule, computed with NumPy. The flights and crew
+    are read once into arrays (airports as indexes into one IATA array, times as epoch
+    seconds, statuses as small integers); every report is then a few vectorized passes
+    over them instead of a GROUP BY query. Each report returns exactly the rows of its
+    SQL version (sql_report()), in the same order.
+    """
+
+    def __init__(self, db, batch_size: int = FETCH_BATCH_SIZE):
+        if np is None:
+            raise ImportError("FleetAnalytics needs NumPy: pip install numpy")
+        self.db = db
+        self.batch_size = batch_size
+        self.loaded = False
+
+    def load(self):
+        """(Re)read the columns the reports use; the reports call it on first use."""
+        seats = json.dumps(AIRCRAFT_SEATS)
+        airports = self._array("analytics_airports", (), [("id", "i8"), ("iata", "O")])
+        flights = self._array("analytics_flights", (seats,), [
+            ("id", "i8"), ("origin", "i8"), ("destination", "i8"), ("departure", "i8"), ("arrival", "i8"),
+            ("status", "i1"), ("seats", "i4"), ("passengers", "i4"),
+        ])
+        crew = self._array("analytics_crew", (), [("pilot", "i8"), ("flight", "i8")])
+
+        self.iata = airports["iata"]
+        # position of each airport in IATA order, to sort reports by code without comparing strings
+        self.iata_rank = np.empty(len(self.iata), dtype=np.int64)
+        self.iata_rank[np.argsort(self.iata.astype(str), kind="stable")] = np.arange(len(self.iata))
+        # both ID columns are sorted (ORDER BY), so an ID becomes an index with one searchsorted
+        self.origin = np.searchsorted(airports["id"], flights["origin"])
+        self.destination = np.searchsorted(airports["id"], flights["destination"])
+        self.departure = flights["departure"]
+        self.arrival = flights["arrival"]
+        self.status = flights["status"]
+        self.seats = flights["seats"]
+        self.passengers = flights["passengers"]
+        self.crew_pilot = crew["pilot"]
+        self.crew_flight = np.searchsorted(flights["id"], crew["flight"])
+        self.loaded = True
+        return self
+
+    def _array(self, name, params, dtype):
+        """A named SELECT as a structured array, streamed in batches."""
+        rows = self.db.iter_named(name, params, self.batch_size)
+        return np.fromiter(map(tuple, rows), dtype=np.dtype(dtype))
+
+    def _loaded(self):
+        if not self.loaded:
+            self.load()
+
+    # ---------- reports ----------
+
+    def report(self, name):
+        """One report by name (see REPORTS)."""
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report '{name}'. Use one of: {', '.join(REPORTS)}.")
+        return getattr(self, name)()
+
+    def sql_report(self, name):
+        """The same report computed by SQLite, for checking and benchmarking."""
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report '{name}'. Use one of: {', '.join(REPORTS)}.")
+        params = (json.dumps(AIRCRAFT_SEATS),) if name == "load_factors" else ()
+        return [dict(row) for row in self.db.query_named(REPORTS[name], params)]
+
+    def block_hours(self):
+        """Flights and block hours (departure to arrival) per pilot and month, cancelled flights excluded."""
+        self._loaded()
+        flown = self.status[self.crew_flight] != CANCELLED
+        flights = self.crew_flight[flown]
+        pilots, pilot = np.unique(self.crew_pilot[flown], return_inverse=True)
+        months = self.departure[flights].astype("datetime64[s]").astype("datetime64[M]")
+        first = months.min() if len(months) else np.datetime64("1970-01", "M")
+        month = (months - first).astype(np.int64)
+        n_months = int(month.max()) + 1 if len(month) else 1
+        # pilots x months is small, so one bincount over the combined key does the grouping
+        key = pilot * n_months + month
+        size = len(pilots) * n_months
+        count = np.bincount(key, minlength=size)
+        seconds = np.bincount(key, weights=self.arrival[flights] - self.departure[flights], minlength=size)
+        groups = np.flatnonzero(count)
+        labels = np.datetime_as_string(first + np.arange(n_months), unit="M")
+        return [
+            {"pilotID": int(pilots[g // n_months]), "month": str(labels[g % n_months]),
+             "flights": int(count[g]), "blockHours": float(seconds[g]) / 3600.0}
+            for g in groups
+        ]
+
+    def route_counts(self):
+        """(origin indexes, destination indexes, flights) of every route flown, cancelled flights excluded."""
+        self._loaded()
+        flown = self.status != CANCELLED
+        # airports x airports can be billions of cells: group the occurring routes only
+        routes, count = np.unique(self.origin[flown] * len(self.iata) + self.destination[flown], return_counts=True)
+        return routes // len(self.iata), routes % len(self.iata), count
+
+    def route_frequencies(self):
+        """Flights per route, busiest first, cancelled flights excluded."""
+        origin, destination, count = self.route_counts()
+        order = np.lexsort((self.iata_rank[destination], self.iata_rank[origin], -count))
+        return [
+            {"origin": self.iata[origin[i]], "destination": self.iata[destination[i]], "flights": int(count[i])}
+            for i in order
+        ]
+
+    def route_matrix(self, top: int = 20):
+        """
+        (IATA codes, matrix) for the top airports by departures: matrix[i, j] is the
+        number of flights from code i to code j, cancelled flights excluded.
+        """
+        origin, destination, count = self.route_counts()
+        departures = np.bincount(origin, weights=count, minlength=len(self.iata))
+        busiest = np.lexsort((self.iata_rank, -departures))[:top]
+        position = np.full(len(self.iata), -1)
+        position[busiest] = np.arange(len(busiest))
+        inside = (position[origin] >= 0) & (position[destination] >= 0)
+        matrix = np.zeros((len(busiest), len(busiest)), dtype=np.int64)
+        matrix[position[origin[inside]], position[destination[inside]]] = count[inside]
+        return [str(code) for code in self.iata[busiest]], matrix
+
+    def origin_reliability(self):
+        """Flights, delays and cancellations per origin airport, with their rates."""
+        self._loaded()
+        size = len(self.iata)
+        flights = np.bincount(self.origin, minlength=size)
+        delayed = np.bincount(self.origin[self.status == DELAYED], minlength=size)
+        cancelled = np.bincount(self.origin[self.status == CANCELLED], minlength=size)
+        airports = np.flatnonzero(flights)
+        airports = airports[np.argsort(self.iata_rank[airports])]
+        return [
+            {"origin": self.iata[a], "flights": int(flights[a]), "delayed": int(delayed[a]),
+             "cancelled": int(cancelled[a]), "delayRate": int(delayed[a]) / int(flights[a]),
+             "cancellationRate": int(cancelled[a]) / int(flights[a])}
+            for a in airports
+        ]
+
+    def load_factors(self):
+        """
+        Passengers (booked or checked in) over seats per route, for flights that are not
+        cancelled and whose aircraft type has a known seat count (AIRCRAFT_SEATS).
+        """
+        self._loaded()
+        flown = (self.status != CANCELLED) & (self.seats > 0)
+        routes, route = np.unique(self.origin[flown] * len(self.iata) + self.destination[flown], return_inverse=True)
+        flights = np.bincount(route, minlength=len(routes))
+        passengers = np.bincount(route, weights=self.passengers[flown], minlength=len(routes))
+        seats = np.bincount(route, weights=self.seats[flown], minlength=len(routes))
+        origin, destination = routes // len(self.iata), routes % len(self.iata)
+        order = np.lexsort((self.iata_rank[destination], self.iata_rank[origin]))
+        return [
+            {"origin": self.iata[origin[i]], "destination": self.iata[destination[i]], "flights": int(flights[i]),
+             "passengers": int(passengers[i]), "seats": int(seats[i]), "loadFactor": int(passengers[i]) / int(seats[i])}
+            for i in order
+        ]
@@ -2,19 +2,26 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 from textwrap import dedent
+from Classes.AirportRegistry import AirportRegistry
 from Classes.DatabaseManager import DatabaseManager
 from Classes.Utils import Utils
 from Classes.IATAValidator import IATAValidator
+from Classes.FlightService import FlightService, VALID_CREW_ROLES
 
-# path to the database
+# path to the database and the IATA reference list
 DB_PATH = Path(__file__).parent.parent / "flight_management.db"
+IATA_CSV = Path(__file__).parent.parent / "Data" / "iataCodes.csv"
 
 class FlightManagementApp:
     """Main CLI logic: all six menu operations."""
     
-    def __init__(self):
-        self.db = DatabaseManager(DB_PATH)
-        self.iata_validator = IATAValidator(Path(__file__).parent.parent / "Data" / "iataCodes.csv")
+    def __init__(self, db_path=DB_PATH, iata_csv=IATA_CSV):
+        self.db = DatabaseManager(db_path)
+        # the IATA list is only read when a prompt first validates a code
+        self.iata_validator = IATAValidator(iata_csv)
+        # Destination in memory: prompts check codes against it, the service resolves IDs from it
+        self.airports = AirportRegistry(self.db, self.iata_validator)
+        self.service = FlightService(self.db, self.airports)
 
 
     # 1) Function to add a new flight
@@ -25,20 +32,16 @@ class FlightManagementApp:
         flight_no = Utils.prompt_unique_flight_no(self.db)
 
         # prompt for origin iata
-        origin_iata = self.iata_validator.prompt_valid_iata("Origin IATA: ")
+        origin_iata = self.airports.prompt_iata("Origin IATA: ", active_only=True)
 
         # prompt for destination iata
         while True:
-            dest_iata = self.iata_validator.prompt_valid_iata("Destination IATA: ")
+            dest_iata = self.airports.prompt_iata("Destination IATA: ", active_only=True)
             if dest_iata == origin_iata:
                 print("Destination cannot be the same as Origin. Please choose another airport.\n")
                 continue
             break
 
-        # look up their corresponding IDs in the Destination table
-        origin_id = Utils.get_destination_id_by_iata(self.db, origin_iata)
-        dest_id   = Utils.get_destination_id_by_iata(self.db, dest_iata)
-
         # prompt fot departure and arrival
         departure = Utils.prompt_valid_datetime("Departure (YYYY-MM-DD HH:MM): ")
         dep_dt = datetime.strptime(departure, "%Y-%m-%d %H:%M")
@@ -93,12 +96,9 @@ class FlightManagementApp:
 
         # insert into database
         try:
-            self.db.execute(dedent("""
-                INSERT INTO Flight (flightNo, originID, destinationID, departure, arrival, status, aircraft, lastUpdate)
-                VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'));
-            """), (flight_no, origin_id, dest_id, departure, arrival, status, aircraft))
+            self.service.add_flight(flight_no, origin_iata, dest_iata, departure, arrival, status, aircraft)
             print(f"Flight {flight_no} added.\n")
-        except Exception as e:
+        except (ValueError, sqlite3.Error) as e:
             print(f"Error: {e}\n")
 
     # 2) Function to view flights by criteria
@@ -111,6 +111,8 @@ class FlightManagementApp:
         print("  2) Origin IATA")
         print("  3) Status (Scheduled / Delayed / Cancelled)")
         print("  4) Departure Date (YYYY-MM-DD)")
+        print("  5) Departure Date Range (YYYY-MM-DD to YYYY-MM-DD)")
+        print("  6) Departure Time Window (HH:MM to HH:MM)")
 
         # loop until valid input
         chosen = set()
@@ -121,11 +123,11 @@ class FlightManagementApp:
                 break
 
             tokens = [t.strip() for t in choice.split(",") if t.strip()]
-            valid = {"1", "2", "3", "4"}
+            valid = {"1", "2", "3", "4", "5", "6"}
             invalid_tokens = [t for t in tokens if t not in valid]
 
             if invalid_tokens:
-                print(f"Invalid selections: {', '.join(invalid_tokens)}. Use digits 1-4 separated by commas.\n")
+                print(f"Invalid selections: {', '.join(invalid_tokens)}. Use digits 1-6 separated by commas.\n")
                 continue
             if len(tokens) != len(set(tokens)):
                 print("Duplicate numbers detected. Please list each filter only once.\n")
@@ -136,11 +138,12 @@ class FlightManagementApp:
 
         # prepare inputs
         dest_iata = origin_iata = status = dep_date = None
+        range_from = range_to = time_from = time_to = None
 
         if 1 in chosen:
-            dest_iata = self.iata_validator.prompt_valid_iata("Destination IATA: ")
+            dest_iata = self.airports.prompt_iata("Destination IATA: ")
         if 2 in chosen:
-            origin_iata = self.iata_validator.prompt_valid_iata("Origin IATA: ")
+            origin_iata = self.airports.prompt_iata("Origin IATA: ")
         if 3 in chosen:
             valid_statuses = {"Scheduled", "Delayed", "Cancelled"}
             while True:
@@ -151,37 +154,26 @@ class FlightManagementApp:
                 print("Invalid status. Choose: Scheduled, Delayed, or Cancelled.\n")
         if 4 in chosen:
             dep_date = Utils.prompt_valid_date("Departure date (YYYY-MM-DD): ")
+        if 5 in chosen:
+            range_from = Utils.prompt_valid_date("Departure from (YYYY-MM-DD): ")
+            while True:
+                range_to = Utils.prompt_valid_date("Departure to   (YYYY-MM-DD, inclusive): ")
+                if range_to >= range_from:
+                    break
+                print("End date cannot be before start date. Please try again.\n")
+        if 6 in chosen:
+            time_from = Utils.prompt_valid_time("Departing from (HH:MM): ")
+            while True:
+                time_to = Utils.prompt_valid_time("Departing before (HH:MM): ")
+                if time_to != time_from:
+                    break
+                print("The time window cannot be empty. Please try again.\n")
 
-        # build SQL query dynamically
-        base_sql = """
-            SELECT 
-            f.flightNo, f.status, f.departure, f.arrival,
-            o.IATA AS origin, d.IATA AS destination
-            FROM Flight f
-            JOIN Destination o ON f.originID = o.destinationID
-            JOIN Destination d ON f.destinationID = d.destinationID
-            WHERE 1=1
-        """
-        conditions = []
-        params = {}
-
-        if dest_iata:
-            conditions.append("AND d.IATA = :dest_iata")
-            params["dest_iata"] = dest_iata
-        if origin_iata:
-            conditions.append("AND o.IATA = :origin_iata")
-            params["origin_iata"] = origin_iata
-        if status:
-            conditions.append("AND f.status = :status")
-            params["status"] = status
-        if dep_date:
-            conditions.append("AND date(f.departure) = :dep_date")
-            params["dep_date"] = dep_date
-
-        sql = base_sql + "\n".join(conditions) + "\nORDER BY f.departure;"
-
-        rows = self.db.query(sql, params)
-        Utils.print_rows(rows)
+        # one page at a time, each fetched only when the user asks for it
+        Utils.print_pages(lambda after: self.service.flights_page(
+            after, dest_iata=dest_iata, origin_iata=origin_iata, status=status, dep_date=dep_date,
+            date_from=range_from, date_to=range_to, time_from=time_from, time_to=time_to,
+        ))
 
 
     # 3) Function to update flight information
@@ -190,31 +182,20 @@ class FlightManagementApp:
 
         # check if the flight number exists in the database
         while True:
-            flight_no = input("Flight number to update (e.g., EY101): ").strip().upper()
+            flight_no = Utils.normalize_flight_no(input("Flight number to update (e.g., EY101): "))
             if not flight_no:
                 print("Flight number cannot be empty.\n")
                 continue
             # check existence
-            exists = self.db.query("SELECT 1 FROM Flight WHERE flightNo = ?;", (flight_no,))
-            if not exists:
+            flight_id = Utils.get_flight_id_by_no(self.db, flight_no)
+            if flight_id is None:
                 print(f"Flight '{flight_no}' does not exist. Please try again.\n")
                 continue
             break
 
         # display current record
-        current = self.db.query(dedent("""
-            SELECT f.flightNo, f.status, f.departure, f.arrival, f.aircraft,
-                   o.IATA AS origin, d.IATA AS destination, f.lastUpdate
-            FROM Flight f
-            JOIN Destination o ON f.originID = o.destinationID
-            JOIN Destination d ON f.destinationID = d.destinationID
-            WHERE f.flightNo = ?;
-        """), (flight_no,))
-        if not current:
-            print("Flight not found.\n")
-            return
         print("\n")
-        Utils.print_rows(current)
+        Utils.print_rows([self.service.get_flight(flight_no)])
 
         # prompt for updates (blank is you want to keep the existing info)
         print("leave fields blank to keep existing values.\n")
@@ -244,32 +225,16 @@ class FlightManagementApp:
             else:
                 print("Please enter Y or N.\n")
 
-        # update record
+        # update and re-read the record in one transaction
         try:
-            self.db.execute(dedent("""
-                UPDATE Flight
-                SET departure  = COALESCE(?, departure),
-                    arrival    = COALESCE(?, arrival),
-                    status     = COALESCE(?, status),
-                    aircraft   = COALESCE(?, aircraft),
-                    lastUpdate = datetime('now')
-                WHERE flightNo = ?;
-            """), (new_departure, new_arrival, new_status, new_aircraft, flight_no))
-            print("Flight updated.\n")
-        except sqlite3.IntegrityError as e:
+            updated = self.service.update_flight(flight_no, new_departure, new_arrival, new_status, new_aircraft)
+        except (ValueError, sqlite3.Error) as e:
             print(f"Update failed: {e}\n")
             return
 
         # show updated record
-        updated = self.db.query(dedent("""
-            SELECT f.flightNo, f.status, f.departure, f.arrival, f.aircraft,
-                   o.IATA AS origin, d.IATA AS destination, f.lastUpdate
-            FROM Flight f
-            JOIN Destination o ON f.originID = o.destinationID
-            JOIN Destination d ON f.destinationID = d.destinationID
-            WHERE f.flightNo = ?;
-        """), (flight_no,))
-        Utils.print_rows(updated)
+        print("Flight updated.\n")
+        Utils.print_rows([updated])
 
     # 4) Function to assign pilot to flight
     def assign_pilot_to_flight(self):
@@ -280,59 +245,47 @@ class FlightManagementApp:
             pilot_id = Utils.parse_int_or_none(Utils.input_or_blank("Pilot ID (e.g., 1): "))
             if pilot_id is None:
                 print("Invalid pilot ID.\n"); continue
-            row = self.db.query(
-                "SELECT firstName || ' ' || lastName AS name FROM Pilot WHERE pilotID = ?;",
-                (pilot_id,)
-            )
-            if not row:
-                print(f"Pilot with ID {pilot_id} not found.\n"); continue
-            pilot_name = row[0]["name"]
+            try:
+                pilot_name = self.service.pilot_name(pilot_id)
+            except ValueError as e:
+                print(f"{e}\n"); continue
             break
 
         # validate flight number and get flight id
         while True:
-            flight_no = input("Flight number (e.g., EY104): ").strip().upper()
+            flight_no = Utils.normalize_flight_no(input("Flight number (e.g., EY104): "))
             if not flight_no:
                 print("Flight number cannot be empty.\n"); continue
-            flight_rows = self.db.query("SELECT flightID FROM Flight WHERE flightNo = ?;", (flight_no,))
-            if not flight_rows:
+            flight_id = Utils.get_flight_id_by_no(self.db, flight_no)
+            if flight_id is None:
                 print(f"Flight '{flight_no}' not found.\n"); continue
-            flight_id = flight_rows[0]["flightID"]
             break
 
         # validate role
-        valid_roles = ("Captain", "Co-Captain")
         while True:
             role = (Utils.input_or_blank("Role [Captain/Co-Captain] (default Captain): ") or "Captain").title()
-            if role in valid_roles:
+            if role in VALID_CREW_ROLES:
                 break
             print("Role must be 'Captain' or 'Co-Captain'. Please try again.\n")
 
         # if pilot already assigned to this flight in any role, prevent double role
-        already_on_flight = self.db.query(
-            "SELECT role FROM FlightCrew WHERE pilotID = ? AND flightID = ?;",
-            (pilot_id, flight_id)
-        )
+        already_on_flight = self.db.query_named("crew_pilot_on_flight", (pilot_id, flight_id))
         if already_on_flight:
             print(f"{pilot_name} is already assigned to {flight_no} as {already_on_flight[0]['role']}.\n")
             return
 
         # check if this role already exist for this flight
-        existing_role = self.db.query(
-            "SELECT flightCrewID, pilotID FROM FlightCrew WHERE flightID = ? AND role = ?;",
-            (flight_id, role)
-        )
+        current_pilot_id = self.service.crew_member(flight_no, role)
+        replace = False
 
-        if existing_role:
-            current_pilot_id = existing_role[0]["pilotID"]
+        if current_pilot_id is not None:
             if current_pilot_id == pilot_id:
                 print(f"{pilot_name} is already the {role} for {flight_no}.\n")
                 return
 
             # replace the current pilot in this role
             print("\nThis flight already has a {0} assigned.".format(role))
-            curr = self.db.query("SELECT firstName || ' ' || lastName AS name FROM Pilot WHERE pilotID = ?;",
-                                (current_pilot_id,))
+            curr = self.db.query_named("pilot_name", (current_pilot_id,))
             current_pilot_name = curr[0]["name"] if curr else f"Pilot {current_pilot_id}"
             print(f"  Current {role}: {current_pilot_name} (ID: {current_pilot_id})")
             print(f"  New    {role}: {pilot_name} (ID: {pilot_id})")
@@ -343,28 +296,18 @@ class FlightManagementApp:
             if confirm == "N":
                 print("Assignment cancelled.\n"); return
 
-            # UPDATE existing row
-            try:
-                self.db.execute(
-                    "UPDATE FlightCrew SET pilotID = ?, assignedAt = datetime('now') WHERE flightID = ? AND role = ?;",
-                    (pilot_id, flight_id, role)
-                )
-                print(f"Reassigned {role} on {flight_no} to {pilot_name}.\n")
-            except sqlite3.IntegrityError as e:
-                print(f"Update failed: {e}\n")
-                return
+            # only hand the role over if it still belongs to the pilot shown above
+            replace = current_pilot_id
 
+        try:
+            result = self.service.assign_pilot(pilot_id, flight_no, role, replace=replace)
+        except (ValueError, sqlite3.Error) as e:
+            print(f"Assignment failed: {e}\n")
+            return
+        if result["replaced"] is None:
+            print(f"Assigned {pilot_name} to {flight_no} as {role}.\n")
         else:
-            # INSERT new role assignment
-            try:
-                self.db.execute(
-                    "INSERT INTO FlightCrew (pilotID, flightID, role, assignedAt) VALUES (?, ?, ?, datetime('now'));",
-                    (pilot_id, flight_id, role)
-                )
-                print(f"Assigned {pilot_name} to {flight_no} as {role}.\n")
-            except sqlite3.IntegrityError as e:
-                print(f"Assignment failed: {e}\n")
-                return
+            print(f"Reassigned {role} on {flight_no} to {pilot_name}.\n")
 
         # show updated schedule
         self._show_pilot_schedule(pilot_id)
@@ -381,12 +324,12 @@ class FlightManagementApp:
                 continue
 
             # vheck existence in Pilot table
-            pilot_exists = self.db.query("SELECT firstName || ' ' || lastName AS name FROM Pilot WHERE pilotID = ?;", (pilot_id,))
-            if not pilot_exists:
+            try:
+                pilot_name = self.service.pilot_name(pilot_id)
+            except ValueError:
                 print(f"Pilot with ID {pilot_id} not found in database.\n")
                 continue
 
-            pilot_name = pilot_exists[0]["name"]
             print(f"Found Pilot: {pilot_name}")
             print("\n")
             break
@@ -395,23 +338,7 @@ class FlightManagementApp:
 
     def _show_pilot_schedule(self, pilot_id: int):
         """Fetch and display a pilot’s assigned flights."""
-        rows = self.db.query(dedent("""
-            SELECT 
-              p.pilotID,
-              p.firstName || ' ' || p.lastName AS Pilot,
-              fc.role,
-              f.flightNo, f.departure, f.arrival, f.status,
-              o.IATA AS origin, d.IATA AS destination,
-              fc.assignedAt
-            FROM FlightCrew fc
-            JOIN Pilot p  ON fc.pilotID = p.pilotID
-            JOIN Flight f ON fc.flightID = f.flightID
-            JOIN Destination o ON f.originID = o.destinationID
-            JOIN Destination d ON f.destinationID = d.destinationID
-            WHERE p.pilotID = ?
-            ORDER BY f.departure;
-        """), (pilot_id,))
-        Utils.print_rows(rows)
+        Utils.print_rows(self.service.iter_pilot_schedule(pilot_id))
 
     # 6) Function to view/update destination information
     def view_update_destination(self):
@@ -423,24 +350,13 @@ class FlightManagementApp:
         choice = input("Choose: ").strip()
 
         if choice == "1":
-            # show only active destinations
-            rows = self.db.query(dedent("""
-                SELECT destinationID, IATA, airportName, city, country, isActive
-                FROM Destination
-                WHERE isActive = 1
-                ORDER BY destinationID;
-            """))
-            Utils.print_rows(rows)
+            # show only active destinations, page by page
+            Utils.print_pages(lambda after: self.service.destinations_page(after, active_only=True))
             return
 
         if choice == "2":
-            # show all destinations
-            rows = self.db.query(dedent("""
-                SELECT destinationID, IATA, airportName, city, country, isActive
-                FROM Destination
-                ORDER BY destinationID;
-            """))
-            Utils.print_rows(rows)
+            # show all destinations, page by page
+            Utils.print_pages(lambda after: self.service.destinations_page(after, active_only=False))
             return
 
         
@@ -451,15 +367,15 @@ class FlightManagementApp:
                 if dest_id is None:
                     print("Invalid ID.\n")
                     continue
-                current = self.db.query("SELECT * FROM Destination WHERE destinationID = ?;", (dest_id,))
-                if not current:
+                try:
+                    row = self.service.get_destination(dest_id)
+                except ValueError:
                     print("Destination not found.\n")
                     continue
                 break
 
             # show current record
-            Utils.print_rows(current)
-            row = current[0]
+            Utils.print_rows([row])
 
             # prompt new isActive value
             while True:
@@ -493,18 +409,14 @@ class FlightManagementApp:
 
             # perform update
             try:
-                self.db.execute(
-                    "UPDATE Destination SET isActive = ? WHERE destinationID = ?;",
-                    (active_val, dest_id)
-                )
+                updated = self.service.set_destination_active(dest_id, active_val)
                 print("Destination updated.\n")
-            except sqlite3.IntegrityError as e:
+            except (ValueError, sqlite3.Error) as e:
                 print(f"Update failed: {e}\n")
                 return
 
             # show updated record
-            updated = self.db.query("SELECT * FROM Destination WHERE destinationID = ?;", (dest_id,))
-            Utils.print_rows(updated)
+            Utils.print_rows([updated])
             return
 
         print("Unknown choice.\n")
@@ -516,34 +428,9 @@ class FlightManagementApp:
         #  get a valid flight no
         flight_no = Utils.prompt_existing_flight_no(self.db)
 
-        # get flight details
-        flight = self.db.query(dedent("""
-            SELECT f.flightID, f.flightNo,
-                o.IATA AS origin, d.IATA AS destination,
-                f.departure
-            FROM Flight f
-            JOIN Destination o ON f.originID = o.destinationID
-            JOIN Destination d ON f.destinationID = d.destinationID
-            WHERE f.flightNo = ?;
-        """), (flight_no,))[0]
-
-        flight_id = flight["flightID"]
-
-        # get total bookings for this flight
-        total_rows = self.db.query(
-            "SELECT COUNT(*) AS total_bookings FROM Booking WHERE flightID = ?;",
-            (flight_id,)
-        )
-        total = total_rows[0]["total_bookings"] if total_rows else 0
-
-        # get status breakdown (Booked / Checked-in / Cancelled)
-        breakdown = self.db.query(dedent("""
-            SELECT status, COUNT(*) AS cnt
-            FROM Booking
-            WHERE flightID = ?
-            GROUP BY status
-            ORDER BY status;
-        """), (flight_id,))
+        # get flight details, total bookings and status breakdown
+        summary = self.service.booking_summary(flight_no)
+        flight, total, breakdown = summary["flight"], summary["total"], summary["by_status"]
 
         print("\nFlight summary:")
         print(f"  Flight:      {flight['flightNo']}  ({flight['origin']} → {flight['destination']})")
@@ -556,6 +443,31 @@ class FlightManagementApp:
         else:
             print("No bookings found for this flight.\n")
 
+    # Additional command 8) Search passengers, pilots or airports by name
+    def search_by_name(self):
+        Utils.header("Search Passengers, Pilots or Airports")
+        print("1) Passengers (name or email)")
+        print("2) Pilots (name, email or license)")
+        print("3) Airports (code, name or city)")
+        print()
+        choice = input("Choose: ").strip()
+        if choice not in ("1", "2", "3"):
+            print("Unknown choice.\n")
+            return
+
+        query = Utils.input_or_blank("Search for: ")
+        try:
+            if choice == "1":
+                rows = self.service.find_passengers(query)
+            elif choice == "2":
+                rows = self.service.find_pilots(query)
+            else:
+                rows = self.service.search_airports(query or "")
+        except ValueError as e:
+            print(f"{e}\n")
+            return
+        Utils.print_rows(rows)
+
     # run main menu 
     def run(self):
         try:
@@ -571,6 +483,7 @@ class FlightManagementApp:
                 5) View Pilot Schedule
                 6) View/Update Destination Information
                 7) Check Bookings for a Flight
+                8) Search Passengers, Pilots or Airports
                 0) Exit
                              
                 Press CTRL + C / Control + C anytime to exit.
@@ -583,6 +496,7 @@ class FlightManagementApp:
                 elif choice == "5": self.view_pilot_schedule()
                 elif choice == "6": self.view_update_destination()
                 elif choice == "7": self.check_bookings_for_flight()
+                elif choice == "8": self.search_by_name()
                 elif choice == "0":
                     print("Goodbye!")
                     break
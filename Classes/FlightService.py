@@ -0,0 +1,431 @@
+import json
+import re
+from datetime import datetime
+from Classes.AirportRegistry import AirportRegistry
+from Classes.CrewRoster import CrewRoster
+from Classes.DatabaseManager import FETCH_BATCH_SIZE
+from Classes.Utils import Utils
+
+
+VALID_FLIGHT_STATUSES = ("Scheduled", "Delayed", "Cancelled")
+VALID_CREW_ROLES = ("Captain", "Co-Captain")
+# rows per page of flights_page()/destinations_page()
+PAGE_SIZE = 20
+
+# BookingCount column -> Booking.status it counts
+BOOKING_COUNT_COLUMNS = {"booked": "Booked", "checkedIn": "Checked-in", "cancelled": "Cancelled"}
+
+# newest passenger matches ranked per search (a common surname matches far more bookings)
+SEARCH_WINDOW = 1000
+
+
+class FlightService:
+    """Flight operations without any input()/print(): take arguments, return rows, raise ValueError on bad input."""
+
+    def __init__(self, db, airports=None, roster=None):
+        self.db = db
+        # IATA -> destination lookups without a query per code
+        self.airports = airports or AirportRegistry(db)
+        # per-pilot flight intervals for the double-booking check
+        self.roster = roster or CrewRoster(db)
+
+    # 1) add a new flight
+    def add_flight(self, flight_no, origin_iata, dest_iata, departure, arrival, status="Scheduled", aircraft=None):
+        """Validate and insert a flight; returns the new flightID."""
+        flight_no = Utils.normalize_flight_no(flight_no or "")
+        origin_iata = (origin_iata or "").strip().upper()
+        dest_iata = (dest_iata or "").strip().upper()
+        status = (status or "Scheduled").capitalize()
+
+        if not flight_no:
+            raise ValueError("Flight number cannot be empty.")
+        if origin_iata == dest_iata:
+            raise ValueError("Destination cannot be the same as Origin.")
+        try:
+            dep_dt = datetime.strptime(departure, "%Y-%m-%d %H:%M")
+            arr_dt = datetime.strptime(arrival, "%Y-%m-%d %H:%M")
+        except (TypeError, ValueError):
+            raise ValueError("Departure and arrival must be YYYY-MM-DD HH:MM.") from None
+        if arr_dt <= dep_dt:
+            raise ValueError("Arrival time must be after departure time.")
+        if status not in VALID_FLIGHT_STATUSES:
+            raise ValueError(f"Invalid status. Choose one of: {', '.join(VALID_FLIGHT_STATUSES)}.")
+
+        # checks and insert in one transaction so the flight number cannot be taken in between
+        with self.db.transaction("IMMEDIATE"):
+            if Utils.flight_no_exists(self.db, flight_no):
+                raise ValueError(f"Flight '{flight_no}' already exists.")
+            for iata in (origin_iata, dest_iata):
+                problem = self.airports.problem(iata, active_only=True)
+                if problem:
+                    raise ValueError(problem)
+            origin_id = self.airports.destination_id(origin_iata)
+            dest_id = self.airports.destination_id(dest_iata)
+            cur = self.db.execute_named("flight_insert", (flight_no, origin_id, dest_id, dep_dt.strftime("%Y-%m-%d %H:%M"),
+                   arr_dt.strftime("%Y-%m-%d %H:%M"), status, aircraft or None))
+            return cur.lastrowid
+
+    # 2) view flights by criteria
+    @staticmethod
+    def build_search_sql(dest_iata=None, origin_iata=None, status=None, dep_date=None,
+                         date_from=None, date_to=None, time_from=None, time_to=None, after=None, limit=None):
+        """
+        Return (sql, params) for the criteria search; every filter is optional.
+        after=(departure, flightID) and limit select one page (see flights_page()).
+        """
+        base_sql = """
+            SELECT
+            f.flightID, f.flightNo, f.status, f.departure, f.arrival,
+            o.IATA AS origin, d.IATA AS destination
+            FROM Flight f
+            JOIN Destination o ON f.originID = o.destinationID
+            JOIN Destination d ON f.destinationID = d.destinationID
+            WHERE 1=1
+        """
+        conditions, params = FlightService.search_conditions(dest_iata, origin_iata, status, dep_date,
+                                                             date_from, date_to, time_from, time_to)
+
+        # keyset pagination: every index ends in departure (and the rowid, flightID), so the
+        # next page is a seek past the last row of the previous one, whatever its number
+        if after is not None:
+            conditions.append("AND (f.departure, f.flightID) > (:after_departure, :after_id)")
+            params["after_departure"], params["after_id"] = after
+
+        # with a time window, "+" stops the planner from walking idx_flight_departure
+        # for the ORDER BY instead of searching idx_flight_departure_time
+        order_by = "+f.departure" if time_from and time_to else "f.departure"
+        sql = base_sql + "\n".join(conditions) + f"\nORDER BY {order_by}, f.flightID"
+        if limit is not None:
+            sql += "\nLIMIT :limit"
+            params["limit"] = limit
+        return sql + ";", params
+
+    @staticmethod
+    def search_conditions(dest_iata=None, origin_iata=None, status=None, dep_date=None,
+                          date_from=None, date_to=None, time_from=None, time_to=None):
+        """
+        The filters of the criteria search as ("AND ..." clauses on Flight f, origin
+        Destination o and destination Destination d, named params); also used by BulkExporter.
+        """
+        conditions = []
+        params = {}
+
+        if dest_iata:
+            conditions.append("AND d.IATA = :dest_iata")
+            params["dest_iata"] = dest_iata.upper()
+        if origin_iata:
+            conditions.append("AND o.IATA = :origin_iata")
+            params["origin_iata"] = origin_iata.upper()
+        if status:
+            conditions.append("AND f.status = :status")
+            params["status"] = status.capitalize()
+        # dates are half-open ranges on the raw column so idx_flight_departure can be used
+        if dep_date:
+            conditions.append("AND f.departure >= :dep_start AND f.departure < :dep_end")
+            params["dep_start"] = dep_date
+            params["dep_end"] = Utils.next_day(dep_date)
+        if date_from:
+            conditions.append("AND f.departure >= :range_start")
+            params["range_start"] = date_from
+        if date_to:
+            conditions.append("AND f.departure < :range_end")
+            params["range_end"] = Utils.next_day(date_to)
+        # time of day must match the expression of idx_flight_departure_time exactly
+        if bool(time_from) != bool(time_to):
+            raise ValueError("A time window needs both a start and an end time.")
+        if time_from and time_to:
+            if time_from == time_to:
+                raise ValueError("The time window cannot be empty.")
+            dep_time = "strftime('%H:%M', f.departure)"
+            if time_from < time_to:
+                conditions.append(f"AND {dep_time} >= :time_from AND {dep_time} < :time_to")
+            else:
+                # window wraps past midnight (e.g. 22:00 to 02:00)
+                conditions.append(f"AND ({dep_time} >= :time_from OR {dep_time} < :time_to)")
+            params["time_from"] = time_from
+            params["time_to"] = time_to
+        return conditions, params
+
+    def search_flights(self, **criteria):
+        """Flights matching the criteria of build_search_sql(), ordered by departure."""
+        return list(self.iter_flights(**criteria))
+
+    def iter_flights(self, batch_size=FETCH_BATCH_SIZE, **criteria):
+        """Like search_flights(), but yields rows as they are fetched."""
+        sql, params = self.build_search_sql(**criteria)
+        return self.db.iter_query(sql, params, batch_size)
+
+    def flights_page(self, after=None, limit=PAGE_SIZE, **criteria):
+        """
+        One page of search_flights(): {"rows": [...], "next": cursor of the following page,
+        or None after the last}. after is the "next" of the previous page.
+        """
+        if limit < 1:
+            raise ValueError("The page size must be at least 1.")
+        sql, params = self.build_search_sql(after=self._flight_cursor(after), limit=limit + 1, **criteria)
+        rows = self.db.query(sql, params)
+        last = rows[limit - 1] if len(rows) > limit else None
+        return {"rows": rows[:limit], "next": f"{last['departure']},{last['flightID']}" if last else None}
+
+    # 3) update flight information
+    def get_flight(self, flight_no):
+        """The flight_detail row of a flight number (any case)."""
+        return self.db.query_named("flight_detail", (self._flight_id(flight_no),))[0]
+
+    def update_flight(self, flight_no, departure=None, arrival=None, status=None, aircraft=None):
+        """Change the given fields (None keeps the current value); returns the updated flight_detail row."""
+        departure = self._parse_datetime(departure, "Departure")
+        arrival = self._parse_datetime(arrival, "Arrival")
+        if status is not None:
+            status = status.capitalize()
+            if status not in VALID_FLIGHT_STATUSES:
+                raise ValueError(f"Invalid status. Choose one of: {', '.join(VALID_FLIGHT_STATUSES)}.")
+
+        # update and re-read the record in one transaction
+        with self.db.transaction("IMMEDIATE"):
+            current = self.get_flight(flight_no)
+            if (arrival or current["arrival"]) <= (departure or current["departure"]):
+                raise ValueError("Arrival time must be after departure time.")
+            self.db.execute_named("flight_update", (departure, arrival, status, aircraft or None, current["flightID"]))
+            if departure or arrival or status:
+                crew = self.db.query_named("crew_of_flight", (current["flightID"],))
+                self.roster.invalidate([row["pilotID"] for row in crew])
+            return self.db.query_named("flight_detail", (current["flightID"],))[0]
+
+    def delay_flights(self, minutes, flight_nos=(), origin_iata=None, departing_from=None, departing_to=None,
+                      dry_run=False):
+        """
+        Delay flights by minutes and mark them Delayed: the given flight numbers, or every
+        flight departing in [departing_from, departing_to) (from origin_iata only, if given).
+        Crews' later flights that would no longer leave the turnaround buffer move too
+        (see CrewRoster.propagate). Returns the plan, one row per flight by departure,
+        written in one statement and one transaction; dry_run=True only returns it.
+        """
+        if not isinstance(minutes, int) or minutes < 1:
+            raise ValueError("The delay must be a positive number of minutes.")
+        departing_from = self._parse_datetime(departing_from, "Window start")
+        departing_to = self._parse_datetime(departing_to, "Window end")
+        if flight_nos and (departing_from or departing_to or origin_iata):
+            raise ValueError("Give flight numbers or a departure window, not both.")
+        if not flight_nos:
+            if not (departing_from and departing_to):
+                raise ValueError("Give flight numbers, or the start and end of a departure window.")
+            if departing_to <= departing_from:
+                raise ValueError("The departure window must end after it starts.")
+            problem = origin_iata and self.airports.problem(origin_iata)
+            if problem:
+                raise ValueError(problem)
+
+        with self.db.transaction("DEFERRED" if dry_run else "IMMEDIATE"):
+            if flight_nos:
+                flights = [self.db.query_named("flight_detail", (self._flight_id(no),))[0] for no in flight_nos]
+                cancelled = [f["flightNo"] for f in flights if f["status"] == "Cancelled"]
+                if cancelled:
+                    raise ValueError(f"Cancelled flights cannot be delayed: {', '.join(cancelled)}.")
+            elif origin_iata:
+                flights = self.db.query_named("delay_candidates_origin",
+                                              (origin_iata.strip().upper(), departing_from, departing_to))
+            else:
+                flights = self.db.query_named("delay_candidates", (departing_from, departing_to))
+
+            plan, pilots = self.roster.propagate(flights, minutes)
+            if plan and not dry_run:
+                moves = [[row["flightID"], row["newDeparture"], row["newArrival"]] for row in plan]
+                self.db.execute_named("flight_delay_apply", (json.dumps(moves),))
+                self.roster.invalidate(pilots)
+        return plan
+
+    # 4) assign pilot to flight
+    def pilot_name(self, pilot_id):
+        """"First Last" of a pilot; ValueError if there is no such pilot."""
+        rows = self.db.query_named("pilot_name", (pilot_id,))
+        if not rows:
+            raise ValueError(f"Pilot with ID {pilot_id} not found.")
+        return rows[0]["name"]
+
+    def crew_member(self, flight_no, role):
+        """pilotID holding a role on a flight, or None if the role is free."""
+        rows = self.db.query_named("crew_role_on_flight", (self._flight_id(flight_no), self._role(role)))
+        return rows[0]["pilotID"] if rows else None
+
+    def assign_pilot(self, pilot_id, flight_no, role="Captain", replace=False, allow_overlap=False):
+        """
+        Put a pilot on a flight in a role; returns {"pilot", "flightNo", "role", "replaced"}.
+        A role that is already taken is only handed over with replace=True, or
+        replace=<pilotID> to hand it over only if that pilot still holds it.
+        A pilot who would fly another flight within the roster's turnaround buffer
+        is refused unless allow_overlap=True.
+        """
+        role = self._role(role)
+        with self.db.transaction("IMMEDIATE"):
+            pilot = self.pilot_name(pilot_id)
+            flight = self.db.query_named("flight_detail", (self._flight_id(flight_no),))[0]
+            flight_id, flight_no = flight["flightID"], flight["flightNo"]
+
+            # a pilot can only hold one role per flight
+            on_flight = self.db.query_named("crew_pilot_on_flight", (pilot_id, flight_id))
+            if on_flight:
+                raise ValueError(f"{pilot} is already assigned to {flight_no} as {on_flight[0]['role']}.")
+
+            taken = self.db.query_named("crew_role_on_flight", (flight_id, role))
+            current = taken[0]["pilotID"] if taken else None
+            if current is not None and (replace is False or (replace is not True and replace != current)):
+                raise ValueError(f"{flight_no} already has a {role} (pilot {current}).")
+
+            # nor be on two flights at once, or without time to turn around
+            clashes = [] if allow_overlap else self.roster.conflicts(pilot_id, flight)
+            if clashes:
+                _, _, _, other, departure, arrival = clashes[0]
+                raise ValueError(f"{pilot} is already flying {other} ({departure} - {arrival}), less than "
+                                 f"{self.roster.buffer_minutes} minutes from {flight_no} ({flight['departure']} - {flight['arrival']}).")
+
+            if current is None:
+                self.db.execute_named("crew_insert", (pilot_id, flight_id, role))
+            else:
+                self.db.execute_named("crew_replace_role", (pilot_id, flight_id, role, current))
+                self.roster.unassigned(current, flight_id)
+            self.roster.assigned(pilot_id, flight)
+            return {"pilot": pilot, "flightNo": flight_no, "role": role, "replaced": current}
+
+    def roster_conflicts(self, buffer_minutes=None, batch_size=FETCH_BATCH_SIZE):
+        """Every pair of flights a pilot cannot both fly (see CrewRoster.audit), yielded in one pass."""
+        return self.roster.audit(buffer_minutes, batch_size)
+
+    # 5) view pilot schedule
+    def pilot_schedule(self, pilot_id):
+        """A pilot's assigned flights, ordered by departure."""
+        return list(self.iter_pilot_schedule(pilot_id))
+
+    def iter_pilot_schedule(self, pilot_id, batch_size=FETCH_BATCH_SIZE):
+        """Like pilot_schedule(), but yields rows as they are fetched."""
+        return self.db.iter_named("pilot_schedule", (pilot_id,), batch_size)
+
+    # 6) view/update destination information
+    def iter_destinations(self, active_only=True, batch_size=FETCH_BATCH_SIZE):
+        """Destinations ordered by ID, yielded as they are fetched."""
+        name = "destinations_active" if active_only else "destinations_all"
+        return self.db.iter_named(name, (), batch_size)
+
+    def destinations_page(self, after=None, limit=PAGE_SIZE, active_only=True):
+        """One page of destinations by ID: {"rows": [...], "next": destinationID to pass as after, or None}."""
+        if limit < 1:
+            raise ValueError("The page size must be at least 1.")
+        name = "destinations_active_page" if active_only else "destinations_page"
+        rows = self.db.query_named(name, (after or 0, limit + 1))
+        return {"rows": rows[:limit], "next": rows[limit - 1]["destinationID"] if len(rows) > limit else None}
+
+    def get_destination(self, dest_id):
+        """The Destination row with this ID."""
+        rows = self.db.query_named("destination_by_id", (dest_id,))
+        if not rows:
+            raise ValueError(f"Destination {dest_id} not found.")
+        return rows[0]
+
+    def set_destination_active(self, dest_id, active):
+        """Set isActive (1/0) on a destination; returns the updated row."""
+        if active not in (0, 1, True, False):
+            raise ValueError("isActive must be 1 (active) or 0 (inactive).")
+        with self.db.transaction("IMMEDIATE"):
+            self.get_destination(dest_id)
+            self.db.execute_named("destination_set_active", (int(active), dest_id))
+            self.airports.invalidate()
+            return self.get_destination(dest_id)
+
+    def search_airports(self, query, limit=10):
+        """Destinations matching free text ("amst", "heathrow", "new york"), best first."""
+        return self.airports.search(query, limit)
+
+    # 7) check bookings for a flight
+    def booking_summary(self, flight_no):
+        """Return {"flight": row, "total": int, "by_status": rows} for a flight number (any case)."""
+        flight_id = self._flight_id(flight_no)
+        flight = self.db.query_named("flight_detail", (flight_id,))[0]
+
+        # counts per status, kept up to date by the Booking triggers (no row: no bookings)
+        rows = self.db.query_named("booking_counts", (flight_id,))
+        counts = dict(zip(BOOKING_COUNT_COLUMNS.values(), rows[0])) if rows else {}
+        breakdown = [
+            {"status": status, "cnt": counts[status]}
+            for status in sorted(BOOKING_COUNT_COLUMNS.values()) if counts.get(status)
+        ]
+        return {"flight": flight, "total": sum(counts.values()), "by_status": breakdown}
+
+    def check_booking_counts(self, repair=False):
+        """
+        Flights whose BookingCount row does not match Booking, as {"flightID", "Booked",
+        "Checked-in", "Cancelled"} with the counted minus the stored number per status.
+        With repair=True those flights are counted again, in the same transaction.
+        """
+        with self.db.transaction("IMMEDIATE"):
+            drift = [
+                {"flightID": row["flightID"], **{status: row[column] for column, status in BOOKING_COUNT_COLUMNS.items()}}
+                for row in self.db.iter_named("booking_counts_drift")
+            ]
+            if repair:
+                for row in drift:
+                    self.db.execute_named("booking_counts_rebuild", (row["flightID"],))
+        return drift
+
+    # 8) find passengers and pilots by name
+    def find_passengers(self, query, limit=PAGE_SIZE):
+        """
+        Bookings whose passenger name or email matches every word of the query ("khan",
+        "anna kh", "anna.khan@example.com"), best match first. Only the SEARCH_WINDOW
+        newest matching bookings are ranked.
+        """
+        return self.db.query_named("passenger_search", (self._match_query(query), max(SEARCH_WINDOW, limit), limit))
+
+    def find_pilots(self, query, limit=PAGE_SIZE):
+        """Pilots whose name, email or license number matches the query (as in find_passengers), best first."""
+        return self.db.query_named("pilot_search", (self._match_query(query), limit))
+
+    # ---------- input checks ----------
+
+    def _flight_id(self, flight_no):
+        """flightID of a flight number (any case); ValueError if there is none."""
+        flight_id = Utils.get_flight_id_by_no(self.db, flight_no or "")
+        if flight_id is None:
+            raise ValueError(f"Flight '{Utils.normalize_flight_no(flight_no or '')}' not found.")
+        return flight_id
+
+    @staticmethod
+    def _flight_cursor(after):
+        """(departure, flightID) from a flights_page() cursor "YYYY-MM-DD HH:MM,flightID", or None."""
+        if after is None:
+            return None
+        try:
+            departure, flight_id = after.rsplit(",", 1)
+            return departure, int(flight_id)
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid page cursor {after!r}.") from None
+
+    @staticmethod
+    def _match_query(text):
+        """
+        FTS5 query for free text: each word becomes a phrase of its tokens ("anna.khan@example.com"
+        -> "anna khan example com"), all of them required. A last word that is one token of
+        two or more characters is a prefix, for names typed in part ("kh" finds "Khan").
+        """
+        phrases = [tokens for tokens in (re.findall(r"\w+", word) for word in (text or "").lower().split()) if tokens]
+        if not phrases:
+            raise ValueError("Enter a name or email to search for.")
+        query = " ".join('"' + " ".join(tokens) + '"' for tokens in phrases)
+        # a prefix inside a phrase ("anna khan exa"*) would merge every term starting with it
+        return query + "*" if len(phrases[-1]) == 1 and len(phrases[-1][0]) > 1 else query
+
+    @staticmethod
+    def _role(role):
+        role = (role or "Captain").title()
+        if role not in VALID_CREW_ROLES:
+            raise ValueError(f"Role must be one of: {', '.join(VALID_CREW_ROLES)}.")
+        return role
+
+    @staticmethod
+    def _parse_datetime(value, label):
+        """YYYY-MM-DD HH:MM in its stored form, or None for None."""
+        if value is None:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M").strftime("%Y-%m-%d %H:%M")
+        except (TypeError, ValueError):
+            raise ValueError(f"{label} must be YYYY-MM-DD HH:MM.") from None
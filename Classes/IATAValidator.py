@@ -1,25 +1,107 @@
 import csv
+import hashlib
+import os
+import pickle
+import time
 from pathlib import Path
 
+# the reference list shipped with the project
+IATA_CSV = Path(__file__).parent.parent / "Data" / "iataCodes.csv"
+
+# parsed copies of the CSV files, rebuilt when a CSV changes
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+CACHE_VERSION = 1
+
+# the cache holds the list as two strings (codes, and airport/city/country per code),
+# which unpickle far faster than one dict entry per airport
+FIELD_SEP = "\x1f"
+
 class IATAValidator:
-    """Loads a list of valid IATA airport codes from a .csv file and validates user input."""
+    """
+    Loads a list of valid IATA airport codes from a .csv file and validates user input.
+    Nothing is read until the first lookup, and then from a pickled copy of the CSV
+    unless the CSV's mtime/size changed and its SHA-256 no longer matches.
+    """
+
+    def __init__(self, csv_path: Path, cache_dir=CACHE_DIR):
+        self.csv_path = Path(csv_path)
+        # one cache file per CSV location (None: always parse the CSV)
+        key = hashlib.sha1(str(self.csv_path.resolve()).encode()).hexdigest()[:12]
+        self.cache_path = Path(cache_dir) / f"{self.csv_path.stem}-{key}.pickle" if cache_dir is not None else None
+        self._codes = None
+        self._info_text = None
+        self._info = None
+        # {"source": "cache"/"csv", "codes": int, "ms": float} once loaded
+        self.load_stats = None
+
+    @property
+    def iata_codes(self):
+        """IATA code -> its row in the reference list, loaded on first use."""
+        if self._codes is None:
+            start = time.perf_counter()
+            (codes, self._info_text), source = self._load()
+            codes = codes.split("\n") if codes else []
+            self._codes = dict(zip(codes, range(len(codes))))
+            self.load_stats = {"source": source, "codes": len(self._codes), "ms": (time.perf_counter() - start) * 1000}
+        return self._codes
 
-    def __init__(self, csv_path: Path):
-        # Load all valid IATA codes at initialization
-        self.iata_codes = self._load_iata_codes(csv_path)
+    def _load(self):
+        """Return ((codes, info), source): the cache if the CSV is unchanged, else a fresh parse (which refreshes the cache)."""
+        stat = self.csv_path.stat()
+        cached = self._read_cache()
+        if cached and (cached["mtime_ns"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return cached["codes"], "cache"
 
-    def _load_iata_codes(self, csv_path: Path):
-        """Read CSV file and store IATA data in a dictionary."""
-        iata_dict = {}
+        digest = hashlib.sha256(self.csv_path.read_bytes()).hexdigest()
+        if cached and cached["sha256"] == digest:
+            # touched (checkout, copy) but not changed
+            codes, source = cached["codes"], "cache"
+        else:
+            codes, source = self._load_iata_codes(self.csv_path), "csv"
+        self._write_cache({"version": CACHE_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                           "sha256": digest, "codes": codes})
+        return codes, source
+
+    def _read_cache(self):
+        """The cache contents, or None if it is missing, unreadable or from another CACHE_VERSION."""
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except Exception:
+            return None
+        return cached if isinstance(cached, dict) and cached.get("version") == CACHE_VERSION else None
+
+    def _write_cache(self, data):
+        """Replace the cache file atomically; a read-only checkout just goes without a cache."""
+        if self.cache_path is None:
+            return
+        tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _load_iata_codes(csv_path: Path):
+        """Read CSV file into (codes, info): one line per airport, info fields separated by FIELD_SEP."""
+        codes, info = [], []
         with open(csv_path, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            code, airport, city, country = (columns.index(c) for c in ("IATA", "Airport", "City", "Country"))
+            width = max(code, airport, city, country) + 1
             for row in reader:
-                iata_dict[row["IATA"].strip().upper()] = {
-                    "airport": row["Airport"],
-                    "city": row["City"],
-                    "country": row["Country"],
-                }
-        return iata_dict
+                # blank or short lines (e.g. a trailing empty row) carry no airport
+                if len(row) < width or not row[code].strip():
+                    continue
+                codes.append(row[code].strip().upper())
+                info.append(FIELD_SEP.join((row[airport], row[city], row[country])))
+        return "\n".join(codes), "\n".join(info)
 
     def is_valid(self, iata: str) -> bool:
         """Check if the given IATA code exists."""
@@ -27,7 +109,21 @@ class IATAValidator:
 
     def get_info(self, iata: str):
         """Get airport details for a given IATA code."""
-        return self.iata_codes.get(iata.upper())
+        row = self.iata_codes.get(iata.upper())
+        if row is None:
+            return None
+        if self._info is None:
+            self._info = self._info_text.split("\n")
+        airport, city, country = self._info[row].split(FIELD_SEP)
+        return {"airport": airport, "city": city, "country": country}
+
+    def airports(self):
+        """Every airport of the list as (IATA, airport, city, country), e.g. for AirportSearch."""
+        codes = self.iata_codes
+        if self._info is None:
+            self._info = self._info_text.split("\n") if self._info_text else []
+        for code, row in codes.items():
+            yield (code, *self._info[row].split(FIELD_SEP))
 
     def prompt_valid_iata(self, prompt_msg: str) -> str:
         """Prompt until user enters a valid IATA code."""
@@ -0,0 +1,212 @@
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+# name under which DatabaseManager.query() results are cached (named statements use their own name)
+AD_HOC = "ad-hoc"
+
+# distinct SQL strings whose tables are remembered (ad-hoc SQL is the only unbounded source)
+MAX_ANALYZED = 4096
+
+# authorizer actions that write a table
+_WRITES = (sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE)
+
+
+def tables_of(conn, sql, params=()):
+    """
+    (tables read, tables written) by a statement, trigger bodies and foreign-key
+    actions included: SQLite reports every table to the authorizer while it
+    prepares the statement, which EXPLAIN does without running it.
+    """
+    reads, writes = set(), set()
+
+    def authorize(action, arg1, arg2, db_name, trigger):
+        if action == sqlite3.SQLITE_READ:
+            reads.add(arg1.lower())
+        elif action in _WRITES:
+            writes.add(arg1.lower())
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(authorize)
+    try:
+        conn.execute("EXPLAIN " + sql, params).close()
+    finally:
+        conn.set_authorizer(None)
+    return frozenset(reads), frozenset(writes)
+
+
+def result_size(rows) -> int:
+    """Approximate bytes held by a list of rows (the list, the rows and their values)."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+    return size
+
+
+class QueryCache:
+    """
+    Results of read queries by (SQL, parameters), in front of a DatabaseManager
+    (DatabaseManager.enable_cache()). Only the statements switched on are cached
+    (statements=None: all of them, AD_HOC for db.query()). Every table has a
+    version that the manager bumps when a statement writes it (and again when the
+    transaction ends); an entry is used only while the versions of the tables it
+    read are those it was stored with, and for at most ttl seconds, which bounds
+    staleness after writes by other processes. The least recently used entries
+    are dropped beyond max_entries or max_bytes.
+    """
+
+    def __init__(self, statements=None, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, ttl=60.0):
+        self.statements = None if statements is None else set(statements)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # key -> (rows, tables, versions, expires, size, name)
+        self._versions = {}               # table -> writes seen
+        self._epoch = 0                   # writes to unknown tables (they invalidate everything)
+        self._tables = {}                 # sql -> (tables read, tables written)
+        self.bytes = 0
+        self._counts = {"hits": 0, "misses": 0, "invalidated": 0, "expired": 0, "evicted": 0}
+        self._per_statement = {}
+
+    # ---------- which statements ----------
+
+    def wants(self, name) -> bool:
+        """Whether results of this statement are cached."""
+        return self.statements is None or name in self.statements
+
+    def enable(self, *names):
+        """Cache these statements too (no-op while every statement is cached)."""
+        with self._lock:
+            if self.statements is not None:
+                self.statements.update(names)
+
+    def disable(self, *names):
+        """Stop caching these statements and drop their entries."""
+        with self._lock:
+            if self.statements is None:
+                raise ValueError("Every statement is cached; create the cache with a set of statements instead.")
+            self.statements.difference_update(names)
+            for key in [k for k, entry in self._entries.items() if entry[5] in names]:
+                self._drop(key)
+
+    # ---------- reads ----------
+
+    def fetch(self, name, sql, params, load, analyze):
+        """
+        The rows of a SELECT: the cached ones if still valid, else load() (stored for
+        next time). analyze(sql, params) returns (tables read, tables written).
+        """
+        key = (sql, tuple(sorted(params.items())) if isinstance(params, dict) else tuple(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                rows, tables, versions, expires, _, _ = entry
+                if expires is not None and expires <= time.monotonic():
+                    self._drop(key)
+                    self._counts["expired"] += 1
+                elif versions != self._versions_of(tables):
+                    self._drop(key)
+                    self._counts["invalidated"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._count(name, "hits")
+                    return list(rows)
+            self._count(name, "misses")
+
+        analyzed = self._analyzed(sql, params, analyze)
+        if analyzed is None:
+            return load()
+        if analyzed[1]:
+            # a write run as a query (UPDATE ... RETURNING): never served from the cache
+            rows = load()
+            self.bump(analyzed[1])
+            return rows
+        tables = analyzed[0]
+        # versions taken before reading: a write that lands meanwhile makes the entry stale, not wrong
+        with self._lock:
+            versions = self._versions_of(tables)
+        rows = load()
+        size = result_size(rows)
+        if size > self.max_bytes:
+            return rows
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (tuple(rows), tables, versions, expires, size, name)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._counts["evicted"] += 1
+        return rows
+
+    # ---------- writes ----------
+
+    def written_tables(self, sql, params, analyze):
+        """The tables a statement writes (triggers and foreign-key actions included); None if unknown."""
+        analyzed = self._analyzed(sql, params, analyze)
+        return None if analyzed is None else analyzed[1]
+
+    def bump(self, tables):
+        """A write changed these tables (None: unknown ones): entries that read them are stale from now on."""
+        if tables is None:
+            with self._lock:
+                self._epoch += 1
+        elif tables:
+            with self._lock:
+                for table in tables:
+                    self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        """Drop every entry (versions and statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    # ---------- metrics ----------
+
+    def summary(self):
+        """Entries, memory, and hits/misses overall and per statement."""
+        with self._lock:
+            counts = dict(self._counts)
+            statements = {name: dict(c) for name, c in self._per_statement.items()}
+            entries, size = len(self._entries), self.bytes
+        lookups = counts["hits"] + counts["misses"]
+        for c in statements.values():
+            c["hit_rate"] = c["hits"] / (c["hits"] + c["misses"])
+        return {
+            "entries": entries, "bytes": size, "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+            "ttl": self.ttl, **counts, "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+            "statements": statements,
+        }
+
+    # ---------- internals (called with the lock held, except _analyzed) ----------
+
+    def _analyzed(self, sql, params, analyze):
+        """(sorted tables read, tables written), or None for SQL that EXPLAIN cannot prepare."""
+        tables = self._tables.get(sql)
+        if tables is None:
+            try:
+                reads, writes = analyze(sql, params)
+            except sqlite3.Error:
+                return None
+            tables = (tuple(sorted(reads)), writes)
+            if len(self._tables) >= MAX_ANALYZED:
+                self._tables.clear()
+            self._tables[sql] = tables
+        return tables
+
+    def _versions_of(self, tables):
+        return (self._epoch, *(self._versions.get(t, 0) for t in tables))
+
+    def _drop(self, key):
+        self.bytes -= self._entries.pop(key)[4]
+
+    def _count(self, name, kind):
+        self._counts[kind] += 1
+        c = self._per_statement.setdefault(name, {"hits": 0, "misses": 0})
+        c[kind] += 1
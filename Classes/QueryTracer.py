@@ -0,0 +1,194 @@
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+# default slow-query log (rotated at LOG_MAX_BYTES, LOG_BACKUPS old files kept)
+SLOW_LOG = Path(__file__).parent.parent / "logs" / "slow_queries.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+# the progress handler is called every PROGRESS_STEPS SQLite VM instructions
+PROGRESS_STEPS = 1000
+
+# statements EXPLAIN QUERY PLAN can describe
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """One-line SQL with literals replaced by ?, so the same statement always gives the same key."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def params_shape(params) -> str:
+    """Parameter types without their values (which may be personal data), e.g. "(int, str)"."""
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in sorted(params.items())) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+
+
+class QueryTracer:
+    """
+    Times the statements a DatabaseManager runs (DatabaseManager.enable_tracing()).
+    Every statement is added to a per-statement summary; statements slower than
+    slow_ms are written to a rotating log as JSON lines, with their query plan.
+    A trace callback counts the statements SQLite actually ran (trigger bodies
+    included) and a progress handler the VM steps, as a measure of work done.
+    """
+
+    def __init__(self, slow_ms: float = 100.0, log_path=SLOW_LOG, explain: bool = True):
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._summary = {}
+
+        # imported here: logging.handlers costs ~15 ms of start-up, and tracing is usually off
+        import logging
+        from logging.handlers import RotatingFileHandler
+
+        # a private logger, so several tracers never share handlers
+        self.logger = logging.Logger("flight_db.slow_queries")
+        if log_path is not None:
+            log_path = Path(log_path)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    # ---------- connection hooks ----------
+
+    def attach(self, conn):
+        """Install the trace callback and progress handler on a connection."""
+        conn.set_trace_callback(self._on_statement)
+        conn.set_progress_handler(self._on_progress, PROGRESS_STEPS)
+
+    @staticmethod
+    def detach(conn):
+        """Remove the hooks again (no overhead left on the connection)."""
+        conn.set_trace_callback(None)
+        conn.set_progress_handler(None, 0)
+
+    def _on_statement(self, _sql):
+        self._local.statements = getattr(self._local, "statements", 0) + 1
+
+    def _on_progress(self):
+        self._local.steps = getattr(self._local, "steps", 0) + PROGRESS_STEPS
+        return 0
+
+    def _start(self):
+        self._local.statements = 0
+        self._local.steps = 0
+        return time.perf_counter()
+
+    # ---------- running statements ----------
+
+    def execute(self, conn, sql, params=()):
+        """conn.execute(), timed."""
+        start = self._start()
+        cur = conn.execute(sql, params)
+        self.record(conn, sql, params, time.perf_counter() - start, cur.rowcount)
+        return cur
+
+    def executemany(self, conn, sql, rows):
+        """conn.executemany(), timed as one statement."""
+        start = self._start()
+        cur = conn.executemany(sql, rows)
+        self.record(conn, sql, (), time.perf_counter() - start, cur.rowcount, explain=False)
+        return cur
+
+    def fetchall(self, conn, sql, params=()):
+        """conn.execute().fetchall(), timed."""
+        start = self._start()
+        rows = conn.execute(sql, params).fetchall()
+        self.record(conn, sql, params, time.perf_counter() - start, len(rows))
+        return rows
+
+    def batches(self, conn, sql, params, batch_size):
+        """Yield lists of up to batch_size rows; only time spent in SQLite is counted."""
+        seconds, count = 0.0, 0
+        start = self._start()
+        cur = conn.execute(sql, params)
+        try:
+            while rows := cur.fetchmany(batch_size):
+                seconds += time.perf_counter() - start
+                count += len(rows)
+                yield rows
+                start = time.perf_counter()
+            seconds += time.perf_counter() - start
+            self.record(conn, sql, params, seconds, count)
+        finally:
+            cur.close()
+
+    # ---------- results ----------
+
+    def record(self, conn, sql, params, seconds: float, rows: int, explain: bool = True):
+        """Add a finished statement to the summary and log it if it was slow."""
+        key = normalize_sql(sql)
+        ms = seconds * 1000
+        statements = getattr(self._local, "statements", 0)
+        steps = getattr(self._local, "steps", 0)
+        slow = ms >= self.slow_ms
+        with self._lock:
+            s = self._summary.setdefault(key, {"calls": 0, "slow": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0, "vm_steps": 0})
+            s["calls"] += 1
+            s["slow"] += slow
+            s["rows"] += max(rows, 0)
+            s["total_ms"] += ms
+            s["max_ms"] = max(s["max_ms"], ms)
+            s["vm_steps"] += steps
+        if not slow:
+            return
+
+        entry = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(ms, 3),
+            "sql": key,
+            "params": params_shape(params),
+            "rows": rows,
+            "statements": statements,
+            "vm_steps": steps,
+        }
+        if explain and self.explain:
+            entry["plan"] = self.query_plan(conn, sql, params)
+        self.logger.warning(json.dumps(entry, ensure_ascii=False))
+
+    @staticmethod
+    def query_plan(conn, sql, params=()):
+        """EXPLAIN QUERY PLAN lines of a statement, or None if it has no plan."""
+        if not sql.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        try:
+            return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+        except Exception:
+            return None
+
+    def summary(self):
+        """One dict per normalized statement, largest total time first."""
+        with self._lock:
+            items = [dict(s, sql=key) for key, s in self._summary.items()]
+        for s in items:
+            s["avg_ms"] = s["total_ms"] / s["calls"]
+        return sorted(items, key=lambda s: s["total_ms"], reverse=True)
+
+    def log_summary(self, limit: int = 20):
+        """Write the top statements by total time to the log as one JSON line."""
+        top = self.summary()[:limit]
+        if top:
+            self.logger.warning(json.dumps({"at": datetime.now().isoformat(timespec="seconds"), "summary": top},
+                                           ensure_ascii=False))
+
+    def close(self):
+        """Close the log file."""
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
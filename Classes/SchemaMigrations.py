@@ -0,0 +1,45 @@
+import re
+import sqlite3
+from pathlib import Path
+
+
+# folder with the numbered migration scripts (001_*.sql, 002_*.sql, ...)
+MIGRATIONS_DIR = Path(__file__).parent.parent / "Database creation" / "migrations"
+
+
+class SchemaMigrations:
+    """Applies the versioned .sql migrations on top of create_db.sql, tracked in PRAGMA user_version."""
+
+    @staticmethod
+    def available(migrations_dir: Path = MIGRATIONS_DIR):
+        """Return (version, path) for every migration script, sorted by version."""
+        migrations = []
+        for path in migrations_dir.glob("*.sql"):
+            match = re.match(r"^(\d+)_", path.name)
+            if match:
+                migrations.append((int(match.group(1)), path))
+        return sorted(migrations)
+
+    @staticmethod
+    def current_version(conn: sqlite3.Connection) -> int:
+        """Return the schema version stored in the database file."""
+        return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+    @staticmethod
+    def apply(conn: sqlite3.Connection, migrations_dir: Path = MIGRATIONS_DIR):
+        """Run every migration newer than the database's version, one transaction each."""
+        applied = []
+        current = SchemaMigrations.current_version(conn)
+        for version, path in SchemaMigrations.available(migrations_dir):
+            if version <= current:
+                continue
+            sql = path.read_text(encoding="utf-8")
+            # executescript commits first, so the migration and its version bump land together
+            try:
+                conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;")
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            applied.append(version)
+        return applied
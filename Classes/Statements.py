@@ -0,0 +1,363 @@
+import sqlite3
+import threading
+from textwrap import dedent
+
+
+# every fixed SQL statement the app runs, by name. They are dedented once here, so each call
+# passes the identical string and sqlite3's per-connection statement cache hands back the
+# already prepared statement instead of parsing it again. Tune a query here, and
+# "Database creation/check_query_plans.py" checks its plan.
+STATEMENTS = {
+    # ---------- flights ----------
+    "flight_detail": dedent("""
+        SELECT f.flightID, f.flightNo, f.status, f.departure, f.arrival, f.aircraft,
+               o.IATA AS origin, d.IATA AS destination, f.lastUpdate
+        FROM Flight f
+        JOIN Destination o ON f.originID = o.destinationID
+        JOIN Destination d ON f.destinationID = d.destinationID
+        WHERE f.flightID = ?;
+    """),
+    # COLLATE NOCASE matches idx_flight_flightno_nocase, so this is an index seek
+    "flight_id_by_no":
+        "SELECT flightID FROM Flight WHERE flightNo = ? COLLATE NOCASE LIMIT 1;",
+    "flight_insert": dedent("""
+        INSERT INTO Flight (flightNo, originID, destinationID, departure, arrival, status, aircraft, lastUpdate)
+        VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'));
+    """),
+    "flight_update": dedent("""
+        UPDATE Flight
+        SET departure  = COALESCE(?, departure),
+            arrival    = COALESCE(?, arrival),
+            status     = COALESCE(?, status),
+            aircraft   = COALESCE(?, aircraft),
+            lastUpdate = datetime('now')
+        WHERE flightID = ?;
+    """),
+    # flights a disruption delays: every flight leaving in a window, from anywhere or one airport
+    "delay_candidates": dedent("""
+        SELECT flightID, flightNo, departure, arrival
+        FROM Flight
+        WHERE departure >= ? AND departure < ? AND status <> 'Cancelled'
+        ORDER BY departure;
+    """),
+    "delay_candidates_origin": dedent("""
+        SELECT f.flightID, f.flightNo, f.departure, f.arrival
+        FROM Flight f
+        JOIN Destination o ON f.originID = o.destinationID
+        WHERE o.IATA = ? AND f.departure >= ? AND f.departure < ? AND f.status <> 'Cancelled'
+        ORDER BY f.departure;
+    """),
+    # a whole delay plan in one statement (UPDATE ... FROM, SQLite 3.33+): ? is a JSON array of
+    # [flightID, departure, arrival]
+    "flight_delay_apply": dedent("""
+        UPDATE Flight
+        SET departure  = p.departure,
+            arrival    = p.arrival,
+            status     = 'Delayed',
+            lastUpdate = datetime('now')
+        FROM (
+          SELECT json_extract(value, '$[0]') AS flightID, json_extract(value, '$[1]') AS departure,
+                 json_extract(value, '$[2]') AS arrival
+          FROM json_each(?)
+        ) p
+        WHERE Flight.flightID = p.flightID;
+    """),
+
+    # ---------- pilots and crew ----------
+    "pilot_name":
+        "SELECT firstName || ' ' || lastName AS name FROM Pilot WHERE pilotID = ?;",
+    "pilot_schedule": dedent("""
+        SELECT
+          p.pilotID,
+          p.firstName || ' ' || p.lastName AS Pilot,
+          fc.role,
+          f.flightID, f.flightNo, f.departure, f.arrival, f.status,
+          o.IATA AS origin, d.IATA AS destination,
+          fc.assignedAt
+        FROM FlightCrew fc
+        JOIN Pilot p  ON fc.pilotID = p.pilotID
+        JOIN Flight f ON fc.flightID = f.flightID
+        JOIN Destination o ON f.originID = o.destinationID
+        JOIN Destination d ON f.destinationID = d.destinationID
+        WHERE p.pilotID = ?
+        ORDER BY f.departure;
+    """),
+    # the flights that can clash with another assignment of the pilot (see CrewRoster)
+    "crew_intervals": dedent("""
+        SELECT f.flightID, f.flightNo, f.departure, f.arrival
+        FROM FlightCrew fc
+        JOIN Flight f ON fc.flightID = f.flightID
+        WHERE fc.pilotID = ? AND f.status <> 'Cancelled'
+        ORDER BY f.departure;
+    """),
+    # the whole roster in pilot/departure order, for the overlap audit
+    "crew_roster": dedent("""
+        SELECT fc.pilotID, f.flightID, f.flightNo, f.departure, f.arrival
+        FROM FlightCrew fc
+        JOIN Flight f ON fc.flightID = f.flightID
+        WHERE f.status <> 'Cancelled'
+        ORDER BY fc.pilotID, f.departure;
+    """),
+    # the pilot's flight after one departing at ?2 (flightID ?3), for delay propagation
+    "crew_next_flight": dedent("""
+        SELECT f.flightID, f.flightNo, f.departure, f.arrival
+        FROM FlightCrew fc
+        JOIN Flight f ON fc.flightID = f.flightID
+        WHERE fc.pilotID = ?1 AND f.status <> 'Cancelled' AND (f.departure, f.flightID) > (?2, ?3)
+        ORDER BY f.departure, f.flightID
+        LIMIT 1;
+    """),
+    "crew_of_flight":
+        "SELECT pilotID FROM FlightCrew WHERE flightID = ?;",
+    "crew_pilot_on_flight":
+        "SELECT role FROM FlightCrew WHERE pilotID = ? AND flightID = ?;",
+    "crew_role_on_flight":
+        "SELECT flightCrewID, pilotID FROM FlightCrew WHERE flightID = ? AND role = ?;",
+    "crew_insert":
+        "INSERT INTO FlightCrew (pilotID, flightID, role, assignedAt) VALUES (?, ?, ?, datetime('now'));",
+    # only replaces the pilot the caller saw, so a concurrent change is detected (rowcount 0)
+    "crew_replace_role":
+        "UPDATE FlightCrew SET pilotID = ?, assignedAt = datetime('now') WHERE flightID = ? AND role = ? AND pilotID = ?;",
+
+    # ---------- destinations ----------
+    "destination_by_id":
+        "SELECT * FROM Destination WHERE destinationID = ?;",
+    "destinations_active": dedent("""
+        SELECT destinationID, IATA, airportName, city, country, isActive
+        FROM Destination
+        WHERE isActive = 1
+        ORDER BY destinationID;
+    """),
+    "destinations_all": dedent("""
+        SELECT destinationID, IATA, airportName, city, country, isActive
+        FROM Destination
+        ORDER BY destinationID;
+    """),
+    # keyset pages: WHERE destinationID > last ID seen, so every page is an index seek
+    "destinations_page": dedent("""
+        SELECT destinationID, IATA, airportName, city, country, isActive
+        FROM Destination
+        WHERE destinationID > ?
+        ORDER BY destinationID
+        LIMIT ?;
+    """),
+    "destinations_active_page": dedent("""
+        SELECT destinationID, IATA, airportName, city, country, isActive
+        FROM Destination
+        WHERE isActive = 1 AND destinationID > ?
+        ORDER BY destinationID
+        LIMIT ?;
+    """),
+    "destination_set_active":
+        "UPDATE Destination SET isActive = ? WHERE destinationID = ?;",
+
+    # ---------- bulk import (see Classes/BulkImporter.py) ----------
+    # ? is a JSON array of the codes / flight numbers of one batch; flight numbers match in any
+    # case through idx_flight_flightno_nocase, like flight_id_by_no
+    "import_airport_ids": dedent("""
+        SELECT d.IATA, d.destinationID
+        FROM json_each(?) j
+        JOIN Destination d ON d.IATA = j.value;
+    """),
+    "import_flight_ids": dedent("""
+        SELECT f.flightNo, f.flightID
+        FROM json_each(?) j
+        JOIN Flight f ON f.flightNo = j.value COLLATE NOCASE;
+    """),
+
+    # ---------- bookings ----------
+    # kept by the triggers of migration 004; no row means no bookings yet
+    "booking_counts":
+        "SELECT booked, checkedIn, cancelled FROM BookingCount WHERE flightID = ?;",
+    # flights whose stored counts differ from Booking: counted minus stored per status
+    "booking_counts_drift": dedent("""
+        SELECT n.flightID, n.booked - COALESCE(c.booked, 0) AS booked,
+               n.checkedIn - COALESCE(c.checkedIn, 0) AS checkedIn, n.cancelled - COALESCE(c.cancelled, 0) AS cancelled
+        FROM (
+          SELECT flightID, SUM(status = 'Booked') AS booked, SUM(status = 'Checked-in') AS checkedIn,
+                 SUM(status = 'Cancelled') AS cancelled
+          FROM Booking
+          GROUP BY flightID
+        ) n
+        LEFT JOIN BookingCount c ON c.flightID = n.flightID
+        WHERE c.flightID IS NULL OR (n.booked, n.checkedIn, n.cancelled) <> (c.booked, c.checkedIn, c.cancelled)
+        UNION ALL
+        SELECT c.flightID, -c.booked, -c.checkedIn, -c.cancelled
+        FROM BookingCount c
+        WHERE (c.booked <> 0 OR c.checkedIn <> 0 OR c.cancelled <> 0)
+          AND NOT EXISTS (SELECT 1 FROM Booking b WHERE b.flightID = c.flightID);
+    """),
+    "booking_counts_rebuild": dedent("""
+        INSERT OR REPLACE INTO BookingCount (flightID, booked, checkedIn, cancelled)
+        SELECT ?1, COALESCE(SUM(status = 'Booked'), 0), COALESCE(SUM(status = 'Checked-in'), 0),
+               COALESCE(SUM(status = 'Cancelled'), 0)
+        FROM Booking
+        WHERE flightID = ?1;
+    """),
+
+    # ---------- full-text search (migration 005) ----------
+    # a common name matches hundreds of thousands of bookings: only the newest ?2 matches
+    # (a walk down the index by rowid) are ranked, and the best ?3 of them returned
+    "passenger_search": dedent("""
+        SELECT b.bookingID, b.firstName, b.lastName, b.email, b.seatNo, b.status,
+               f.flightNo, f.departure, o.IATA AS origin, d.IATA AS destination
+        FROM (
+          SELECT rowid, rank FROM BookingSearch
+          WHERE BookingSearch MATCH ?1
+          ORDER BY rowid DESC
+          LIMIT ?2
+        ) s
+        JOIN Booking b ON b.bookingID = s.rowid
+        JOIN Flight f ON f.flightID = b.flightID
+        JOIN Destination o ON f.originID = o.destinationID
+        JOIN Destination d ON f.destinationID = d.destinationID
+        ORDER BY s.rank, b.bookingID DESC
+        LIMIT ?3;
+    """),
+    "pilot_search": dedent("""
+        SELECT p.pilotID, p.firstName, p.lastName, p.licenseNo, p.email
+        FROM PilotSearch
+        JOIN Pilot p ON p.pilotID = PilotSearch.rowid
+        WHERE PilotSearch MATCH ?
+        ORDER BY PilotSearch.rank, p.pilotID
+        LIMIT ?;
+    """),
+
+    # ---------- fleet analytics (see Classes/FleetAnalytics.py) ----------
+    # the columns FleetAnalytics loads into arrays: airports, crew and one row per flight with
+    # epoch times, status code (0 Scheduled, 1 Delayed, 2 Cancelled), seats (?1 is a JSON object
+    # of seats per aircraft type, read by a quoted key so "Boeing 737-800" works too; 0 if
+    # unknown) and passengers (booked + checked in)
+    "analytics_airports":
+        "SELECT destinationID, IATA FROM Destination ORDER BY destinationID;",
+    "analytics_crew":
+        "SELECT pilotID, flightID FROM FlightCrew;",
+    "analytics_flights": dedent("""
+        SELECT f.flightID, f.originID, f.destinationID,
+               CAST(strftime('%s', f.departure) AS INTEGER) AS departure,
+               CAST(strftime('%s', f.arrival) AS INTEGER) AS arrival,
+               CASE f.status WHEN 'Delayed' THEN 1 WHEN 'Cancelled' THEN 2 ELSE 0 END AS status,
+               COALESCE(json_extract(?1, '$."' || f.aircraft || '"'), 0) AS seats,
+               COALESCE(c.booked + c.checkedIn, 0) AS passengers
+        FROM Flight f
+        LEFT JOIN BookingCount c ON c.flightID = f.flightID
+        ORDER BY f.flightID;
+    """),
+    # the same reports in SQL; FleetAnalytics must return exactly these rows
+    "analytics_block_hours": dedent("""
+        SELECT fc.pilotID, substr(f.departure, 1, 7) AS month, COUNT(*) AS flights,
+               SUM(strftime('%s', f.arrival) - strftime('%s', f.departure)) / 3600.0 AS blockHours
+        FROM FlightCrew fc
+        JOIN Flight f ON fc.flightID = f.flightID
+        WHERE f.status <> 'Cancelled'
+        GROUP BY fc.pilotID, month
+        ORDER BY fc.pilotID, month;
+    """),
+    "analytics_route_frequencies": dedent("""
+        SELECT o.IATA AS origin, d.IATA AS destination, n.flights
+        FROM (
+          SELECT originID, destinationID, COUNT(*) AS flights
+          FROM Flight
+          WHERE status <> 'Cancelled'
+          GROUP BY originID, destinationID
+        ) n
+        JOIN Destination o ON n.originID = o.destinationID
+        JOIN Destination d ON n.destinationID = d.destinationID
+        ORDER BY n.flights DESC, origin, destination;
+    """),
+    "analytics_origin_reliability": dedent("""
+        SELECT o.IATA AS origin, n.flights, n.delayed, n.cancelled,
+               1.0 * n.delayed / n.flights AS delayRate, 1.0 * n.cancelled / n.flights AS cancellationRate
+        FROM (
+          SELECT originID, COUNT(*) AS flights, SUM(status = 'Delayed') AS delayed,
+                 SUM(status = 'Cancelled') AS cancelled
+          FROM Flight
+          GROUP BY originID
+        ) n
+        JOIN Destination o ON n.originID = o.destinationID
+        ORDER BY origin;
+    """),
+    "analytics_load_factors": dedent("""
+        SELECT o.IATA AS origin, d.IATA AS destination, n.flights, n.passengers, n.seats,
+               1.0 * n.passengers / n.seats AS loadFactor
+        FROM (
+          SELECT f.originID, f.destinationID, COUNT(*) AS flights,
+                 SUM(COALESCE(c.booked + c.checkedIn, 0)) AS passengers, SUM(json_extract(?1, '$."' || f.aircraft || '"')) AS seats
+          FROM Flight f
+          LEFT JOIN BookingCount c ON c.flightID = f.flightID
+          WHERE f.status <> 'Cancelled' AND json_extract(?1, '$."' || f.aircraft || '"') > 0
+          GROUP BY f.originID, f.destinationID
+        ) n
+        JOIN Destination o ON n.originID = o.destinationID
+        JOIN Destination d ON n.destinationID = d.destinationID
+        ORDER BY origin, destination;
+    """),
+}
+
+# sqlite3 statement cache per connection: room for every named statement plus sqlite3's
+# default 128 slots for ad-hoc SQL (criteria searches, exports, ...). It is an LRU, so more
+# than 128 distinct ad-hoc statements in a row can still push a named one out
+STATEMENT_CACHE_SIZE = len(STATEMENTS) + 128
+
+
+class StatementStats:
+    """
+    Calls, rows and latency per named statement, shared by all connections of a
+    DatabaseManager. first_calls counts the first call of a statement on each
+    connection, which always prepares it; repeat_calls are the others, which the
+    statement cache usually serves (SQLite does not report whether it did).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # id(connection) -> (connection, names called on it); holding the connection keeps its
+        # id from being reused by a new one (sqlite3 connections take no weak references)
+        self._seen = {}
+        self._stats = {}
+
+    def record(self, name, conn, seconds: float, rows: int):
+        """Add one call of a named statement."""
+        with self._lock:
+            s = self._stats.setdefault(name, {"calls": 0, "first_calls": 0, "rows": 0, "seconds": 0.0, "max_seconds": 0.0})
+            if id(conn) not in self._seen:
+                self._forget_closed()
+                self._seen[id(conn)] = (conn, set())
+            names = self._seen[id(conn)][1]
+            if name not in names:
+                names.add(name)
+                s["first_calls"] += 1
+            s["calls"] += 1
+            s["rows"] += max(rows, 0)
+            s["seconds"] += seconds
+            s["max_seconds"] = max(s["max_seconds"], seconds)
+
+    def _forget_closed(self):
+        """Drop the connections closed since (replaced pool readers, ...)."""
+        for key, (conn, _) in list(self._seen.items()):
+            try:
+                conn.total_changes
+            except sqlite3.ProgrammingError:
+                del self._seen[key]
+
+    def summary(self):
+        """One dict per statement used so far, slowest total time first."""
+        with self._lock:
+            items = [(name, dict(s)) for name, s in self._stats.items()]
+        return [
+            {
+                "statement": name,
+                "calls": s["calls"],
+                "first_calls": s["first_calls"],
+                "repeat_calls": s["calls"] - s["first_calls"],
+                "rows": s["rows"],
+                "total_ms": s["seconds"] * 1000,
+                "avg_ms": s["seconds"] * 1000 / s["calls"],
+                "max_ms": s["max_seconds"] * 1000,
+            }
+            for name, s in sorted(items, key=lambda item: item[1]["seconds"], reverse=True)
+        ]
+
+    def reset(self):
+        """Forget the counters (the connections seen stay known, so a call is not a first call again)."""
+        with self._lock:
+            self._stats.clear()
@@ -1,5 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import chain
 from pathlib import Path
+from Classes.DatabaseManager import FETCH_BATCH_SIZE
 
 
 # Path to your database 
@@ -16,18 +18,58 @@ class Utils:
 
     @staticmethod
     def print_rows(rows):
-        """Display query results in a formatted table layout."""
-        if not rows:
+        """Display query results in a formatted table layout; rows can be a list or a streaming iterator."""
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
             print("No results.\n")
             return
-        cols = rows[0].keys()
+        cols = first.keys()
         header = " | ".join(cols)
         print(header)
         print("-" * len(header))
-        for r in rows:
+        for r in chain((first,), rows):
             print(" | ".join(str(r[c]) if r[c] is not None else "" for c in cols))
         print()
 
+    @staticmethod
+    def print_cursor(cursor, width: int = 80, empty: str = "No results found.\n", batch_size: int = FETCH_BATCH_SIZE):
+        """
+        Print the rows of an executed sqlite3 cursor as they are fetched, batch_size at a
+        time, instead of loading them all first; returns the number of rows.
+        """
+        columns = [desc[0] for desc in cursor.description]
+        row_count = 0
+        while rows := cursor.fetchmany(batch_size):
+            if row_count == 0:
+                print(" | ".join(columns))
+                print("-" * width)
+            for row in rows:
+                print(" | ".join(str(item) for item in row))
+            row_count += len(rows)
+        if row_count == 0:
+            print(empty)
+        return row_count
+
+    @staticmethod
+    def print_pages(fetch_page):
+        """
+        Print the pages of fetch_page(cursor) -> {"rows", "next"} one at a time,
+        starting with cursor None, until the last page or the user stops.
+        """
+        cursor, page = None, 1
+        while True:
+            result = fetch_page(cursor)
+            if page > 1:
+                print(f"Page {page}")
+            Utils.print_rows(result["rows"])
+            if result["next"] is None:
+                return
+            if input(f"Enter for page {page + 1}, Q to stop: ").strip().upper() == "Q":
+                print()
+                return
+            cursor, page = result["next"], page + 1
+
     @staticmethod
     def input_or_blank(prompt):
         """Return user input or None if left blank."""
@@ -53,6 +95,22 @@ class Utils:
             except ValueError:
                 print("Invalid date. Use YYYY-MM-DD (e.g., 2025-10-01)\n")
 
+    @staticmethod
+    def prompt_valid_time(prompt_msg: str) -> str:
+        """Prompt until user enters a valid time of day in HH:MM format."""
+        while True:
+            s = input(prompt_msg).strip()
+            try:
+                t = datetime.strptime(s, "%H:%M")
+                return t.strftime("%H:%M")
+            except ValueError:
+                print("Invalid time. Use HH:MM (e.g., 08:30)\n")
+
+    @staticmethod
+    def next_day(date_str: str) -> str:
+        """Return the day after a YYYY-MM-DD date (exclusive end of a one-day range)."""
+        d = datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)
+        return d.strftime("%Y-%m-%d")
 
     @staticmethod
     def prompt_valid_datetime(prompt_msg: str, allow_past: bool = True) -> str:
@@ -97,20 +155,29 @@ class Utils:
                 return s_norm
             print("Invalid status. Choose: Scheduled, Delayed, or Cancelled.\n")
 
+    @staticmethod
+    def normalize_flight_no(flight_no: str) -> str:
+        """Return the stored form of a flight number (trimmed, upper-case)."""
+        return flight_no.strip().upper()
+
+    @staticmethod
+    def get_flight_id_by_no(db, flight_no: str):
+        """Return flightID given a flight number (any case), or None if not found."""
+        if not flight_no:
+            return None
+        rows = db.query_named("flight_id_by_no", (Utils.normalize_flight_no(flight_no),))
+        return rows[0]["flightID"] if rows else None
+
     @staticmethod
     def flight_no_exists(db, flight_no: str) -> bool:
         """Check if a flight number exists in the Flight table."""
-        rows = db.query(
-            "SELECT 1 FROM Flight WHERE UPPER(flightNo) = UPPER(?) LIMIT 1;",
-            (flight_no.strip(),)
-        )
-        return bool(rows)
+        return Utils.get_flight_id_by_no(db, flight_no) is not None
 
     @staticmethod
     def prompt_unique_flight_no(db):
         """Prompt until the user enters a flight number not already in the db."""
         while True:
-            flight_no = input("Flight number (e.g. EY999): ").strip().upper()
+            flight_no = Utils.normalize_flight_no(input("Flight number (e.g. EY999): "))
             if not flight_no:
                 print("Flight number cannot be empty.\n")
                 continue
@@ -123,24 +190,12 @@ class Utils:
     def prompt_existing_flight_no(db):
         """Prompt until the user enters a flight number that exists in the db."""
         while True:
-            flight_no = input("Flight number (e.g., EY101): ").strip().upper()
+            flight_no = Utils.normalize_flight_no(input("Flight number (e.g., EY101): "))
             if not flight_no:
                 print("Flight number cannot be empty.\n")
                 continue
-            exists = db.query("SELECT 1 FROM Flight WHERE flightNo = ?;", (flight_no,))
-            if not exists:
+            if not Utils.flight_no_exists(db, flight_no):
                 print(f"Flight '{flight_no}' not found. Please try again.\n")
                 continue
             return flight_no
-
-    @staticmethod
-    def get_destination_id_by_iata(db, iata: str):
-        """Return destinationID given an IATA code, or None if not found."""
-        if not iata:
-            return None
-        rows = db.query(
-            "SELECT destinationID FROM Destination WHERE IATA = ?;",
-            (iata.upper(),)
-        )
-        return rows[0]["destinationID"] if rows else None
     
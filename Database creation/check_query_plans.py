@@ -0,0 +1,174 @@
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.BulkExporter import BulkExporter
+from Classes.FlightService import FlightService
+from Classes.SchemaMigrations import SchemaMigrations
+from Classes.Statements import STATEMENTS
+
+# schema used when no database is given
+SCHEMA_FILE = Path(__file__).parent / "create_db.sql"
+
+# every query shipped with the app and the SQL query examples (the app's fixed SQL is
+# taken from Classes/Statements.py, so the plan checked is the one that runs):
+# (name, sql, params, tables allowed to be scanned because the query lists/aggregates all their rows)
+QUERIES = [
+    # the criteria search, built by the app's own code
+    ("criteria: no filters", *FlightService.build_search_sql(), {"f"}),
+    ("criteria: destination", *FlightService.build_search_sql(dest_iata="ATL"), set()),
+    ("criteria: origin", *FlightService.build_search_sql(origin_iata="ATL"), set()),
+    ("criteria: status", *FlightService.build_search_sql(status="Delayed"), set()),
+    ("criteria: departure date", *FlightService.build_search_sql(dep_date="2025-10-01"), set()),
+    ("criteria: departure time window", *FlightService.build_search_sql(time_from="08:00", time_to="12:00"), set()),
+    ("criteria: departure time window past midnight", *FlightService.build_search_sql(time_from="22:00", time_to="02:00"), set()),
+    # keyset pages of the criteria search
+    ("criteria: next page", *FlightService.build_search_sql(after=("2025-10-01 08:00", 1), limit=21), set()),
+    ("criteria: next page, status", *FlightService.build_search_sql(status="Delayed", after=("2025-10-01 08:00", 1), limit=21), set()),
+    ("criteria: next page, destination", *FlightService.build_search_sql(dest_iata="ATL", after=("2025-10-01 08:00", 1), limit=21), set()),
+    # exports: a full export reads its whole table, an incremental one only the changed rows
+    ("export: bookings", *BulkExporter.build_export_sql("bookings"), {"b"}),
+    ("export: bookings since", *BulkExporter.build_export_sql("bookings", since="2025-10-01 08:00"), set()),
+    ("export: bookings by destination", *BulkExporter.build_export_sql("bookings", dest_iata="ATL"), set()),
+    ("export: flights since", *BulkExporter.build_export_sql("flights", since="2025-10-01 08:00"), set()),
+    ("export: crew since", *BulkExporter.build_export_sql("crew", since="2025-10-01 08:00", as_json=True), set()),
+    ("flight_detail", STATEMENTS["flight_detail"], (1,), set()),
+    ("flight_id_by_no", STATEMENTS["flight_id_by_no"], ("EY101",), set()),
+    ("flight_insert", STATEMENTS["flight_insert"], ("EY999", 1, 2, "2025-10-01 08:00", "2025-10-01 10:00", "Scheduled", None), set()),
+    ("flight_update", STATEMENTS["flight_update"], (None, None, "Delayed", None, 1), set()),
+    ("delay_candidates", STATEMENTS["delay_candidates"], ("2025-10-01 06:00", "2025-10-01 12:00"), set()),
+    ("delay_candidates_origin", STATEMENTS["delay_candidates_origin"], ("ATL", "2025-10-01 06:00", "2025-10-01 12:00"), set()),
+    # json_each is the plan itself, one element per flight that moves
+    ("flight_delay_apply", STATEMENTS["flight_delay_apply"], ('[[1, "2025-10-01 10:00", "2025-10-01 12:00"]]',), {"json_each"}),
+    ("pilot_name", STATEMENTS["pilot_name"], (1,), set()),
+    ("pilot_schedule", STATEMENTS["pilot_schedule"], (1,), set()),
+    ("crew_intervals", STATEMENTS["crew_intervals"], (1,), set()),
+    ("crew_roster", STATEMENTS["crew_roster"], (), {"fc"}),
+    ("crew_next_flight", STATEMENTS["crew_next_flight"], (1, "2025-10-01 08:00", 1), set()),
+    ("crew_of_flight", STATEMENTS["crew_of_flight"], (1,), set()),
+    ("crew_pilot_on_flight", STATEMENTS["crew_pilot_on_flight"], (1, 1), set()),
+    ("crew_role_on_flight", STATEMENTS["crew_role_on_flight"], (1, "Captain"), set()),
+    ("crew_insert", STATEMENTS["crew_insert"], (1, 1, "Captain"), set()),
+    ("crew_replace_role", STATEMENTS["crew_replace_role"], (1, 1, "Captain", 2), set()),
+    ("destination_by_id", STATEMENTS["destination_by_id"], (1,), set()),
+    ("destinations_active", STATEMENTS["destinations_active"], (), set()),
+    ("destinations_all", STATEMENTS["destinations_all"], (), {"Destination"}),
+    ("destinations_page", STATEMENTS["destinations_page"], (100, 21), set()),
+    ("destinations_active_page", STATEMENTS["destinations_active_page"], (100, 21), set()),
+    ("destination_set_active", STATEMENTS["destination_set_active"], (1, 1), set()),
+    # json_each is the batch itself, one element per code / flight number
+    ("import_airport_ids", STATEMENTS["import_airport_ids"], ('["ATL", "LHR"]',), {"j"}),
+    ("import_flight_ids", STATEMENTS["import_flight_ids"], ('["EY101", "ey102"]',), {"j"}),
+    ("booking_counts", STATEMENTS["booking_counts"], (1,), set()),
+    ("booking_counts_drift", STATEMENTS["booking_counts_drift"], (), {"Booking", "n", "c"}),
+    ("booking_counts_rebuild", STATEMENTS["booking_counts_rebuild"], (1,), set()),
+    # an FTS5 MATCH shows as a SCAN of the virtual table; s is the window of matches it returns
+    ("passenger_search", STATEMENTS["passenger_search"], ('"khan"*', 1000, 20), {"BookingSearch", "s"}),
+    ("pilot_search", STATEMENTS["pilot_search"], ('"khan"*', 20), {"PilotSearch"}),
+    # fleet analytics read every flight/crew row by design (Classes/FleetAnalytics.py)
+    ("analytics_airports", STATEMENTS["analytics_airports"], (), {"Destination"}),
+    ("analytics_crew", STATEMENTS["analytics_crew"], (), {"FlightCrew"}),
+    ("analytics_flights", STATEMENTS["analytics_flights"], ('{"A320": 180}',), {"f"}),
+    ("analytics_block_hours", STATEMENTS["analytics_block_hours"], (), {"fc"}),
+    ("analytics_route_frequencies", STATEMENTS["analytics_route_frequencies"], (), {"Flight", "n"}),
+    ("analytics_origin_reliability", STATEMENTS["analytics_origin_reliability"], (), {"Flight", "n"}),
+    ("analytics_load_factors", STATEMENTS["analytics_load_factors"], ('{"A320": 180}',), {"f", "n"}),
+    ("example 1: cancelled flights to ATL", """
+        SELECT f.flightNo, f.status, f.departure, f.arrival,
+               d_from.IATA AS origin, d_to.IATA AS destination
+        FROM Flight AS f
+        JOIN Destination AS d_from ON f.originID = d_from.destinationID
+        JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
+        WHERE d_to.IATA = 'ATL' AND f.status = 'Cancelled'
+        ORDER BY f.departure;
+    """, (), set()),
+    ("example 2: scheduled flights 08:00-12:00", """
+        SELECT f.flightNo, f.status, f.departure, f.arrival,
+               d_from.IATA AS origin, d_to.IATA AS destination
+        FROM Flight AS f
+        JOIN Destination AS d_from ON f.originID = d_from.destinationID
+        JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
+        WHERE f.status = 'Scheduled'
+          AND strftime('%H:%M', f.departure) >= '08:00' AND strftime('%H:%M', f.departure) < '12:00'
+        ORDER BY f.departure;
+    """, (), set()),
+    ("example 3: delay flight", """
+        UPDATE Flight
+        SET departure = datetime(departure, '+2 hours'), arrival = datetime(arrival, '+2 hours'),
+            status = 'Delayed', lastUpdate = datetime('now')
+        WHERE flightNo = ?;
+    """, ("EY102",), set()),
+    ("example 6: flights per destination", """
+        SELECT d.IATA AS destination, d.city AS city, d.country AS country,
+               COUNT(f.flightID) AS total_flights
+        FROM Destination AS d
+        LEFT JOIN Flight AS f ON f.destinationID = d.destinationID
+        GROUP BY d.destinationID, d.IATA, d.city, d.country
+        ORDER BY total_flights DESC, d.IATA;
+    """, (), {"d"}),
+    ("example 7: flights per pilot", """
+        SELECT p.pilotID, p.firstName || ' ' || p.lastName AS Pilot,
+               COUNT(fc.flightID) AS total_assigned_flights
+        FROM Pilot AS p
+        LEFT JOIN FlightCrew AS fc ON fc.pilotID = p.pilotID
+        GROUP BY p.pilotID, p.firstName, p.lastName
+        ORDER BY total_assigned_flights DESC, p.pilotID;
+    """, (), {"p"}),
+]
+
+
+def open_database(db_path):
+    """Open the given database, or build an empty one from create_db.sql in memory."""
+    if db_path:
+        conn = sqlite3.connect(db_path)
+    else:
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(SCHEMA_FILE.read_text(encoding="utf-8"))
+    SchemaMigrations.apply(conn)
+    return conn
+
+
+def scanned_tables(plan_rows, allowed):
+    """Return the plan lines that scan a table not listed in allowed."""
+    bad = []
+    for row in plan_rows:
+        detail = row[3]
+        if not detail.startswith("SCAN "):
+            continue
+        table = detail.split()[1]
+        if table not in allowed:
+            bad.append(detail)
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print EXPLAIN QUERY PLAN for every shipped query and fail on table scans.")
+    parser.add_argument("--db", help="database to check (default: fresh in-memory schema)")
+    args = parser.parse_args()
+
+    # a statement added to Classes/Statements.py must get an entry above
+    checked = {sql for _, sql, _, _ in QUERIES}
+    unchecked = [name for name, sql in STATEMENTS.items() if sql not in checked]
+    for name in unchecked:
+        print(f"Named statement '{name}' is not in QUERIES.")
+
+    conn = open_database(args.db)
+    failures = 0
+    for name, sql, params, allowed in QUERIES:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        bad = scanned_tables(plan, allowed)
+        print(f"\n=== {name} {'FAIL' if bad else 'ok'} ===")
+        for row in plan:
+            print(f"  {row[3]}")
+        failures += bool(bad)
+    conn.close()
+
+    print(f"\n{len(QUERIES) - failures}/{len(QUERIES)} queries use an index.")
+    return 1 if failures or unchecked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.SchemaMigrations import SchemaMigrations
+
 # define path to save create the db outside the "Database creation" folder
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -15,6 +20,11 @@ with open(sql_file, "r") as f:
 
 cursor.executescript(sql_script)
 conn.commit()
+
+# apply the versioned migrations (indexes, ...) on top of the base schema
+applied = SchemaMigrations.apply(conn)
 conn.close()
 
 print(f"The database was created successfully!")
+if applied:
+    print(f"Applied schema migrations: {', '.join(str(v) for v in applied)}")
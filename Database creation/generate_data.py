@@ -0,0 +1,45 @@
+import argparse
+import sys
+from pathlib import Path
+
+# make the Classes package importable when run from this folder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.DataGenerator import DataGenerator, SIZES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a new database filled with seeded synthetic data.")
+    parser.add_argument("db", type=Path, help="database file to create (must not exist)")
+    parser.add_argument("--size", choices=list(SIZES), default="small", help="preset row counts (default: small)")
+    parser.add_argument("--airports", type=int, help="override the preset")
+    parser.add_argument("--pilots", type=int, help="override the preset")
+    parser.add_argument("--flights", type=int, help="override the preset")
+    parser.add_argument("--bookings", type=int, help="override the preset (approximate)")
+    parser.add_argument("--start", default="2025-10-01", help="first departure day (default: 2025-10-01)")
+    parser.add_argument("--days", type=int, help="days of departures (override the preset)")
+    parser.add_argument("--seed", type=int, default=42, help="same seed, same data (default: 42)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per transaction (default: 50000)")
+    args = parser.parse_args()
+
+    sizes = dict(SIZES[args.size])
+    for name in sizes:
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+
+    generator = DataGenerator(seed=args.seed, batch_size=args.batch_size)
+    try:
+        counts = generator.build(args.db, start=args.start, **sizes)
+    except (FileExistsError, ValueError) as e:
+        print(e)
+        return 1
+
+    seconds = counts.pop("seconds")
+    total = sum(counts.values())
+    for table, rows in counts.items():
+        print(f"{table:<12} {rows:>12,}")
+    print(f"{total:,} rows in {seconds:.1f}s ({total / seconds:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+-- Migration 001: secondary indexes for the flight, crew and booking access paths
+-- (the tables in create_db.sql only get the implicit UNIQUE indexes)
+
+-- flight filters used by "View Flights by Criteria" and the example queries,
+-- each index ends in departure so ORDER BY f.departure needs no temp b-tree
+CREATE INDEX IF NOT EXISTS idx_flight_departure
+  ON Flight (departure);
+
+CREATE INDEX IF NOT EXISTS idx_flight_status_departure
+  ON Flight (status, departure);
+
+CREATE INDEX IF NOT EXISTS idx_flight_origin_departure
+  ON Flight (originID, departure);
+
+CREATE INDEX IF NOT EXISTS idx_flight_destination_departure
+  ON Flight (destinationID, departure);
+
+-- crew lookups by flight (role check / replacement), covering pilotID
+-- (lookups by pilot already use the UNIQUE (pilotID, flightID) index)
+CREATE INDEX IF NOT EXISTS idx_flightcrew_flight_role
+  ON FlightCrew (flightID, role, pilotID);
+
+-- booking count and status breakdown per flight, answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_booking_flight_status
+  ON Booking (flightID, status);
+
+-- "View active destinations"
+CREATE INDEX IF NOT EXISTS idx_destination_active
+  ON Destination (isActive, destinationID);
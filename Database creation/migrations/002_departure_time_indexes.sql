@@ -0,0 +1,9 @@
+-- Migration 002: time-of-day indexes for departure
+-- (date filters use half-open ranges on departure and the indexes from 001;
+-- time-of-day filters must use the exact expression strftime('%H:%M', departure))
+
+CREATE INDEX IF NOT EXISTS idx_flight_departure_time
+  ON Flight (strftime('%H:%M', departure));
+
+CREATE INDEX IF NOT EXISTS idx_flight_status_departure_time
+  ON Flight (status, strftime('%H:%M', departure));
@@ -0,0 +1,12 @@
+-- Migration 003: case-insensitive flight-number lookups
+-- (the app stores flight numbers trimmed and upper-case and looks them up with
+-- "flightNo = ? COLLATE NOCASE", which this index serves)
+
+-- normalize rows written before the app did; OR IGNORE leaves a row alone
+-- if its upper-case form is already taken by another flight
+UPDATE OR IGNORE Flight
+SET flightNo = UPPER(TRIM(flightNo))
+WHERE flightNo <> UPPER(TRIM(flightNo));
+
+CREATE INDEX IF NOT EXISTS idx_flight_flightno_nocase
+  ON Flight (flightNo COLLATE NOCASE);
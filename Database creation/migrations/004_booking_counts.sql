@@ -0,0 +1,63 @@
+-- Migration 004: booking counts per flight and status, kept up to date by triggers
+-- (the booking summary reads one row by primary key instead of counting Booking;
+-- FlightService.check_booking_counts finds and repairs counts that drifted)
+
+CREATE TABLE IF NOT EXISTS BookingCount (
+  flightID   INTEGER PRIMARY KEY,
+  booked     INTEGER NOT NULL DEFAULT 0,
+  checkedIn  INTEGER NOT NULL DEFAULT 0,
+  cancelled  INTEGER NOT NULL DEFAULT 0
+);
+
+-- counts for the bookings already there
+INSERT OR REPLACE INTO BookingCount (flightID, booked, checkedIn, cancelled)
+SELECT flightID,
+       SUM(status = 'Booked'), SUM(status = 'Checked-in'), SUM(status = 'Cancelled')
+FROM Booking
+GROUP BY flightID;
+
+CREATE TRIGGER IF NOT EXISTS trg_booking_count_insert
+AFTER INSERT ON Booking
+BEGIN
+  INSERT INTO BookingCount (flightID, booked, checkedIn, cancelled)
+  VALUES (NEW.flightID, NEW.status = 'Booked', NEW.status = 'Checked-in', NEW.status = 'Cancelled')
+  ON CONFLICT (flightID) DO UPDATE SET
+    booked    = booked    + excluded.booked,
+    checkedIn = checkedIn + excluded.checkedIn,
+    cancelled = cancelled + excluded.cancelled;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_booking_count_delete
+AFTER DELETE ON Booking
+BEGIN
+  UPDATE BookingCount SET
+    booked    = booked    - (OLD.status = 'Booked'),
+    checkedIn = checkedIn - (OLD.status = 'Checked-in'),
+    cancelled = cancelled - (OLD.status = 'Cancelled')
+  WHERE flightID = OLD.flightID;
+END;
+
+-- a status change or a booking moved to another flight (also by ON UPDATE CASCADE)
+CREATE TRIGGER IF NOT EXISTS trg_booking_count_update
+AFTER UPDATE OF flightID, status ON Booking
+WHEN OLD.flightID IS NOT NEW.flightID OR OLD.status IS NOT NEW.status
+BEGIN
+  UPDATE BookingCount SET
+    booked    = booked    - (OLD.status = 'Booked'),
+    checkedIn = checkedIn - (OLD.status = 'Checked-in'),
+    cancelled = cancelled - (OLD.status = 'Cancelled')
+  WHERE flightID = OLD.flightID;
+  INSERT INTO BookingCount (flightID, booked, checkedIn, cancelled)
+  VALUES (NEW.flightID, NEW.status = 'Booked', NEW.status = 'Checked-in', NEW.status = 'Cancelled')
+  ON CONFLICT (flightID) DO UPDATE SET
+    booked    = booked    + excluded.booked,
+    checkedIn = checkedIn + excluded.checkedIn,
+    cancelled = cancelled + excluded.cancelled;
+END;
+
+-- a deleted flight's bookings go with it (ON DELETE CASCADE), and so does its counts row
+CREATE TRIGGER IF NOT EXISTS trg_booking_count_flight_delete
+AFTER DELETE ON Flight
+BEGIN
+  DELETE FROM BookingCount WHERE flightID = OLD.flightID;
+END;
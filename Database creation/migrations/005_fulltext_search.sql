@@ -0,0 +1,78 @@
+-- Migration 005: full-text indexes over passenger and pilot names and emails
+-- (FlightService.find_passengers/find_pilots look names up in them instead of
+-- scanning Booking with LIKE). They are external-content FTS5 tables: they store
+-- only the index and read the text from Booking and Pilot, and the triggers below
+-- keep them in step. unicode61 folds case and accents ("Müller" matches "muller");
+-- prefix='2 3' indexes 2- and 3-letter prefixes, so a short "kh*" is one lookup.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS BookingSearch USING fts5(
+  firstName, lastName, email,
+  content='Booking', content_rowid='bookingID',
+  tokenize="unicode61 remove_diacritics 2", prefix='2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS PilotSearch USING fts5(
+  firstName, lastName, email, licenseNo,
+  content='Pilot', content_rowid='pilotID',
+  tokenize="unicode61 remove_diacritics 2", prefix='2 3'
+);
+
+-- a match in a name counts twice as much as one in an email address
+INSERT INTO BookingSearch (BookingSearch, rank) VALUES ('rank', 'bm25(2.0, 2.0, 1.0)');
+INSERT INTO PilotSearch (PilotSearch, rank) VALUES ('rank', 'bm25(2.0, 2.0, 1.0, 1.0)');
+
+-- merge index segments less eagerly: with millions of bookings the default (4) makes
+-- a booking insert about 7x slower, for a query time that barely changes
+INSERT INTO BookingSearch (BookingSearch, rank) VALUES ('automerge', 8);
+
+-- index the rows already there
+INSERT INTO BookingSearch (BookingSearch) VALUES ('rebuild');
+INSERT INTO PilotSearch (PilotSearch) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS trg_booking_search_insert
+AFTER INSERT ON Booking
+BEGIN
+  INSERT INTO BookingSearch (rowid, firstName, lastName, email)
+  VALUES (NEW.bookingID, NEW.firstName, NEW.lastName, NEW.email);
+END;
+
+-- also fires for the bookings of a deleted flight (ON DELETE CASCADE)
+CREATE TRIGGER IF NOT EXISTS trg_booking_search_delete
+AFTER DELETE ON Booking
+BEGIN
+  INSERT INTO BookingSearch (BookingSearch, rowid, firstName, lastName, email)
+  VALUES ('delete', OLD.bookingID, OLD.firstName, OLD.lastName, OLD.email);
+END;
+
+-- only changes to the indexed columns: a check-in does not touch the index
+CREATE TRIGGER IF NOT EXISTS trg_booking_search_update
+AFTER UPDATE OF bookingID, firstName, lastName, email ON Booking
+BEGIN
+  INSERT INTO BookingSearch (BookingSearch, rowid, firstName, lastName, email)
+  VALUES ('delete', OLD.bookingID, OLD.firstName, OLD.lastName, OLD.email);
+  INSERT INTO BookingSearch (rowid, firstName, lastName, email)
+  VALUES (NEW.bookingID, NEW.firstName, NEW.lastName, NEW.email);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pilot_search_insert
+AFTER INSERT ON Pilot
+BEGIN
+  INSERT INTO PilotSearch (rowid, firstName, lastName, email, licenseNo)
+  VALUES (NEW.pilotID, NEW.firstName, NEW.lastName, NEW.email, NEW.licenseNo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pilot_search_delete
+AFTER DELETE ON Pilot
+BEGIN
+  INSERT INTO PilotSearch (PilotSearch, rowid, firstName, lastName, email, licenseNo)
+  VALUES ('delete', OLD.pilotID, OLD.firstName, OLD.lastName, OLD.email, OLD.licenseNo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pilot_search_update
+AFTER UPDATE OF pilotID, firstName, lastName, email, licenseNo ON Pilot
+BEGIN
+  INSERT INTO PilotSearch (PilotSearch, rowid, firstName, lastName, email, licenseNo)
+  VALUES ('delete', OLD.pilotID, OLD.firstName, OLD.lastName, OLD.email, OLD.licenseNo);
+  INSERT INTO PilotSearch (rowid, firstName, lastName, email, licenseNo)
+  VALUES (NEW.pilotID, NEW.firstName, NEW.lastName, NEW.email, NEW.licenseNo);
+END;
@@ -0,0 +1,12 @@
+-- Migration 006: indexes on the change timestamps, for incremental exports
+-- (export_data.py --since reads only the rows written since the last export,
+-- and the newest timestamp, which the next export starts from, is one seek)
+
+CREATE INDEX IF NOT EXISTS idx_flight_last_update
+  ON Flight (lastUpdate);
+
+CREATE INDEX IF NOT EXISTS idx_booking_last_update
+  ON Booking (lastUpdate);
+
+CREATE INDEX IF NOT EXISTS idx_flightcrew_assigned_at
+  ON FlightCrew (assignedAt);
@@ -1,3 +1,4 @@
+# the fixed sample rows the SQL query examples rely on; generate_data.py builds large databases
 import sqlite3
 from pathlib import Path
 
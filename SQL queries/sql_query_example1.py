@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the result printing is shared with the app (Classes/Utils.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -24,16 +29,8 @@ WHERE d_to.IATA = 'ATL'
   AND f.status = 'Cancelled'
 ORDER BY f.departure;
 """)
-rows = cursor.fetchall()
 
-if not rows:
-    print("No results found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 90)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+if Utils.print_cursor(cursor, 90):
     print()
 
 # close connection
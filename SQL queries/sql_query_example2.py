@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the result printing is shared with the app (Classes/Utils.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -12,6 +17,7 @@ cursor = conn.cursor()
 cursor.execute("PRAGMA foreign_keys = ON;")
 
 #  retrieve all flights departing between 8AM and 12AM
+#  (half-open window on the same expression as idx_flight_status_departure_time)
 print("\n=== Scheduled flights departing between 08:00 and 12:00 ===")
 cursor.execute("""
 SELECT 
@@ -21,19 +27,12 @@ FROM Flight AS f
 JOIN Destination AS d_from ON f.originID = d_from.destinationID
 JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
 WHERE f.status = 'Scheduled'
-  AND time(f.departure) BETWEEN '08:00' AND '12:00'
+  AND strftime('%H:%M', f.departure) >= '08:00'
+  AND strftime('%H:%M', f.departure) <  '12:00'
 ORDER BY f.departure;
 """)
-rows = cursor.fetchall()
 
-if not rows:
-    print("No results found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 90)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+if Utils.print_cursor(cursor, 90):
     print()
 
 # close connection
@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the result printing is shared with the app (Classes/Utils.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -22,15 +27,7 @@ JOIN Destination AS d_from ON f.originID = d_from.destinationID
 JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
 WHERE f.flightNo = 'EY102';
 """)
-rows = cursor.fetchall()
-if not rows:
-    print("No flight found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 100)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+Utils.print_cursor(cursor, 100, empty="No flight found.\n")
 
 # update: delay by 2 hours and set status to delayed 
 print("\nApplying 2-hour delay and setting status to 'Delayed' for EY102...")
@@ -55,15 +52,7 @@ JOIN Destination AS d_from ON f.originID = d_from.destinationID
 JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
 WHERE f.flightNo = 'EY102';
 """)
-rows = cursor.fetchall()
-if not rows:
-    print("No flight found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 100)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+Utils.print_cursor(cursor, 100, empty="No flight found.\n")
         
 # close connection
 conn.close()
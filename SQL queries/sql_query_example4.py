@@ -1,6 +1,12 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the pilot schedule query and the result printing are shared with the app (Classes/)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Statements import STATEMENTS
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -13,32 +19,9 @@ cursor.execute("PRAGMA foreign_keys = ON;")
 
 # view current flight assignments for pilot 1
 print("\n=== Current Flights Assigned to Pilot 1 (Anna Visser) ===")
-cursor.execute("""
-SELECT 
-  p.pilotID, 
-  p.firstName || ' ' || p.lastName AS Pilot,
-  fc.role,
-  f.flightID, f.flightNo, f.departure, f.arrival, f.status,
-  d_from.IATA AS origin, d_to.IATA AS destination,
-  fc.assignedAt
-FROM FlightCrew AS fc
-JOIN Pilot AS p ON fc.pilotID = p.pilotID
-JOIN Flight AS f ON fc.flightID = f.flightID
-JOIN Destination AS d_from ON f.originID = d_from.destinationID
-JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
-WHERE p.pilotID = 1
-ORDER BY f.departure;
-""")
+cursor.execute(STATEMENTS["pilot_schedule"], (1,))
 
-rows = cursor.fetchall()
-if not rows:
-    print("No assigned flights found.")
-else:
-    columns = [desc[0] for desc in cursor.description]
-    print(" | ".join(columns))
-    print("-" * 115)
-    for row in rows:
-        print(" | ".join(str(item) for item in row))
+Utils.print_cursor(cursor, 115, empty="No assigned flights found.")
 
 # assign pilot 1 to flight 4 (EY104) as Captain
 print("\nAssigning Pilot 1 (Anna Visser) to Flight 4 (EY104) as Captain...")
@@ -54,32 +37,9 @@ except sqlite3.IntegrityError as e:
 
 # view updated schedule for pilot 1
 print("\n=== Updated Flights Assigned to Pilot 1 (Anna Visser) ===")
-cursor.execute("""
-SELECT 
-  p.pilotID, 
-  p.firstName || ' ' || p.lastName AS Pilot,
-  fc.role,
-  f.flightID, f.flightNo, f.departure, f.arrival, f.status,
-  d_from.IATA AS origin, d_to.IATA AS destination,
-  fc.assignedAt
-FROM FlightCrew AS fc
-JOIN Pilot AS p ON fc.pilotID = p.pilotID
-JOIN Flight AS f ON fc.flightID = f.flightID
-JOIN Destination AS d_from ON f.originID = d_from.destinationID
-JOIN Destination AS d_to   ON f.destinationID = d_to.destinationID
-WHERE p.pilotID = 1
-ORDER BY f.departure;
-""")
+cursor.execute(STATEMENTS["pilot_schedule"], (1,))
 
-rows = cursor.fetchall()
-if not rows:
-    print("No assigned flights found.")
-else:
-    columns = [desc[0] for desc in cursor.description]
-    print(" | ".join(columns))
-    print("-" * 115)
-    for row in rows:
-        print(" | ".join(str(item) for item in row))
+Utils.print_cursor(cursor, 115, empty="No assigned flights found.")
 
 # close connection
 conn.close()
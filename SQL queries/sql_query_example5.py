@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the result printing is shared with the app (Classes/Utils.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -18,15 +23,7 @@ SELECT destinationID, IATA, airportName, city, country, isActive
 FROM Destination
 WHERE destinationID = 51;
 """)
-rows = cursor.fetchall()
-if not rows:
-    print("Destination 51 not found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 100)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+Utils.print_cursor(cursor, 100, empty="Destination 51 not found.\n")
 
 # update destination
 print("\nUpdating Destination 51: set isActive = 1...")
@@ -45,15 +42,7 @@ SELECT destinationID, IATA, airportName, city, country, isActive
 FROM Destination
 WHERE destinationID = 51;
 """)
-rows = cursor.fetchall()
-if not rows:
-    print("Destination 51 not found.\n")
-else:
-    cols = [d[0] for d in cursor.description]
-    print(" | ".join(cols))
-    print("-" * 100)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+Utils.print_cursor(cursor, 100, empty="Destination 51 not found.\n")
 
 
 conn.close()
\ No newline at end of file
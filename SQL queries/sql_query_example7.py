@@ -1,6 +1,11 @@
 import sqlite3
+import sys
 from pathlib import Path
 
+# the result printing is shared with the app (Classes/Utils.py)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from Classes.Utils import Utils
+
 # path to the database
 db_path = Path(__file__).parent.parent / "flight_management.db"
 
@@ -25,15 +30,7 @@ GROUP BY p.pilotID, p.firstName, p.lastName
 ORDER BY total_assigned_flights DESC, p.pilotID;
 """)
 
-rows = cursor.fetchall()
-if not rows:
-    print("No results found.\n")
-else:
-    columns = [desc[0] for desc in cursor.description]
-    print(" | ".join(columns))
-    print("-" * 80)
-    for r in rows:
-        print(" | ".join(str(x) for x in r))
+Utils.print_cursor(cursor)
 
 # close connection
 conn.close()
\ No newline at end of file
@@ -0,0 +1,329 @@
+import argparse
+import json
+import shlex
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from Classes.AirportSearch import AirportSearch
+from Classes.CrewRoster import CrewRoster, MIN_TURNAROUND_MINUTES
+from Classes.DatabaseManager import DatabaseManager, DB_PATH, PROFILES
+from Classes.FlightService import FlightService, PAGE_SIZE, VALID_CREW_ROLES, VALID_FLIGHT_STATUSES
+from Classes.IATAValidator import IATA_CSV, IATAValidator
+from Classes.Utils import Utils
+
+
+class CommandParser(argparse.ArgumentParser):
+    """ArgumentParser that raises ValueError instead of exiting, so a bad line in a batch file is just one error."""
+
+    def error(self, message):
+        raise ValueError(f"{self.prog}: {message}")
+
+
+def date_arg(s):
+    """argparse type: YYYY-MM-DD."""
+    return datetime.strptime(s, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+def time_arg(s):
+    """argparse type: HH:MM."""
+    return datetime.strptime(s, "%H:%M").strftime("%H:%M")
+
+
+def check_time_window(parser, args):
+    """--time-from and --time-to only make a window together; parser.error() if one is missing."""
+    if bool(getattr(args, "time_from", None)) != bool(getattr(args, "time_to", None)):
+        parser.error("--time-from and --time-to must be given together")
+
+
+# ---------- commands: take the service and the parsed arguments, return rows or a dict ----------
+
+
+def flights_add(service, args):
+    flight_id = service.add_flight(args.flight_no, args.origin, args.destination, args.departure, args.arrival,
+                                   args.status, args.aircraft)
+    return {"flightID": flight_id, "flightNo": Utils.normalize_flight_no(args.flight_no)}
+
+
+def flights_search(service, args):
+    criteria = dict(
+        dest_iata=args.destination, origin_iata=args.origin, status=args.status, dep_date=args.date,
+        date_from=args.date_from, date_to=args.date_to, time_from=args.time_from, time_to=args.time_to,
+    )
+    if args.limit is None and args.after is None:
+        return service.iter_flights(**criteria)
+    return service.flights_page(args.after, args.limit or PAGE_SIZE, **criteria)
+
+
+def flights_show(service, args):
+    return service.get_flight(args.flight_no)
+
+
+def flights_update(service, args):
+    return service.update_flight(args.flight_no, args.departure, args.arrival, args.status, args.aircraft)
+
+
+def flights_delay(service, args):
+    return service.delay_flights(args.minutes, args.flight_no, args.origin, args.departing_from, args.departing_to,
+                                 dry_run=args.dry_run)
+
+
+def crew_assign(service, args):
+    return service.assign_pilot(args.pilot_id, args.flight_no, args.role, replace=args.replace,
+                                allow_overlap=args.allow_overlap)
+
+
+def crew_schedule(service, args):
+    service.pilot_name(args.pilot_id)
+    return service.iter_pilot_schedule(args.pilot_id)
+
+
+def crew_audit(service, args):
+    return service.roster_conflicts()
+
+
+def crew_find(service, args):
+    return service.find_pilots(" ".join(args.query), args.limit)
+
+
+def destinations_list(service, args):
+    if args.limit is None and args.after is None:
+        return service.iter_destinations(active_only=not args.all)
+    return service.destinations_page(args.after, args.limit or PAGE_SIZE, active_only=not args.all)
+
+
+def destinations_set_active(service, args):
+    return service.set_destination_active(args.destination_id, args.active)
+
+
+def airports_search(service, args):
+    if args.reference:
+        # the whole reference list, not just the airports in Destination
+        return AirportSearch(IATAValidator(IATA_CSV).airports()).search(" ".join(args.query), args.limit)
+    return service.search_airports(" ".join(args.query), args.limit)
+
+
+def bookings_summary(service, args):
+    return service.booking_summary(args.flight_no)
+
+
+def bookings_check(service, args):
+    return service.check_booking_counts(repair=args.repair)
+
+
+def bookings_find(service, args):
+    return service.find_passengers(" ".join(args.query), args.limit)
+
+
+def add_commands(parser):
+    """Add the `<group> <command>` subcommands to a parser."""
+    groups = parser.add_subparsers(dest="group", metavar="COMMAND", required=True)
+
+    flights = groups.add_parser("flights", help="add, search, show and update flights")
+    commands = flights.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("add", help="add a flight")
+    p.add_argument("flight_no")
+    p.add_argument("origin", help="origin IATA")
+    p.add_argument("destination", help="destination IATA")
+    p.add_argument("departure", help="YYYY-MM-DD HH:MM")
+    p.add_argument("arrival", help="YYYY-MM-DD HH:MM")
+    p.add_argument("--status", type=str.capitalize, choices=VALID_FLIGHT_STATUSES, default="Scheduled")
+    p.add_argument("--aircraft")
+    p.set_defaults(handler=flights_add)
+    p = commands.add_parser("search", help="flights matching every given filter, by departure")
+    p.add_argument("--destination", help="destination IATA")
+    p.add_argument("--origin", help="origin IATA")
+    p.add_argument("--status", type=str.capitalize, choices=VALID_FLIGHT_STATUSES)
+    p.add_argument("--date", type=date_arg, help="departure date YYYY-MM-DD")
+    p.add_argument("--from", dest="date_from", type=date_arg, help="departing on or after YYYY-MM-DD")
+    p.add_argument("--to", dest="date_to", type=date_arg, help="departing on or before YYYY-MM-DD")
+    p.add_argument("--time-from", type=time_arg, help="departing at or after HH:MM (with --time-to)")
+    p.add_argument("--time-to", type=time_arg, help="departing before HH:MM (with --time-from)")
+    p.add_argument("--limit", type=int, help=f"one page of this many flights, with the cursor of the next (default: all; {PAGE_SIZE} with --after)")
+    p.add_argument("--after", metavar="CURSOR", help="the page after this cursor (the 'next' of the previous page)")
+    p.set_defaults(handler=flights_search)
+    p = commands.add_parser("show", help="one flight")
+    p.add_argument("flight_no")
+    p.set_defaults(handler=flights_show)
+    p = commands.add_parser("update", help="change the given fields of a flight")
+    p.add_argument("flight_no")
+    p.add_argument("--departure", help="YYYY-MM-DD HH:MM")
+    p.add_argument("--arrival", help="YYYY-MM-DD HH:MM")
+    p.add_argument("--status", type=str.capitalize, choices=VALID_FLIGHT_STATUSES)
+    p.add_argument("--aircraft")
+    p.set_defaults(handler=flights_update)
+    p = commands.add_parser("delay", help="delay flights, and the crews' later flights that lose their turnaround")
+    p.add_argument("minutes", type=int)
+    p.add_argument("flight_no", nargs="*", help="flights to delay (or give a departure window)")
+    p.add_argument("--origin", help="only flights leaving this IATA")
+    p.add_argument("--from", dest="departing_from", help="departing at or after YYYY-MM-DD HH:MM")
+    p.add_argument("--to", dest="departing_to", help="departing before YYYY-MM-DD HH:MM")
+    p.add_argument("--dry-run", action="store_true", help="show the plan without changing anything")
+    p.set_defaults(handler=flights_delay)
+
+    crew = groups.add_parser("crew", help="assign pilots and show their schedules")
+    commands = crew.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("assign", help="put a pilot on a flight")
+    p.add_argument("pilot_id", type=int)
+    p.add_argument("flight_no")
+    p.add_argument("--role", type=str.title, choices=VALID_CREW_ROLES, default="Captain")
+    p.add_argument("--replace", action="store_true", help="take over the role if another pilot has it")
+    p.add_argument("--allow-overlap", action="store_true", help="assign even if the pilot has no time to turn around")
+    p.set_defaults(handler=crew_assign)
+    p = commands.add_parser("schedule", help="a pilot's flights")
+    p.add_argument("pilot_id", type=int)
+    p.set_defaults(handler=crew_schedule)
+    p = commands.add_parser("audit", help="every pair of flights a pilot cannot both fly")
+    p.set_defaults(handler=crew_audit)
+    p = commands.add_parser("find", help="pilots by name, email or license number, best match first")
+    p.add_argument("query", nargs="+", help='e.g. khan, "anna kh", P-000038')
+    p.add_argument("--limit", type=int, default=PAGE_SIZE, help=f"results (default: {PAGE_SIZE})")
+    p.set_defaults(handler=crew_find)
+
+    destinations = groups.add_parser("destinations", help="list destinations and switch them on/off")
+    commands = destinations.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("list", help="active destinations")
+    p.add_argument("--all", action="store_true", help="include inactive ones")
+    p.add_argument("--limit", type=int, help=f"one page of this many destinations, with the next cursor (default: all; {PAGE_SIZE} with --after)")
+    p.add_argument("--after", type=int, metavar="ID", help="the page after this destinationID (the 'next' of the previous page)")
+    p.set_defaults(handler=destinations_list)
+    p = commands.add_parser("set-active", help="set isActive of a destination")
+    p.add_argument("destination_id", type=int)
+    p.add_argument("active", type=int, choices=(0, 1))
+    p.set_defaults(handler=destinations_set_active)
+
+    airports = groups.add_parser("airports", help="find airports by code, name, city or country")
+    commands = airports.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("search", help="best matches for a code, name or city, typos allowed")
+    p.add_argument("query", nargs="+", help='e.g. amst, "new york", heatrow')
+    p.add_argument("--limit", type=int, default=10, help="results (default: 10)")
+    p.add_argument("--reference", action="store_true", help="search Data/iataCodes.csv instead of Destination")
+    p.set_defaults(handler=airports_search)
+
+    bookings = groups.add_parser("bookings", help="booking counts and passenger search")
+    commands = bookings.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("summary", help="bookings of a flight by status")
+    p.add_argument("flight_no")
+    p.set_defaults(handler=bookings_summary)
+    p = commands.add_parser("check", help="flights whose stored booking counts differ from Booking")
+    p.add_argument("--repair", action="store_true", help="count those flights again")
+    p.set_defaults(handler=bookings_check)
+    p = commands.add_parser("find", help="bookings by passenger name or email, best match first")
+    p.add_argument("query", nargs="+", help='e.g. khan, "anna kh", anna.khan@example.com')
+    p.add_argument("--limit", type=int, default=PAGE_SIZE, help=f"results (default: {PAGE_SIZE})")
+    p.set_defaults(handler=bookings_find)
+    return groups
+
+
+# ---------- output ----------
+
+
+def to_json(value):
+    """json.dumps default: rows become objects, streamed results lists."""
+    if isinstance(value, sqlite3.Row):
+        return dict(value)
+    return list(value)
+
+
+def emit(result, as_json, out=sys.stdout):
+    """Print a command's result: one JSON document per line, or tables."""
+    if as_json:
+        out.write(json.dumps(result, default=to_json, ensure_ascii=False) + "\n")
+    elif isinstance(result, sqlite3.Row):
+        Utils.print_rows([result])
+    elif isinstance(result, dict):
+        for key, value in result.items():
+            if isinstance(value, sqlite3.Row):
+                Utils.print_rows([value])
+            elif isinstance(value, list):
+                Utils.print_rows(value)
+            else:
+                print(f"{key}: {value}")
+        print()
+    else:
+        Utils.print_rows(result)
+
+
+def run_batch(db, service, lines, keep_going, as_json):
+    """
+    Run one command per line (shell quoting, # comments) in a single transaction.
+    The first failing command rolls the whole batch back, unless keep_going:
+    then only that command is undone. Returns (succeeded, failed).
+    """
+    parser = CommandParser(prog="batch", add_help=False)
+    add_commands(parser)
+    succeeded = failed = 0
+    with db.transaction("IMMEDIATE"):
+        for line_no, line in enumerate(lines, 1):
+            try:
+                tokens = shlex.split(line, comments=True)
+                if not tokens:
+                    continue
+                args = parser.parse_args(tokens)
+                check_time_window(parser, args)
+                # a savepoint per command, so a failure leaves nothing of it behind
+                with db.transaction():
+                    emit(args.handler(service, args), as_json)
+                succeeded += 1
+            except (ValueError, sqlite3.Error) as e:
+                failed += 1
+                print(f"line {line_no}: {e}", file=sys.stderr)
+                if not keep_going:
+                    raise
+    return succeeded, failed
+
+
+def main(argv=None):
+    parser = CommandParser(
+        prog="cli.py",
+        description="Run flight operations without the menu, one command or a file of commands.",
+    )
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database file (default: flight_management.db)")
+    parser.add_argument("--profile", choices=list(PROFILES), help="connection profile")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    parser.add_argument("--turnaround", type=int, default=MIN_TURNAROUND_MINUTES,
+                        help=f"minutes a pilot needs between flights (default: {MIN_TURNAROUND_MINUTES})")
+    groups = add_commands(parser)
+    batch = groups.add_parser("batch", help="run the commands in FILE (- for stdin) in one transaction")
+    batch.add_argument("file", help="one command per line, e.g. 'flights add EY901 AUH LHR \"2026-01-05 08:00\" ...'")
+    batch.add_argument("--keep-going", action="store_true", help="skip failing commands instead of rolling back")
+    try:
+        args = parser.parse_args(argv)
+        check_time_window(parser, args)
+        lines = None
+        if args.group == "batch":
+            try:
+                lines = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+            except OSError as e:
+                parser.error(f"cannot read {args.file}: {e.strerror}")
+    except ValueError as e:
+        parser.print_usage(sys.stderr)
+        print(e, file=sys.stderr)
+        return 2
+
+    db = DatabaseManager(args.db, profile=args.profile)
+    try:
+        service = FlightService(db, roster=CrewRoster(db, args.turnaround))
+        if args.group != "batch":
+            emit(args.handler(service, args), args.json)
+            return 0
+        try:
+            succeeded, failed = run_batch(db, service, lines, args.keep_going, args.json)
+        except (ValueError, sqlite3.Error):
+            print("Batch rolled back, nothing was changed.", file=sys.stderr)
+            return 1
+        finally:
+            # stdin is not ours to close
+            if lines is not sys.stdin:
+                lines.close()
+        print(f"{succeeded} command(s) done, {failed} failed.", file=sys.stderr)
+        return 1 if failed else 0
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import argparse
+import sys
+from pathlib import Path
+from Classes.BulkExporter import EXPORTS, GZIP_LEVEL, BulkExporter
+from Classes.DatabaseManager import DatabaseManager, DB_PATH, PROFILES
+from Classes.FlightService import VALID_FLIGHT_STATUSES
+from cli import check_time_window, date_arg, time_arg
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export flights, crew or bookings to CSV / NDJSON files (optionally .gz), streamed in batches."
+    )
+    parser.add_argument("kind", choices=list(EXPORTS), help="what to export")
+    parser.add_argument("file", type=Path, help=".csv, .ndjson or .jsonl file, add .gz to compress")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database file (default: flight_management.db)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per fetch and write (default: 10000)")
+    parser.add_argument("--profile", choices=list(PROFILES), default="read-only-reporting",
+                        help="connection profile (default: read-only-reporting)")
+    parser.add_argument("--gzip-level", type=int, choices=range(1, 10), default=GZIP_LEVEL, metavar="1-9",
+                        help=f"compression of .gz files (default: {GZIP_LEVEL}, fastest)")
+    parser.add_argument("--since", metavar="TIMESTAMP",
+                        help="only rows changed at or after this lastUpdate/assignedAt (the next_since of the last export)")
+    # the filters of the menu's flight search; crew and bookings are filtered by their flight
+    parser.add_argument("--destination", help="destination IATA")
+    parser.add_argument("--origin", help="origin IATA")
+    parser.add_argument("--status", type=str.capitalize, choices=VALID_FLIGHT_STATUSES, help="flight status")
+    parser.add_argument("--date", type=date_arg, help="departure date YYYY-MM-DD")
+    parser.add_argument("--from", dest="date_from", type=date_arg, help="departing on or after YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=date_arg, help="departing on or before YYYY-MM-DD")
+    parser.add_argument("--time-from", type=time_arg, help="departing at or after HH:MM (with --time-to)")
+    parser.add_argument("--time-to", type=time_arg, help="departing before HH:MM (with --time-from)")
+    args = parser.parse_args()
+    check_time_window(parser, args)
+
+    db = DatabaseManager(args.db, profile=args.profile)
+    # an export streams; a cached read would be held in memory whole
+    db.disable_cache()
+    exporter = BulkExporter(db, batch_size=args.batch_size, gzip_level=args.gzip_level)
+    try:
+        result = exporter.export(
+            args.kind, args.file, since=args.since,
+            dest_iata=args.destination, origin_iata=args.origin, status=args.status, dep_date=args.date,
+            date_from=args.date_from, date_to=args.date_to, time_from=args.time_from, time_to=args.time_to,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(f"{result['file']}: {result['rows']:,} rows, {result['bytes'] / 1e6:,.1f} MB in {result['seconds']:.2f}s "
+          f"({result['rows_per_second']:,.0f} rows/s, {result['mb_per_second']:,.1f} MB/s)")
+    print(f"next_since: {result['next_since']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
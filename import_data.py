@@ -0,0 +1,49 @@
+import argparse
+import sys
+from pathlib import Path
+from Classes.BulkImporter import BulkImporter
+from Classes.DatabaseManager import DatabaseManager, DB_PATH, PROFILES
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk-import flights or bookings from CSV / NDJSON files (optionally .gz)."
+    )
+    parser.add_argument("kind", choices=["flights", "bookings"], help="what the files contain")
+    parser.add_argument("files", nargs="+", type=Path, help=".csv, .ndjson or .jsonl files")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database file (default: flight_management.db)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per transaction (default: 10000)")
+    parser.add_argument("--rejects", type=Path, help="write rejected rows to this CSV file")
+    parser.add_argument("--profile", choices=list(PROFILES), default="bulk-load",
+                        help="connection profile (default: bulk-load)")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db, profile=args.profile)
+    importer = BulkImporter(db, batch_size=args.batch_size)
+    all_rejected = []
+    try:
+        for path in args.files:
+            if args.kind == "flights":
+                result = importer.import_flights(path)
+            else:
+                result = importer.import_bookings(path)
+            all_rejected.extend((path.name, *reject) for reject in result["rejected"])
+            print(f"{path.name}: {result['inserted']} inserted, {len(result['rejected'])} rejected "
+                  f"in {result['seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s)")
+    finally:
+        db.close()
+
+    if all_rejected:
+        if args.rejects:
+            BulkImporter.write_rejects(all_rejected, args.rejects)
+            print(f"Rejected rows written to {args.rejects}")
+        else:
+            for file_name, line_no, reason, _ in all_rejected[:20]:
+                print(f"  {file_name} line {line_no}: {reason}")
+            if len(all_rejected) > 20:
+                print(f"  ... {len(all_rejected) - 20} more (use --rejects FILE for the full list)")
+    return 1 if all_rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
-from Classes.FlightManagement import FlightManagementApp
+import sys
 
 if __name__ == "__main__":
+    # with arguments, run them as a cli.py command instead of opening the menu
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+    from Classes.FlightManagement import FlightManagementApp
     app = FlightManagementApp()
-    app.run()
\ No newline at end of file
+    app.run()